@@ -0,0 +1,379 @@
+"""Micro-benchmarks of the connector hot paths, with regression tracking.
+
+Covers the decoding of result sets, the conversion of rows and parameters,
+batched inserts, script splitting and the compressed network broker, with
+payloads shaped like the rows of the memes table, plus end-to-end fetches
+from the fake server of fake_mysql_server.py. No database is needed:
+
+	python benchmarks/bench_connector.py --output baseline.json
+	python benchmarks/bench_connector.py --compare baseline.json --threshold 10
+
+Each benchmark is timed --repeat times, running enough loops for a repeat
+to last --min-time seconds; the median time per loop is reported. With
+--compare, benchmarks slower than the baseline by more than --threshold
+percent are flagged as regressions and the exit status is 1.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import struct
+import sys
+import time
+import uuid
+import zlib
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'lambda functions', 'kliksy-change-privacy'))
+
+import mysql.connector  # noqa: E402
+from fake_mysql_server import Column, FakeMySQLServer, ResultSet  # noqa: E402
+from mysql.connector import utils  # noqa: E402
+from mysql.connector._scripting import MySQLScriptSplitter, iter_script_statements  # noqa: E402
+from mysql.connector.constants import FieldFlag, FieldType  # noqa: E402
+from mysql.connector.conversion import MySQLConverter  # noqa: E402
+from mysql.connector.network import NetworkBrokerCompressed  # noqa: E402
+from mysql.connector.protocol import MySQLProtocol  # noqa: E402
+
+
+RESULT_ROWS = 10000
+INSERT_ROWS = 1000
+
+MEMES_COLUMNS = [
+	Column('id', FieldType.STRING),
+	Column('user_id', FieldType.LONG, FieldFlag.UNSIGNED),
+	Column('s3_key', FieldType.VAR_STRING),
+	Column('description', FieldType.BLOB),
+	Column('privacy', FieldType.STRING, FieldFlag.ENUM),
+	Column('file_type', FieldType.VAR_STRING),
+	Column('file_size_bytes', FieldType.LONG, FieldFlag.UNSIGNED),
+	Column('created_at', FieldType.TIMESTAMP),
+	Column('updated_at', FieldType.TIMESTAMP),
+]
+MEMES_SELECT = "SELECT * FROM memes WHERE privacy = 'public' ORDER BY created_at DESC"
+MEMES_INSERT = (
+	"INSERT INTO memes (id, user_id, s3_key, description, privacy, file_type, file_size_bytes)"
+	" VALUES (%s, %s, %s, %s, %s, %s, %s)"
+)
+
+
+def memes_rows(count: int) -> list:
+	created = datetime.datetime(2024, 5, 1, 9, 0, 0)
+	rows = []
+	for number in range(count):
+		meme_id = str(uuid.UUID(int=number))
+		rows.append((
+			meme_id,
+			number % 500 + 1,
+			f"memes/{number % 500 + 1}/{meme_id}.png",
+			None if number % 4 else f"Meme number {number}, posted for the benchmark " * 2,
+			'public' if number % 3 else 'private',
+			'image/png',
+			40000 + number,
+			created + datetime.timedelta(minutes=number),
+			created + datetime.timedelta(minutes=number, seconds=30),
+		))
+	return rows
+
+
+def frame(payloads, seq: int = 1) -> list:
+	"""Returns payloads as MySQL packets, header included."""
+	packets = []
+	for payload in payloads:
+		packets.append(bytearray(struct.pack('<I', len(payload))[:3] + bytes((seq % 256,)) + payload))
+		seq += 1
+	return packets
+
+
+EOF_PACKET = b'\xfe\x00\x00\x02\x00'
+
+
+class PacketSocket:
+	"""Stands in for MySQLSocket, handing out prepared packets."""
+
+	def __init__(self, packets: list):
+		self._next = iter(packets).__next__
+
+	def recv(self, read_timeout=None):
+		return self._next()
+
+
+class BufferSocket:
+	"""Stands in for socket.socket, for the network brokers."""
+
+	def __init__(self, data: bytes = b''):
+		self.sent = []
+		self.sendall = self.sent.append
+		self._data = memoryview(data)
+
+	def recv_into(self, buffer, size: int) -> int:
+		size = min(size, len(self._data))
+		buffer[:size] = self._data[:size]
+		self._data = self._data[size:]
+		return size
+
+
+def _result_packets(binary: bool):
+	result = ResultSet(MEMES_COLUMNS, memes_rows(RESULT_ROWS))
+	columns = [MySQLProtocol.parse_column(packet) for packet in frame([column.packet() for column in result.columns])]
+	return columns, frame(list(result.row_packets(binary)) + [EOF_PACKET])
+
+
+def bench_read_lc_string_list():
+	payload = ResultSet(MEMES_COLUMNS, []).text_row(memes_rows(1)[0])
+	read = utils.read_lc_string_list
+	return lambda: read(payload)
+
+
+def bench_read_text_result():
+	_, packets = _result_packets(binary=False)
+	protocol = MySQLProtocol()
+	return lambda: protocol.read_text_result(PacketSocket(packets), (8, 4, 0), None)
+
+
+def bench_row_to_python():
+	columns, packets = _result_packets(binary=False)
+	rows = MySQLProtocol().read_text_result(PacketSocket(packets), (8, 4, 0), None)[0]
+	converter = MySQLConverter('utf8mb4', True)
+	row_to_python = converter.row_to_python
+
+	def run():
+		for row in rows:
+			row_to_python(row, columns)
+	return run
+
+
+def bench_parse_binary_values():
+	columns, packets = _result_packets(binary=True)
+	protocol = MySQLProtocol()
+	return lambda: protocol.read_binary_result(PacketSocket(packets), columns, None, 'utf8')
+
+
+def _script():
+	body = []
+	for number in range(200):
+		body.append(f"-- statement {number}\nINSERT INTO memes (id, description) VALUES ('{number}', 'a; b');")
+		if number % 20 == 0:
+			body.append(
+				"DELIMITER $$\n"
+				f"CREATE PROCEDURE p{number}() BEGIN SELECT 1; SELECT 2; END$$\n"
+				"DELIMITER ;"
+			)
+	return '\n'.join(body).encode()
+
+
+def bench_script_splitter():
+	script = _script()
+	return lambda: MySQLScriptSplitter(script).split_script()
+
+
+def bench_script_stream():
+	script = _script()
+	chunks = [script[offset:offset + 4096] for offset in range(0, len(script), 4096)]
+	return lambda: list(iter_script_statements(chunks))
+
+
+def bench_compressed_send():
+	payloads = [bytes(packet[4:]) for packet in _result_packets(binary=False)[1][:1000]]
+
+	def run():
+		broker = NetworkBrokerCompressed()
+		sock = BufferSocket()
+		for payload in payloads:
+			broker.send(sock, 'bench', payload)
+	return run
+
+
+def bench_compressed_recv():
+	packets = _result_packets(binary=False)[1]
+	data = b''.join(packets)
+	# compressed the way the server streams result sets, several packets
+	# per compressed packet
+	stream = []
+	for seq, offset in enumerate(range(0, len(data), 65536)):
+		chunk = data[offset:offset + 65536]
+		compressed = zlib.compress(chunk)
+		stream.append(
+			struct.pack('<I', len(compressed))[:3] + bytes((seq % 256,))
+			+ struct.pack('<I', len(chunk))[:3] + compressed
+		)
+	stream = b''.join(stream)
+
+	def run():
+		broker = NetworkBrokerCompressed()
+		sock = BufferSocket(stream)
+		for _ in packets:
+			broker.recv(sock, 'bench')
+	return run
+
+
+def bench_process_params(server):
+	cursor = _connect(server).cursor()
+	params = memes_rows(1)[0][:7]
+	return lambda: cursor._process_params(params)
+
+
+def bench_batch_insert(server):
+	cursor = _connect(server).cursor()
+	rows = [row[:7] for row in memes_rows(INSERT_ROWS)]
+	return lambda: list(cursor._batch_insert(MEMES_INSERT, rows))
+
+
+def bench_fetch_text(server, **config):
+	cursor = _connect(server, **config).cursor()
+
+	def run():
+		cursor.execute(MEMES_SELECT)
+		cursor.fetchall()
+	return run
+
+
+def bench_fetch_binary(server):
+	cursor = _connect(server).cursor(prepared=True)
+
+	def run():
+		cursor.execute(MEMES_SELECT)
+		cursor.fetchall()
+	return run
+
+
+def bench_round_trip(server):
+	cursor = _connect(server).cursor()
+
+	def run():
+		cursor.execute('SELECT 1')
+		cursor.fetchall()
+	return run
+
+
+CONNECTIONS = []
+
+
+def _connect(server, **config):
+	conn = mysql.connector.connect(**server.connection_config(**config))
+	CONNECTIONS.append(conn)
+	return conn
+
+
+def _start_server() -> FakeMySQLServer:
+	server = FakeMySQLServer(users={'bench': 'bench'})
+	server.add_result(MEMES_SELECT, MEMES_COLUMNS, memes_rows(RESULT_ROWS))
+	server.add_result('SELECT 1', [('1', FieldType.LONGLONG)], [(1,)])
+	return server.start()
+
+
+BENCHMARKS = {
+	'read_lc_string_list': bench_read_lc_string_list,
+	'read_text_result_10k': bench_read_text_result,
+	'row_to_python_10k': bench_row_to_python,
+	'parse_binary_values_10k': bench_parse_binary_values,
+	'script_splitter_200': bench_script_splitter,
+	'script_stream_200': bench_script_stream,
+	'compressed_send_1k': bench_compressed_send,
+	'compressed_recv_10k': bench_compressed_recv,
+}
+SERVER_BENCHMARKS = {
+	'process_params': bench_process_params,
+	'batch_insert_1k': bench_batch_insert,
+	'fetch_text_10k': bench_fetch_text,
+	'fetch_text_compressed_10k': lambda server: bench_fetch_text(server, compress=True),
+	'fetch_binary_10k': bench_fetch_binary,
+	'round_trip': bench_round_trip,
+}
+
+
+def measure(func, repeat: int, min_time: float) -> dict:
+	"""Time func, returns statistics of the seconds per loop."""
+	loops = 1
+	while True:
+		started = time.perf_counter()
+		for _ in range(loops):
+			func()
+		elapsed = time.perf_counter() - started
+		if elapsed >= min_time:
+			break
+		loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9)) + 1)
+	timings = [elapsed / loops]
+	for _ in range(repeat - 1):
+		started = time.perf_counter()
+		for _ in range(loops):
+			func()
+		timings.append((time.perf_counter() - started) / loops)
+	return {
+		'median': statistics.median(timings),
+		'min': min(timings),
+		'stdev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+		'loops': loops,
+		'repeat': repeat,
+	}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+	"""Print the changes against the baseline, returns the regressions."""
+	regressions = []
+	for name, stats in results.items():
+		previous = baseline.get(name)
+		if previous is None:
+			print(f"{name:28} {stats['median'] * 1e6:12.1f} us  (new)")
+			continue
+		change = (stats['median'] / previous['median'] - 1) * 100
+		flag = ''
+		if change > threshold:
+			flag = 'REGRESSION'
+			regressions.append(name)
+		print(f"{name:28} {stats['median'] * 1e6:12.1f} us  {previous['median'] * 1e6:12.1f} us  {change:+7.1f}%  {flag}")
+	return regressions
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('-k', '--filter', default='', help='only run the benchmarks whose name contains this')
+	parser.add_argument('--repeat', type=int, default=7)
+	parser.add_argument('--min-time', type=float, default=0.2)
+	parser.add_argument('--output', help='write the results to this JSON file')
+	parser.add_argument('--compare', help='baseline JSON file written by --output')
+	parser.add_argument('--threshold', type=float, default=10.0, help='percent slower than the baseline flagged as a regression')
+	args = parser.parse_args()
+
+	selected = {name: setup for name, setup in BENCHMARKS.items() if args.filter in name}
+	server_selected = {name: setup for name, setup in SERVER_BENCHMARKS.items() if args.filter in name}
+	results = {}
+	for name, setup in selected.items():
+		results[name] = measure(setup(), args.repeat, args.min_time)
+		print(f"{name:28} {results[name]['median'] * 1e6:12.1f} us", file=sys.stderr)
+	if server_selected:
+		server = _start_server()
+		try:
+			for name, setup in server_selected.items():
+				results[name] = measure(setup(server), args.repeat, args.min_time)
+				print(f"{name:28} {results[name]['median'] * 1e6:12.1f} us", file=sys.stderr)
+		finally:
+			for conn in CONNECTIONS:
+				conn.close()
+			server.stop()
+
+	if args.output:
+		with open(args.output, 'w', encoding='utf-8') as output:
+			json.dump(
+				{
+					'python': platform.python_version(),
+					'platform': platform.platform(),
+					'created': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+					'benchmarks': results,
+				},
+				output,
+				indent=2,
+			)
+	if args.compare:
+		with open(args.compare, encoding='utf-8') as baseline:
+			regressions = compare(results, json.load(baseline)['benchmarks'], args.threshold)
+		if regressions:
+			print(f"{len(regressions)} regression(s) above {args.threshold}%: {', '.join(regressions)}")
+			sys.exit(1)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,68 @@
+"""Insert rows into activity_logs with executemany(), streaming them from a generator.
+
+Uses the database configured in the environment (DB_HOST, DB_USER,
+DB_PASSWORD, DB_NAME, DB_PORT):
+
+	python benchmarks/bench_executemany.py -n 1000000
+
+The rows are inserted in a transaction which is rolled back, unless
+--commit is given.
+"""
+import argparse
+import os
+import sys
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'lambda functions', 'kliksy-change-privacy'))
+
+import mysql.connector  # noqa: E402
+
+
+DB_CONFIG = {
+	'host': os.environ.get('DB_HOST'),
+	'user': os.environ.get('DB_USER'),
+	'password': os.environ.get('DB_PASSWORD'),
+	'database': os.environ.get('DB_NAME'),
+	'port': int(os.environ.get('DB_PORT', '3306')),
+	'use_pure': True,
+}
+
+
+def _rows(count: int):
+	for number in range(count):
+		yield ('BENCHMARK', f"benchmark row {number}")
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('-n', '--rows', type=int, default=1_000_000)
+	parser.add_argument('--commit', action='store_true')
+	args = parser.parse_args()
+
+	conn = mysql.connector.connect(**DB_CONFIG)
+	try:
+		cursor = conn.cursor()
+		print(f"max_allowed_packet {conn.max_allowed_packet} bytes")
+		started = time.perf_counter()
+		cursor.executemany(
+			"INSERT INTO activity_logs (action, details) VALUES (%s, %s)",
+			_rows(args.rows),
+		)
+		elapsed = time.perf_counter() - started
+		print(
+			f"{cursor.rowcount} rows in {elapsed:.2f} s"
+			f" ({cursor.rowcount / elapsed:,.0f} rows/s)"
+		)
+		if args.commit:
+			conn.commit()
+		else:
+			conn.rollback()
+		cursor.close()
+	finally:
+		conn.close()
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,87 @@
+"""Compare the latency of the sync and async variants of the Lambda handlers.
+
+Runs each handler against the database and bucket configured in the
+environment (DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, DB_PORT, UPLOAD_BUCKET),
+the same way Lambda would invoke them in a warm execution environment:
+
+	python benchmarks/bench_handlers.py --function kliksy-s3-load-feed -n 50
+	python benchmarks/bench_handlers.py --function kliksy-s3-upload -n 20 --email joe@example.com
+
+Uploads are real: every run inserts a meme and stores a small object.
+"""
+import argparse
+import base64
+import importlib
+import os
+import statistics
+import sys
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FUNCTIONS = os.path.join(ROOT, 'lambda functions')
+
+
+def _load_handlers(function: str):
+	sys.path.insert(0, os.path.join(FUNCTIONS, function))
+	sync_module = importlib.import_module('lambda_function')
+	async_module = importlib.import_module('lambda_function_async')
+	return sync_module.lambda_handler, async_module.lambda_handler
+
+
+def _event(function: str, email: str) -> dict:
+	if function == 'kliksy-s3-upload':
+		return {
+			'email': email,
+			'description': 'benchmark',
+			'privacy': 'private',
+			'file': {
+				'data': base64.b64encode(b'\x89PNG benchmark').decode('ascii'),
+				'contentType': 'image/png',
+			},
+		}
+	return {'queryStringParameters': {'page': '1', 'pageSize': '8'}}
+
+
+def _run(handler, event: dict, runs: int) -> list:
+	# the first call opens connections, like a cold start
+	handler(event, None)
+	timings = []
+	for _ in range(runs):
+		started = time.perf_counter()
+		response = handler(event, None)
+		timings.append(time.perf_counter() - started)
+		if response['statusCode'] >= 400:
+			raise SystemExit(f"handler failed: {response}")
+	return timings
+
+
+def _report(name: str, timings: list) -> None:
+	timings = sorted(timings)
+	p95 = timings[max(0, int(round(0.95 * len(timings))) - 1)]
+	print(
+		f"{name:6} median {statistics.median(timings) * 1000:8.2f} ms"
+		f"   p95 {p95 * 1000:8.2f} ms   mean {statistics.mean(timings) * 1000:8.2f} ms"
+	)
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument(
+		'--function',
+		choices=('kliksy-s3-load-feed', 'kliksy-s3-upload'),
+		default='kliksy-s3-load-feed',
+	)
+	parser.add_argument('-n', '--runs', type=int, default=20)
+	parser.add_argument('--email', default=os.environ.get('BENCH_EMAIL', ''))
+	args = parser.parse_args()
+
+	sync_handler, async_handler = _load_handlers(args.function)
+	event = _event(args.function, args.email)
+	print(f"{args.function}, {args.runs} warm invocations")
+	_report('sync', _run(sync_handler, event, args.runs))
+	_report('async', _run(async_handler, event, args.runs))
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,100 @@
+"""Measure the overhead of the OpenTelemetry instrumentation on execute().
+
+Runs the same statement on a plain connection and on instrumented ones
+whose query spans are not sampled, against the database configured in the
+environment (DB_HOST, DB_USER, DB_PASSWORD, DB_NAME, DB_PORT):
+
+	python benchmarks/bench_otel.py -n 5000
+
+Requires the opentelemetry-api and opentelemetry-sdk packages.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'lambda functions', 'kliksy-change-privacy'))
+
+import mysql.connector  # noqa: E402
+from mysql.connector.opentelemetry.instrumentation import MySQLInstrumentor  # noqa: E402
+from opentelemetry import trace  # noqa: E402
+from opentelemetry.sdk.trace import TracerProvider  # noqa: E402
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF  # noqa: E402
+from opentelemetry.trace import NonRecordingSpan, SpanContext, TraceFlags  # noqa: E402
+
+
+DB_CONFIG = {
+	'host': os.environ.get('DB_HOST'),
+	'user': os.environ.get('DB_USER'),
+	'password': os.environ.get('DB_PASSWORD'),
+	'database': os.environ.get('DB_NAME'),
+	'port': int(os.environ.get('DB_PORT', '3306')),
+	'use_pure': True,
+}
+
+STATEMENT = "SELECT id FROM users WHERE email = %s"
+
+# A parent span coming from an unsampled request, as in a Lambda invocation
+# which X-Ray did not sample
+UNSAMPLED_PARENT = NonRecordingSpan(
+	SpanContext(
+		trace_id=0x5CE0E9A56015FEC5AADFA328AE398115,
+		span_id=0xAB54A98CEB1F0AD2,
+		is_remote=True,
+		trace_flags=TraceFlags(TraceFlags.DEFAULT),
+	)
+)
+
+
+def _run(conn, rounds: int) -> float:
+	cursor = conn.cursor(buffered=True)
+	started = time.perf_counter()
+	for _ in range(rounds):
+		cursor.execute(STATEMENT, ('benchmark@example.com',))
+		cursor.fetchall()
+	elapsed = time.perf_counter() - started
+	cursor.close()
+	return elapsed / rounds * 1e6
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('-n', '--rounds', type=int, default=5000)
+	parser.add_argument('--repeat', type=int, default=5)
+	args = parser.parse_args()
+
+	instrumentor = MySQLInstrumentor()
+	variants = {
+		'uninstrumented': lambda: mysql.connector.connect(**DB_CONFIG),
+		'sampler always off': lambda: instrumentor.instrument_connection(
+			mysql.connector.connect(**DB_CONFIG),
+			tracer_provider=TracerProvider(sampler=ALWAYS_OFF),
+		),
+		'unsampled parent': lambda: instrumentor.instrument_connection(
+			mysql.connector.connect(**DB_CONFIG),
+			tracer_provider=TracerProvider(),
+		),
+	}
+
+	results = {}
+	with trace.use_span(UNSAMPLED_PARENT, end_on_exit=False):
+		for name, connect in variants.items():
+			conn = connect()
+			try:
+				_run(conn, min(args.rounds, 100))  # warm up
+				results[name] = statistics.median(
+					_run(conn, args.rounds) for _ in range(args.repeat)
+				)
+			finally:
+				conn.close()
+
+	baseline = results['uninstrumented']
+	for name, usec in results.items():
+		print(f"{name:20} {usec:8.1f} us/execute {(usec / baseline - 1) * 100:+6.2f}%")
+
+
+if __name__ == '__main__':
+	main()
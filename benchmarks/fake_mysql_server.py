@@ -0,0 +1,723 @@
+"""A fake MySQL server speaking the wire protocol, for benchmarks without a database.
+
+It handles the handshake, mysql_native_password and caching_sha2_password
+(fast authentication only), COM_QUERY, COM_PING, COM_QUIT, COM_INIT_DB,
+COM_RESET_CONNECTION and the prepared statement commands, COM_STMT_FETCH of
+read-only cursors included, over TCP or a Unix socket, with optional
+compression and an artificial latency per command.
+Results are scripted per statement:
+
+	server = FakeMySQLServer(users={'bench': 'secret'}, latency=0.0005)
+	server.add_result(
+		'SELECT id, email FROM users',
+		[('id', FieldType.LONGLONG), ('email', FieldType.VAR_STRING)],
+		[(number, f"user{number}@example.com") for number in range(10000)],
+	)
+	with server:
+		conn = mysql.connector.connect(**server.connection_config(user='bench', password='secret'))
+
+Statements without a scripted result get an OK packet, or an error for
+SELECT and SHOW. SELECT @@variable is answered from server.variables.
+Every command received is counted in server.commands, by name.
+
+It can also be run on its own, serving `SELECT * FROM bench` with --rows
+generated rows:
+
+	python benchmarks/fake_mysql_server.py --port 3307 --rows 100000
+"""
+import argparse
+import datetime
+import hashlib
+import os
+import random
+import re
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+import zlib
+
+from collections import Counter
+from decimal import Decimal
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'lambda functions', 'kliksy-change-privacy'))
+
+from mysql.connector.constants import ClientFlag, CursorType, FieldFlag, FieldType, ServerCmd, ServerFlag  # noqa: E402
+
+
+SERVER_VERSION = '8.4.0-fake'
+MAX_PAYLOAD_LENGTH = 0xFFFFFF
+FLUSH_SIZE = 65536
+BINARY_CHARSET = 63
+UTF8MB4_CHARSET = 255
+
+CAPABILITIES = (
+	ClientFlag.LONG_PASSWD
+	| ClientFlag.LONG_FLAG
+	| ClientFlag.CONNECT_WITH_DB
+	| ClientFlag.COMPRESS
+	| ClientFlag.PROTOCOL_41
+	| ClientFlag.TRANSACTIONS
+	| ClientFlag.SECURE_CONNECTION
+	| ClientFlag.MULTI_STATEMENTS
+	| ClientFlag.MULTI_RESULTS
+	| ClientFlag.PS_MULTI_RESULTS
+	| ClientFlag.PLUGIN_AUTH
+	| ClientFlag.CONNECT_ARGS
+	| ClientFlag.PLUGIN_AUTH_LENENC_CLIENT_DATA
+)
+
+STRING_TYPES = {
+	FieldType.VARCHAR, FieldType.VAR_STRING, FieldType.STRING, FieldType.ENUM,
+	FieldType.SET, FieldType.JSON, FieldType.TINY_BLOB, FieldType.MEDIUM_BLOB,
+	FieldType.LONG_BLOB, FieldType.BLOB,
+}
+BINARY_FORMATS = {
+	FieldType.TINY: 'b',
+	FieldType.SHORT: 'h',
+	FieldType.YEAR: 'h',
+	FieldType.INT24: 'i',
+	FieldType.LONG: 'i',
+	FieldType.LONGLONG: 'q',
+	FieldType.FLOAT: 'f',
+	FieldType.DOUBLE: 'd',
+}
+SYSTEM_VARIABLE = re.compile(r'^\s*SELECT\s+@@(?:session\.|global\.)?(\w+)\s*$', re.I)
+AUTOCOMMIT = re.compile(r'@@(?:session\.)?autocommit\s*=\s*(\w+)', re.I)
+
+
+def lenenc_int(value: int) -> bytes:
+	if value < 251:
+		return struct.pack('<B', value)
+	if value < 2**16:
+		return b'\xfc' + struct.pack('<H', value)
+	if value < 2**24:
+		return b'\xfd' + struct.pack('<I', value)[:3]
+	return b'\xfe' + struct.pack('<Q', value)
+
+
+def lenenc_str(value: bytes) -> bytes:
+	return lenenc_int(len(value)) + value
+
+
+def read_lenenc_int(data: bytes, offset: int):
+	first = data[offset]
+	if first < 251:
+		return first, offset + 1
+	size = {0xFC: 2, 0xFD: 3, 0xFE: 8}[first]
+	return int.from_bytes(data[offset + 1:offset + 1 + size], 'little'), offset + 1 + size
+
+
+def read_nul_str(data: bytes, offset: int):
+	end = data.index(b'\x00', offset)
+	return data[offset:end], end + 1
+
+
+def text_value(value) -> bytes:
+	"""Returns a value the way the server sends it in text result sets."""
+	if isinstance(value, bytes):
+		return value
+	if isinstance(value, str):
+		return value.encode('utf-8')
+	if isinstance(value, bool):
+		return b'1' if value else b'0'
+	if isinstance(value, datetime.datetime):
+		return value.isoformat(sep=' ').encode('ascii')
+	if isinstance(value, datetime.timedelta):
+		seconds = abs(value.days * 86400 + value.seconds)
+		text = f"{'-' if value.days < 0 else ''}{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+		if value.microseconds:
+			text += f".{value.microseconds:06d}"
+		return text.encode('ascii')
+	return str(value).encode('ascii')
+
+
+def binary_value(value, field_type: int, flags: int) -> bytes:
+	"""Returns a non-NULL value the way the server sends it in binary result sets."""
+	fmt = BINARY_FORMATS.get(field_type)
+	if fmt is not None:
+		if flags & FieldFlag.UNSIGNED:
+			fmt = fmt.upper()
+		return struct.pack('<' + fmt, value)
+	if field_type in (FieldType.DATE, FieldType.DATETIME, FieldType.TIMESTAMP):
+		if not isinstance(value, datetime.datetime):
+			return struct.pack('<BHBB', 4, value.year, value.month, value.day)
+		if value.microsecond:
+			return struct.pack(
+				'<BHBBBBBI', 11, value.year, value.month, value.day,
+				value.hour, value.minute, value.second, value.microsecond,
+			)
+		return struct.pack(
+			'<BHBBBBB', 7, value.year, value.month, value.day,
+			value.hour, value.minute, value.second,
+		)
+	if field_type == FieldType.TIME:
+		negative = value.days < 0
+		value = -value if negative else value
+		hours, seconds = divmod(value.seconds, 3600)
+		fields = (negative, value.days, hours, seconds // 60, seconds % 60)
+		if value.microseconds:
+			return struct.pack('<BBIBBBI', 12, *fields, value.microseconds)
+		return struct.pack('<BBIBBB', 8, *fields)
+	return lenenc_str(text_value(value))
+
+
+class Column:
+	"""Definition of a column of a scripted result set."""
+
+	def __init__(self, name: str, field_type: int = FieldType.VAR_STRING, flags: int = 0, charset: int = None):
+		self.name = name
+		self.field_type = field_type
+		self.flags = flags
+		if charset is None:
+			charset = UTF8MB4_CHARSET if field_type in STRING_TYPES else BINARY_CHARSET
+		self.charset = charset
+
+	def packet(self) -> bytes:
+		name = self.name.encode('utf-8')
+		return b''.join((
+			lenenc_str(b'def'),
+			lenenc_str(b'fake'),
+			lenenc_str(b'scripted'),
+			lenenc_str(b'scripted'),
+			lenenc_str(name),
+			lenenc_str(name),
+			b'\x0c',
+			struct.pack('<HIBHBxx', self.charset, 255, self.field_type, self.flags, 0),
+		))
+
+
+class ResultSet:
+	"""A scripted result set.
+
+	`rows` is a sequence of tuples, or a callable returning an iterable of
+	them for results generated anew, without being held in memory, on each
+	execution. The packets of sequences are built once and reused.
+	"""
+
+	def __init__(self, columns, rows):
+		self.columns = [column if isinstance(column, Column) else Column(*column) for column in columns]
+		self.rows = rows
+		self._packets = {}
+
+	def column_packets(self) -> list:
+		return [lenenc_int(len(self.columns))] + [column.packet() for column in self.columns]
+
+	def text_row(self, row) -> bytes:
+		return b''.join(b'\xfb' if value is None else lenenc_str(text_value(value)) for value in row)
+
+	def binary_row(self, row) -> bytes:
+		bitmap = bytearray((len(self.columns) + 9) // 8)
+		values = []
+		for position, (value, column) in enumerate(zip(row, self.columns)):
+			if value is None:
+				bitmap[(position + 2) // 8] |= 1 << ((position + 2) % 8)
+			else:
+				values.append(binary_value(value, column.field_type, column.flags))
+		return b'\x00' + bytes(bitmap) + b''.join(values)
+
+	def row_packets(self, binary: bool):
+		"""Returns the packets of the rows, an iterator for generated results."""
+		encode = self.binary_row if binary else self.text_row
+		if callable(self.rows):
+			return map(encode, self.rows())
+		if binary not in self._packets:
+			self._packets[binary] = [encode(row) for row in self.rows]
+		return self._packets[binary]
+
+
+class OkResult:
+	def __init__(self, affected_rows: int = 0, insert_id: int = 0):
+		self.affected_rows = affected_rows
+		self.insert_id = insert_id
+
+
+class ErrorResult:
+	def __init__(self, errno: int, message: str, sqlstate: str = 'HY000'):
+		self.errno = errno
+		self.message = message
+		self.sqlstate = sqlstate
+
+
+class _Session(socketserver.BaseRequestHandler):
+	"""One client connection."""
+
+	def setup(self):
+		self.fake = self.server.fake
+		self.sock = self.request
+		if self.sock.family != socket.AF_UNIX:
+			self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+		self.compressed = False
+		self.seq = 0
+		self.compressed_seq = 0
+		self.inflated = bytearray()
+		self.out = bytearray()
+		self.autocommit = True
+		self.in_transaction = False
+		self.statements = {}
+		self.next_statement_id = 1
+		# rows not fetched yet of the open cursors, by statement ID
+		self.cursors = {}
+
+	# packets
+
+	def _recv_exactly(self, size: int) -> bytes:
+		data = bytearray(size)
+		view = memoryview(data)
+		while size:
+			read = self.sock.recv_into(view, size)
+			if not read:
+				raise EOFError
+			view = view[read:]
+			size -= read
+		return bytes(data)
+
+	def _recv_inflated(self, size: int) -> bytes:
+		"""Read from the compressed packets until `size` bytes are available."""
+		while len(self.inflated) < size:
+			header = self._recv_exactly(7)
+			self.compressed_seq = header[3]
+			data = self._recv_exactly(int.from_bytes(header[:3], 'little'))
+			if int.from_bytes(header[4:7], 'little'):
+				data = zlib.decompress(data)
+			self.inflated += data
+		data = bytes(self.inflated[:size])
+		del self.inflated[:size]
+		return data
+
+	def _recv_packet(self) -> bytes:
+		read = self._recv_inflated if self.compressed else self._recv_exactly
+		header = read(4)
+		self.seq = header[3]
+		return read(int.from_bytes(header[:3], 'little'))
+
+	def recv(self) -> bytes:
+		"""Returns the payload of the next packet of the client."""
+		packet = self._recv_packet()
+		payload = packet
+		while len(packet) == MAX_PAYLOAD_LENGTH:
+			packet = self._recv_packet()
+			payload += packet
+		return payload
+
+	def write(self, payload: bytes) -> None:
+		"""Queue a packet, sent by flush() or once enough data is queued.
+
+		Payloads of MAX_PAYLOAD_LENGTH bytes or more are split, a payload
+		of an exact multiple ending with an empty packet.
+		"""
+		for offset in range(0, len(payload) + 1, MAX_PAYLOAD_LENGTH):
+			packet = payload[offset:offset + MAX_PAYLOAD_LENGTH]
+			self.seq = (self.seq + 1) % 256
+			self.out += struct.pack('<I', len(packet))[:3] + bytes((self.seq,)) + packet
+		if len(self.out) >= FLUSH_SIZE:
+			self.flush()
+
+	def flush(self) -> None:
+		if not self.out:
+			return
+		if self.compressed:
+			chunks = []
+			for offset in range(0, len(self.out), MAX_PAYLOAD_LENGTH):
+				chunk = bytes(self.out[offset:offset + MAX_PAYLOAD_LENGTH])
+				self.compressed_seq = (self.compressed_seq + 1) % 256
+				data = zlib.compress(chunk)
+				chunks.append(
+					struct.pack('<I', len(data))[:3] + bytes((self.compressed_seq,))
+					+ struct.pack('<I', len(chunk))[:3] + data
+				)
+			self.sock.sendall(b''.join(chunks))
+		else:
+			self.sock.sendall(self.out)
+		self.out = bytearray()
+
+	def status(self) -> int:
+		flags = ServerFlag.STATUS_AUTOCOMMIT if self.autocommit else 0
+		if self.in_transaction:
+			flags |= ServerFlag.STATUS_IN_TRANS
+		return flags
+
+	def write_ok(self, affected_rows: int = 0, insert_id: int = 0) -> None:
+		self.write(b'\x00' + lenenc_int(affected_rows) + lenenc_int(insert_id) + struct.pack('<HH', self.status(), 0))
+
+	def write_eof(self, flags: int = 0) -> None:
+		self.write(b'\xfe' + struct.pack('<HH', 0, self.status() | flags))
+
+	def write_error(self, errno: int, message: str, sqlstate: str = 'HY000') -> None:
+		self.write(b'\xff' + struct.pack('<H', errno) + b'#' + sqlstate.encode('ascii') + message.encode('utf-8'))
+
+	# connection phase
+
+	def handle(self):
+		self.fake.count('connections')
+		try:
+			if self.authenticate():
+				while self.dispatch(self.recv()):
+					pass
+		except (EOFError, ConnectionError):
+			pass
+
+	def authenticate(self) -> bool:
+		nonce = bytes(random.randint(1, 127) for _ in range(20))
+		self.seq = 255
+		self.write(b''.join((
+			b'\x0a', self.fake.server_version.encode('ascii'), b'\x00',
+			struct.pack('<I', self.fake.next_connection_id()),
+			nonce[:8], b'\x00',
+			struct.pack('<HBHHB', CAPABILITIES & 0xFFFF, UTF8MB4_CHARSET, self.status(), CAPABILITIES >> 16, 21),
+			b'\x00' * 10,
+			nonce[8:], b'\x00',
+			self.fake.auth_plugin.encode('ascii'), b'\x00',
+		)))
+		self.flush()
+
+		response = self.recv()
+		client_flags, = struct.unpack_from('<I', response)
+		user, offset = read_nul_str(response, 32)
+		size, offset = read_lenenc_int(response, offset)
+		scramble = response[offset:offset + size]
+		offset += size
+		if client_flags & ClientFlag.CONNECT_WITH_DB:
+			_, offset = read_nul_str(response, offset)
+		plugin = self.fake.auth_plugin
+		if client_flags & ClientFlag.PLUGIN_AUTH:
+			plugin = read_nul_str(response, offset)[0].decode('ascii')
+
+		password = self.fake.users.get(user.decode('utf-8'))
+		if password is None or scramble != self.fake.scramble(plugin, password, nonce):
+			self.write_error(1045, f"Access denied for user '{user.decode()}'", '28000')
+			self.flush()
+			return False
+		if plugin == 'caching_sha2_password' and scramble:
+			# fast authentication succeeded
+			self.write(b'\x01\x03')
+		self.write_ok()
+		self.flush()
+		self.compressed = bool(client_flags & ClientFlag.COMPRESS)
+		self.compressed_seq = self.seq
+		return True
+
+	# command phase
+
+	def dispatch(self, packet: bytes) -> bool:
+		"""Answer a command, returns False once the connection is to be closed."""
+		command, argument = packet[0], packet[1:]
+		self.fake.count(ServerCmd.get_info(command) or str(command))
+		if self.fake.latency:
+			time.sleep(self.fake.latency)
+		if command == ServerCmd.QUIT:
+			return False
+		if command == ServerCmd.QUERY:
+			self.query(argument.decode('utf-8'))
+		elif command in (ServerCmd.PING, ServerCmd.INIT_DB, ServerCmd.RESET_CONNECTION):
+			self.write_ok()
+		elif command == ServerCmd.STMT_RESET:
+			self.cursors.pop(struct.unpack_from('<I', argument)[0], None)
+			self.write_ok()
+		elif command == ServerCmd.STATISTICS:
+			self.write(b'Uptime: 1  Threads: 1  Questions: 1  Slow queries: 0  Opens: 0  Flush tables: 1  Open tables: 0  Queries per second avg: 1.000')
+		elif command == ServerCmd.SET_OPTION:
+			self.write_eof()
+		elif command == ServerCmd.STMT_PREPARE:
+			self.prepare(argument.decode('utf-8'))
+		elif command == ServerCmd.STMT_EXECUTE:
+			statement_id, flags = struct.unpack_from('<IB', argument)
+			statement = self.statements.get(statement_id)
+			self.cursors.pop(statement_id, None)
+			if statement is None:
+				self.write_error(1243, 'Unknown prepared statement handler')
+			elif flags & CursorType.READ_ONLY:
+				self.open_cursor(statement_id, statement)
+			else:
+				self.respond(statement, binary=True)
+		elif command == ServerCmd.STMT_FETCH:
+			self.fetch(*struct.unpack_from('<II', argument))
+		elif command == ServerCmd.STMT_CLOSE:
+			statement_id = struct.unpack_from('<I', argument)[0]
+			self.statements.pop(statement_id, None)
+			self.cursors.pop(statement_id, None)
+		elif command == ServerCmd.STMT_SEND_LONG_DATA:
+			pass
+		else:
+			self.write_error(1047, 'Unknown command')
+		self.flush()
+		return True
+
+	def query(self, statement: str) -> None:
+		keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ''
+		if keyword in ('BEGIN', 'START'):
+			self.in_transaction = True
+		elif keyword in ('COMMIT', 'ROLLBACK'):
+			self.in_transaction = False
+		elif keyword == 'SET':
+			match = AUTOCOMMIT.search(statement)
+			if match:
+				self.autocommit = match.group(1).upper() in ('ON', '1', 'TRUE')
+		self.respond(statement, binary=False)
+
+	def prepare(self, statement: str) -> None:
+		result = self.fake.lookup(statement)
+		if isinstance(result, ErrorResult):
+			self.write_error(result.errno, result.message, result.sqlstate)
+			return
+		statement_id = self.next_statement_id
+		self.next_statement_id += 1
+		self.statements[statement_id] = statement
+		columns = result.columns if isinstance(result, ResultSet) else []
+		params = statement.count('?')
+		self.write(b'\x00' + struct.pack('<IHHxH', statement_id, len(columns), params, 0))
+		if params:
+			for _ in range(params):
+				self.write(Column('?').packet())
+			self.write_eof()
+		if columns:
+			for column in columns:
+				self.write(column.packet())
+			self.write_eof()
+
+	def open_cursor(self, statement_id: int, statement: str) -> None:
+		"""Execute a statement with a read-only cursor, its rows being fetched later."""
+		result = self.fake.lookup(statement)
+		if not isinstance(result, ResultSet):
+			self.respond(statement, binary=True)
+			return
+		for packet in result.column_packets():
+			self.write(packet)
+		self.write_eof(ServerFlag.STATUS_CURSOR_EXISTS)
+		self.cursors[statement_id] = iter(result.row_packets(binary=True))
+
+	def fetch(self, statement_id: int, count: int) -> None:
+		rows = self.cursors.get(statement_id)
+		if rows is None:
+			self.write_error(1421, f"The statement ({statement_id}) has no open cursor.")
+			return
+		for _ in range(count):
+			packet = next(rows, None)
+			if packet is None:
+				del self.cursors[statement_id]
+				self.write_eof(ServerFlag.STATUS_CURSOR_EXISTS | ServerFlag.STATUS_LAST_ROW_SENT)
+				return
+			self.write(packet)
+		self.write_eof(ServerFlag.STATUS_CURSOR_EXISTS)
+
+	def respond(self, statement: str, binary: bool) -> None:
+		result = self.fake.lookup(statement)
+		if isinstance(result, ErrorResult):
+			self.write_error(result.errno, result.message, result.sqlstate)
+		elif isinstance(result, OkResult):
+			self.write_ok(result.affected_rows, result.insert_id)
+		else:
+			for packet in result.column_packets():
+				self.write(packet)
+			self.write_eof()
+			for packet in result.row_packets(binary):
+				self.write(packet)
+			self.write_eof()
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+	daemon_threads = True
+	allow_reuse_address = True
+
+
+if hasattr(socketserver, 'UnixStreamServer'):
+	class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+		daemon_threads = True
+
+
+class FakeMySQLServer:
+	"""A MySQL server stand-in answering scripted results, served by threads.
+
+	`users` maps user names to passwords, `auth_plugin` is the plugin
+	announced in the handshake (clients may answer with the other one), and
+	`latency` is slept before answering each command.
+	"""
+
+	def __init__(self, host: str = '127.0.0.1', port: int = 0, unix_socket: str = None,
+			users: dict = None, auth_plugin: str = 'caching_sha2_password',
+			latency: float = 0.0, server_version: str = SERVER_VERSION):
+		self.host = host
+		self.port = port
+		self.unix_socket = unix_socket
+		self.users = users if users is not None else {'root': ''}
+		self.auth_plugin = auth_plugin
+		self.latency = latency
+		self.server_version = server_version
+		self.variables = {
+			'max_allowed_packet': 67108864,
+			'version': server_version,
+			'autocommit': 1,
+			'sql_mode': 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION',
+			'time_zone': 'SYSTEM',
+			'transaction_isolation': 'REPEATABLE-READ',
+		}
+		self.commands = Counter()
+		self._results = []
+		self._lock = threading.Lock()
+		self._connection_id = 0
+		self._server = None
+		self._thread = None
+
+	# scripting
+
+	def add_result(self, statement, columns, rows) -> None:
+		"""Answer a statement with a result set.
+
+		`statement` is the text of the statement, or a compiled regular
+		expression searched in it. `columns` are Column instances or
+		(name, FieldType, flags) tuples.
+		"""
+		self._results.append((statement, ResultSet(columns, rows)))
+
+	def add_ok(self, statement, affected_rows: int = 0, insert_id: int = 0) -> None:
+		self._results.append((statement, OkResult(affected_rows, insert_id)))
+
+	def add_error(self, statement, errno: int, message: str, sqlstate: str = 'HY000') -> None:
+		self._results.append((statement, ErrorResult(errno, message, sqlstate)))
+
+	def lookup(self, statement: str):
+		"""Returns the result scripted for a statement, the last added first."""
+		text = statement.strip()
+		for matcher, result in reversed(self._results):
+			if isinstance(matcher, str):
+				if matcher == text:
+					return result
+			elif matcher.search(text):
+				return result
+		match = SYSTEM_VARIABLE.match(text)
+		if match and match.group(1).lower() in self.variables:
+			name = text.split(None, 1)[1]
+			return ResultSet([(name, FieldType.VAR_STRING)], [(self.variables[match.group(1).lower()],)])
+		keyword = text.split(None, 1)[0].upper() if text else ''
+		if keyword in ('SELECT', 'SHOW'):
+			return ErrorResult(1105, f"No result scripted for: {text[:200]}")
+		return OkResult()
+
+	# bookkeeping
+
+	def count(self, name: str) -> None:
+		with self._lock:
+			self.commands[name] += 1
+
+	def next_connection_id(self) -> int:
+		with self._lock:
+			self._connection_id += 1
+			return self._connection_id
+
+	@staticmethod
+	def scramble(plugin: str, password: str, nonce: bytes) -> bytes:
+		"""Returns the scramble a client sends for a password."""
+		if not password:
+			return b''
+		if plugin == 'mysql_native_password':
+			digest = hashlib.sha1
+		elif plugin == 'caching_sha2_password':
+			digest = hashlib.sha256
+		else:
+			return None
+		hash1 = digest(password.encode()).digest()
+		if plugin == 'mysql_native_password':
+			hash2 = digest(nonce + digest(hash1).digest()).digest()
+		else:
+			hash2 = digest(digest(hash1).digest() + nonce).digest()
+		return bytes(a ^ b for a, b in zip(hash1, hash2))
+
+	# serving
+
+	def start(self) -> 'FakeMySQLServer':
+		if self.unix_socket:
+			if os.path.exists(self.unix_socket):
+				os.unlink(self.unix_socket)
+			self._server = _UnixServer(self.unix_socket, _Session)
+		else:
+			self._server = _TCPServer((self.host, self.port), _Session)
+			self.port = self._server.server_address[1]
+		self._server.fake = self
+		self._thread = threading.Thread(target=self._server.serve_forever, name='fake-mysql-server', daemon=True)
+		self._thread.start()
+		return self
+
+	def stop(self) -> None:
+		if self._server is None:
+			return
+		self._server.shutdown()
+		self._server.server_close()
+		self._thread.join()
+		self._server = self._thread = None
+		if self.unix_socket and os.path.exists(self.unix_socket):
+			os.unlink(self.unix_socket)
+
+	def __enter__(self) -> 'FakeMySQLServer':
+		return self.start()
+
+	def __exit__(self, *exc_info) -> None:
+		self.stop()
+
+	def connection_config(self, **kwargs) -> dict:
+		"""Returns the arguments of mysql.connector.connect() for this server."""
+		config = {'user': next(iter(self.users)), 'password': next(iter(self.users.values())), 'use_pure': True}
+		if self.unix_socket:
+			config['unix_socket'] = self.unix_socket
+		else:
+			config.update(host=self.host, port=self.port)
+		config.update(kwargs)
+		return config
+
+
+def bench_rows(count: int):
+	"""Returns a callable generating `count` rows of mixed types."""
+	created = datetime.datetime(2024, 1, 1, 12, 30, 15)
+
+	def generate():
+		for number in range(count):
+			yield (
+				number,
+				f"user{number}@example.com",
+				Decimal(number) / 100,
+				created + datetime.timedelta(seconds=number),
+				None if number % 10 else b'\x89PNG',
+			)
+	return generate
+
+
+BENCH_COLUMNS = [
+	('id', FieldType.LONGLONG),
+	('email', FieldType.VAR_STRING),
+	('score', FieldType.NEWDECIMAL),
+	('created_at', FieldType.DATETIME),
+	('avatar', FieldType.BLOB, FieldFlag.BINARY, BINARY_CHARSET),
+]
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--host', default='127.0.0.1')
+	parser.add_argument('--port', type=int, default=3307)
+	parser.add_argument('--socket', help='serve on this Unix socket instead of TCP')
+	parser.add_argument('--user', default='bench')
+	parser.add_argument('--password', default='bench')
+	parser.add_argument('--rows', type=int, default=10000)
+	parser.add_argument('--latency', type=float, default=0.0, help='seconds slept before answering each command')
+	args = parser.parse_args()
+
+	server = FakeMySQLServer(
+		host=args.host, port=args.port, unix_socket=args.socket,
+		users={args.user: args.password}, latency=args.latency,
+	)
+	server.add_result('SELECT * FROM bench', BENCH_COLUMNS, bench_rows(args.rows))
+	with server:
+		print(f"serving on {args.socket or f'{args.host}:{server.port}'}, Ctrl+C to stop")
+		try:
+			while True:
+				time.sleep(3600)
+		except KeyboardInterrupt:
+			pass
+	print(dict(server.commands))
+
+
+if __name__ == '__main__':
+	main()
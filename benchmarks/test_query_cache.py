@@ -0,0 +1,49 @@
+"""Check which statements the client-side query cache accepts.
+
+Runs under pytest, or standalone:
+
+	python benchmarks/test_query_cache.py
+"""
+import os
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'lambda functions', 'kliksy-change-privacy'))
+
+from mysql.connector.query_cache import is_cacheable  # noqa: E402
+
+
+CACHEABLE = (
+	b"SELECT id, email FROM users WHERE email = 'a@b.com' LIMIT 1",
+	b"SELECT id FROM users WHERE email = 'a@b.com' OR username = \"a@b\";",
+	b"SELECT id FROM memes WHERE title = 'it''s; @home'",
+	b"SELECT id FROM memes WHERE title = 'a\\' @b'",
+	b"SELECT id FROM memes /* @note; */ WHERE id = 1",
+	b"SELECT id FROM memes WHERE id = 1 -- by @someone",
+)
+UNCACHEABLE = (
+	b"SELECT @total",
+	b"SELECT id FROM users WHERE email = @email",
+	b"SELECT @@session.time_zone",
+	b"SELECT id FROM users WHERE email = 'a@b.com' AND id = @id",
+	b"SELECT 1; SELECT 2",
+	b"SELECT id FROM memes WHERE title = '#' AND created < NOW()",
+	b"SELECT id FROM memes WHERE title = 'x' FOR UPDATE",
+	b"SELECT id INTO @id FROM memes",
+	b"UPDATE users SET email = 'a@b.com'",
+)
+
+
+def test_cacheable_statements():
+	assert [stmt for stmt in CACHEABLE if not is_cacheable(stmt)] == []
+
+
+def test_uncacheable_statements():
+	assert [stmt for stmt in UNCACHEABLE if is_cacheable(stmt)] == []
+
+
+if __name__ == '__main__':
+	test_cacheable_statements()
+	test_uncacheable_statements()
+	print('ok')
@@ -0,0 +1,160 @@
+"""Check that MySQLConverter.to_sql_literals() matches the former parameter path.
+
+Random parameters of every native type are encoded by to_sql_literals()
+and by a frozen copy of the to_mysql()/escape()/quote() chain which
+MySQLCursor._process_params() used before, and the results must be
+byte-identical, for several charsets (slash charsets included) and with
+and without NO_BACKSLASH_ESCAPES. Runs under pytest, or standalone:
+
+	python benchmarks/test_sql_literals.py --iterations 20000 --seed 1
+"""
+import argparse
+import datetime
+import math
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'lambda functions', 'kliksy-change-privacy'))
+
+from mysql.connector.constants import SQLMode  # noqa: E402
+from mysql.connector.conversion import MySQLConverter  # noqa: E402
+from mysql.connector.custom_types import HexLiteral  # noqa: E402
+from mysql.connector.utils import NUMERIC_TYPES  # noqa: E402
+
+
+CHARSETS = ('utf8mb4', 'latin1', 'binary', 'gbk', 'big5', 'sjis', 'cp932')
+SQL_MODES = (
+	None,
+	'STRICT_TRANS_TABLES,NO_ENGINE_SUBSTITUTION',
+	'NO_BACKSLASH_ESCAPES',
+	b'ANSI_QUOTES,NO_BACKSLASH_ESCAPES',
+)
+# bytes escaped by the old path, and bytes ending a multibyte character by 0x5c
+SPECIAL = '\\\n\r\'"\x1a\x00%_ é表十＼'
+
+
+# frozen copy of the escape()/quote() chain of MySQLConverter, as it was
+# before to_sql_literals()
+
+def _old_escape(value, sql_mode=None):
+	if isinstance(sql_mode, bytes):
+		sql_mode = sql_mode.decode()
+	if isinstance(value, (bytes, bytearray)):
+		if sql_mode is not None and SQLMode.NO_BACKSLASH_ESCAPES in sql_mode:
+			return value.replace(b"'", b"''")
+		value = value.replace(b'\\', b'\\\\')
+		value = value.replace(b'\n', b'\\n')
+		value = value.replace(b'\r', b'\\r')
+		value = value.replace(b'\047', b'\134\047')
+		value = value.replace(b'\042', b'\134\042')
+		value = value.replace(b'\032', b'\134\032')
+	elif isinstance(value, str) and not isinstance(value, HexLiteral):
+		if sql_mode is not None and SQLMode.NO_BACKSLASH_ESCAPES in sql_mode:
+			return value.replace("'", "''")
+		value = value.replace('\\', '\\\\')
+		value = value.replace('\n', '\\n')
+		value = value.replace('\r', '\\r')
+		value = value.replace('\047', '\134\047')
+		value = value.replace('\042', '\134\042')
+		value = value.replace('\032', '\134\032')
+	return value
+
+
+def _old_quote(buf):
+	if isinstance(buf, NUMERIC_TYPES):
+		return str(buf).encode('ascii')
+	if isinstance(buf, type(None)):
+		return bytearray(b'NULL')
+	return bytearray(b"'" + buf + b"'")
+
+
+def old_process_params(converter, params, sql_mode):
+	"""MySQLCursor._process_params() before to_sql_literals()"""
+	res = [converter.to_mysql(value) for value in params]
+	res = [_old_escape(value, sql_mode) for value in res]
+	return [
+		_old_quote(value) if not isinstance(params[i], Decimal) else value
+		for i, value in enumerate(res)
+	]
+
+
+def _random_text(rng, charset):
+	text = ''.join(rng.choice(SPECIAL + 'abcXYZ019') for _ in range(rng.randint(0, 12)))
+	python_charset = 'utf8' if charset in ('utf8mb4', 'binary') else charset
+	return text.encode(python_charset, 'ignore').decode(python_charset)
+
+
+def random_value(rng, charset):
+	kind = rng.randrange(14)
+	if kind == 0:
+		return rng.randint(-2**63, 2**64)
+	if kind == 1:
+		return rng.choice([True, False])
+	if kind == 2:
+		return rng.choice([rng.uniform(-1e9, 1e9), 0.1, -0.0, 1e300, math.nan, math.inf])
+	if kind == 3:
+		return Decimal(rng.randint(-10**12, 10**12)).scaleb(-rng.randint(0, 8))
+	if kind in (4, 5):
+		return _random_text(rng, charset)
+	if kind == 6:
+		return bytes(rng.choice(b'\\\n\r\'"\x1a\x00\x5c\x81\xffab') for _ in range(rng.randint(0, 12)))
+	if kind == 7:
+		return bytearray(_random_text(rng, 'utf8mb4').encode())
+	if kind == 8:
+		return None
+	if kind == 9:
+		return datetime.datetime(
+			rng.randint(1, 9999), rng.randint(1, 12), rng.randint(1, 28),
+			rng.randint(0, 23), rng.randint(0, 59), rng.randint(0, 59),
+			rng.choice([0, rng.randint(1, 999999)]),
+		)
+	if kind == 10:
+		return datetime.date(rng.randint(1, 9999), rng.randint(1, 12), rng.randint(1, 28))
+	if kind == 11:
+		return datetime.time(rng.randint(0, 23), rng.randint(0, 59), rng.randint(0, 59), rng.choice([0, 5]))
+	if kind == 12:
+		return datetime.timedelta(seconds=rng.uniform(-10**6, 10**6))
+	return time.localtime(rng.randint(0, 2**31))
+
+
+def compare(iterations: int, seed: int) -> list:
+	"""Returns the parameters for which both paths differ"""
+	rng = random.Random(seed)
+	mismatches = []
+	for _ in range(iterations):
+		charset = rng.choice(CHARSETS)
+		sql_mode = rng.choice(SQL_MODES)
+		converter = MySQLConverter(charset)
+		params = tuple(random_value(rng, charset) for _ in range(rng.randint(1, 6)))
+		expected = [bytes(value) for value in old_process_params(converter, params, sql_mode)]
+		actual = [bytes(value) for value in converter.to_sql_literals(params, sql_mode)]
+		if actual != expected:
+			mismatches.append((charset, sql_mode, params, expected, actual))
+	return mismatches
+
+
+def test_to_sql_literals_matches_frozen_path():
+	assert compare(5000, seed=0) == []
+
+
+def main() -> None:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--iterations', type=int, default=20000)
+	parser.add_argument('--seed', type=int, default=None)
+	args = parser.parse_args()
+
+	seed = args.seed if args.seed is not None else random.randrange(2**32)
+	mismatches = compare(args.iterations, seed)
+	for charset, sql_mode, params, expected, actual in mismatches[:10]:
+		print(f"{charset} {sql_mode!r} {params!r}\n  expected {expected!r}\n  actual   {actual!r}")
+	print(f"{len(mismatches)} mismatches in {args.iterations} iterations (seed {seed})")
+	sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+	main()
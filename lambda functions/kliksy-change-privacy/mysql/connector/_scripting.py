@@ -26,13 +26,23 @@
 # along with this program; if not, write to the Free Software Foundation, Inc.,
 # 51 Franklin St, Fifth Floor, Boston, MA 02110-1301  USA
 
+
 """Classes and methods utilized to work with MySQL Scripts."""
 
 import re
 import unicodedata
 
 from collections import deque
-from typing import Deque, Generator, Optional
+from typing import (
+    BinaryIO,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
 
 from .errors import InterfaceError
 from .types import MySQLScriptPartition
@@ -41,30 +51,209 @@ DEFAULT_DELIMITER = b";"
 """The default delimiter of MySQL Client and the only one
 recognized by the MySQL server protocol."""
 
-DELIMITER_RESERVED_SYMBOLS = {
-    "$": rb"\$",
-    "^": rb"\^",
-    "?": rb"\?",
-    "(": rb"\(",
-    ")": rb"\)",
-    "[": rb"\[",
-    "]": rb"\]",
-    "{": rb"\{",
-    "}": rb"\}",
-    ".": rb"\.",
-    "|": rb"\|",
-    "+": rb"\+",
-    "-": rb"\-",
-    "*": rb"\*",
-}
-"""Symbols with a special meaning in regular expression contexts."""
-
 DELIMITER_PATTERN: re.Pattern = re.compile(
     rb"""(delimiter\s+)(?=(?:[^"'`]*(?:"[^"]*"|'[^']*'|`[^`]*`))*[^"'`]*$)""",
     flags=re.IGNORECASE | re.MULTILINE,
 )
 """Regular expression pattern recognizing the delimiter command."""
 
+SCRIPT_CHUNK_SIZE = 65536
+"""Bytes read at once from scripts given as file objects."""
+
+SCRIPT_PARTITION_SIZE = 1048576
+"""Size from which the statements of a script given as a file object are
+grouped into another partition, so that the script is never held whole."""
+
+SPACE_OR_CONTROL = bytes(
+    char for char in range(256) if unicodedata.category(chr(char))[0] in "CZ"
+)
+"""White-space and control characters, which must follow `--` for it to
+start a comment."""
+
+RE_DELIMITER_ARGUMENT = re.compile(rb"\s+([^\s\x00-\x1f\x7f-\x9f]*)")
+"""Regular expression pattern matching the argument of the delimiter command."""
+
+RE_QUOTED_BODY = {
+    b"'": re.compile(rb"[^'\\]*(?:\\.[^'\\]*)*", flags=re.DOTALL),
+    b'"': re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*', flags=re.DOTALL),
+    b"`": re.compile(rb"[^`]*"),
+}
+"""Regular expression patterns matching the content of quoted strings and
+identifiers, up to the closing quote."""
+
+
+class _ScriptTokenizer:
+    """Splits a MySQL script, fed in chunks, into single statements.
+
+    The script is scanned once, jumping from token to token (quotes,
+    comments, delimiters and delimiter commands), and the code between them
+    is copied as is. Only the statement being read is kept in memory.
+    Without delimiter, comments are removed but the script is not split.
+    """
+
+    def __init__(
+        self,
+        remove_comments: bool = True,
+        delimiter: Optional[bytes] = DEFAULT_DELIMITER,
+    ) -> None:
+        self._remove_comments = remove_comments
+        self._buf: Union[bytes, bytearray] = b""
+        self._pos = 0
+        self._stmt = bytearray()
+        # sequence closing the quoted string or comment being read, if any
+        self._closing: Optional[bytes] = None
+        self._keep_comment = True
+        self._patterns: Dict[Optional[bytes], re.Pattern] = {}
+        self._set_delimiter(delimiter)
+
+    def _set_delimiter(self, delimiter: Optional[bytes]) -> None:
+        """Set the delimiter ending statements"""
+        if delimiter is not None and b"\\" in delimiter:
+            raise InterfaceError(
+                "The backslash (\\) character is not a valid delimiter."
+            )
+        self._delimiter = delimiter
+        # bytes to keep unread at the end of a chunk, where a token may start
+        self._margin = max(len(delimiter or b""), len(b"delimiter")) + 2
+        if delimiter not in self._patterns:
+            space_or_control = re.escape(SPACE_OR_CONTROL)
+            tokens = [
+                rb"(?P<quote>['\"`])",
+                rb"(?P<comment>--(?=[" + space_or_control + rb"])|#|/\*[!+]?)",
+            ]
+            if delimiter is not None:
+                tokens.insert(0, b"(?P<delimiter>" + re.escape(delimiter) + b")")
+                tokens.append(rb"(?P<command>(?<![\w$])(?i:delimiter)(?=\s))")
+            self._patterns[delimiter] = re.compile(b"|".join(tokens))
+        self._pattern = self._patterns[delimiter]
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Scans a chunk of the script, returns the statements completed"""
+        return self._scan(data, eof=False)
+
+    def close(self) -> List[bytes]:
+        """Scans the rest of the script, returns the last statements"""
+        stmts = self._scan(b"", eof=True)
+        if self._delimiter is None:
+            stmts.append(bytes(self._stmt))
+        else:
+            self._end_statement(stmts)
+        return stmts
+
+    def _end_statement(self, stmts: List[bytes]) -> None:
+        """Adds the statement read so far to `stmts`, unless it's blank"""
+        stmt = bytes(self._stmt).strip()
+        self._stmt.clear()
+        if stmt:
+            stmts.append(stmt)
+
+    def _at_line_start(self) -> bool:
+        """Whether only white-space was read since the statement or line start"""
+        line = self._stmt.rfind(b"\n") + 1
+        return not self._stmt[line:].strip()
+
+    def _scan(self, data: bytes, eof: bool) -> List[bytes]:
+        """Scans the buffered bytes followed by `data`"""
+        buf = self._buf + data if self._buf else data
+        stmts: List[bytes] = []
+        with memoryview(buf) as view:
+            self._pos = self._scan_view(buf, view, self._pos, eof, stmts)
+        if self._pos > 1:
+            # one byte is kept before the position, where tokens look behind
+            buf = buf[self._pos - 1 :]
+            self._pos = 1
+        self._buf = buf
+        return stmts
+
+    def _scan_view(
+        self,
+        buf: Union[bytes, bytearray],
+        view: memoryview,
+        pos: int,
+        eof: bool,
+        stmts: List[bytes],
+    ) -> int:
+        """Scans `buf` from `pos`, returns the position reached"""
+        stmt, end = self._stmt, len(buf)
+        while pos < end:
+            closing = self._closing
+            if closing is not None:
+                # within a quoted string or a comment
+                closed = True
+                if closing == b"*/":
+                    stop = buf.find(closing, pos)
+                    if stop >= 0:
+                        stop += 2
+                    else:
+                        closed, stop = False, end if eof else max(pos, end - 1)
+                elif closing == b"\n":
+                    stop = buf.find(closing, pos)
+                    if stop < 0:
+                        closed, stop = False, end
+                else:
+                    stop = RE_QUOTED_BODY[closing].match(buf, pos).end()
+                    if stop < end and buf[stop] == closing[0]:
+                        stop += 1
+                    else:
+                        closed, stop = False, end if eof else stop
+                if self._keep_comment:
+                    stmt += view[pos:stop]
+                pos = stop
+                if not closed:
+                    break
+                self._closing, self._keep_comment = None, True
+                continue
+
+            match = self._pattern.search(buf, pos)
+            if match is None or (not eof and match.end() >= end):
+                # the end of the chunk may hold the start of a token
+                stop = end if eof else max(pos, end - self._margin)
+                if match is not None:
+                    stop = match.start()
+                stmt += view[pos:stop]
+                pos = stop
+                break
+
+            stmt += view[pos : match.start()]
+            pos = match.end()
+            kind, token = match.lastgroup, bytes(view[match.start() : pos])
+            if kind == "delimiter":
+                self._end_statement(stmts)
+            elif kind == "quote":
+                stmt += token
+                self._closing = token
+            elif kind == "comment":
+                self._closing = b"\n" if token in (b"--", b"#") else b"*/"
+                # MySQL extensions and optimizer hints are kept
+                self._keep_comment = not self._remove_comments or token in (
+                    b"/*!",
+                    b"/*+",
+                )
+                if self._keep_comment:
+                    stmt += token
+                else:
+                    stop = len(stmt)
+                    while stop and stmt[stop - 1] in SPACE_OR_CONTROL:
+                        stop -= 1
+                    del stmt[stop:]
+            elif not self._at_line_start():
+                # the word delimiter used within a statement
+                stmt += token
+            else:
+                argument = RE_DELIMITER_ARGUMENT.match(buf, pos)
+                if not eof and argument.end() >= end:
+                    # the new delimiter may continue in the next chunk
+                    pos = match.start()
+                    break
+                if not argument.group(1):
+                    raise InterfaceError(
+                        "DELIMITER must be followed by a delimiter character or string"
+                    )
+                self._end_statement(stmts)
+                self._set_delimiter(bytes(argument.group(1)))
+                pos = argument.end()
+        return pos
+
 
 class MySQLScriptSplitter:
     """Breaks a MySQL script into single statements.
@@ -73,38 +262,10 @@ class MySQLScriptSplitter:
     representing a MySQL extension or optimizer hint.
     """
 
-    _regex_sql_split_stmts = b"""(?=(?:[^"'`]*(?:"[^"]*"|'[^']*'|`[^`]*`))*[^"'`]*$)"""
-
     def __init__(self, sql_script: bytes) -> None:
         """Constructor."""
         self._code = sql_script
         self._single_stmts: Optional[list[bytes]] = None
-        self._mappable_stmts: Optional[list[bytes]] = None
-        self._re_sql_split_stmts: dict[bytes, re.Pattern] = {}
-
-    def _split_statement(self, code: bytes, delimiter: bytes) -> list[bytes]:
-        """Split code context by delimiter."""
-        snippets = []
-
-        if delimiter not in self._re_sql_split_stmts:
-            if b"\\" in delimiter:
-                raise InterfaceError(
-                    "The backslash (\\) character is not a valid delimiter."
-                )
-            delimiter_pattern = [
-                DELIMITER_RESERVED_SYMBOLS.get(char, char.encode())
-                for char in delimiter.decode()
-            ]
-            self._re_sql_split_stmts[delimiter] = re.compile(
-                b"".join(delimiter_pattern) + self._regex_sql_split_stmts
-            )
-
-        for snippet in self._re_sql_split_stmts[delimiter].split(code):
-            snippet_strip = snippet.strip()
-            if snippet_strip:
-                snippets.append(snippet_strip)
-
-        return snippets
 
     @staticmethod
     def is_white_space_char(char: int) -> bool:
@@ -155,72 +316,23 @@ class MySQLScriptSplitter:
         *For Reference Manual- MySQL Comments*, see
         https://dev.mysql.com/doc/refman/en/comments.html.
         """
-
-        def is_dash_style(b_str: bytes, b_char: int) -> bool:
-            return b_str == b"--" and (
-                MySQLScriptSplitter.is_control_char(b_char)
-                or MySQLScriptSplitter.is_white_space_char(b_char)
-            )
-
-        def is_hash_style(b_str: bytes) -> bool:
-            return b_str == b"#"
-
-        def is_c_style(b_str: bytes, b_char: int) -> bool:
-            return b_str == b"/*" and b_char not in {ord("!"), ord("+")}
-
-        buf = bytearray(b"")
-        i, literal_ctx = 0, None
-        line_break, single_quote, double_quote = ord("\n"), ord("'"), ord('"')
-        while i < len(code):
-            if literal_ctx is None:
-                style = None
-                if is_dash_style(buf[-2:], code[i]):
-                    style = "--"
-                elif is_hash_style(buf[-1:]):
-                    style = "#"
-                elif is_c_style(buf[-2:], code[i]):
-                    style = "/*"
-                if style is not None:
-                    if style in ("--", "#"):
-                        while i < len(code) and code[i] != line_break:
-                            i += 1
-                    else:
-                        while i + 1 < len(code) and code[i : i + 2] != b"*/":
-                            i += 1
-                        i += 2
-
-                    for _ in range(len(style)):
-                        buf.pop()
-
-                    while buf and (
-                        MySQLScriptSplitter.is_control_char(buf[-1])
-                        or MySQLScriptSplitter.is_white_space_char(buf[-1])
-                    ):
-                        buf.pop()
-
-                    continue
-
-            if literal_ctx is None and code[i] in [single_quote, double_quote]:
-                literal_ctx = code[i]
-            elif literal_ctx is not None and code[i] in {literal_ctx, line_break}:
-                literal_ctx = None
-
-            buf.append(code[i])
-            i += 1
-
-        return bytes(buf)
+        tokenizer = _ScriptTokenizer(delimiter=None)
+        tokenizer.feed(code)
+        return tokenizer.close()[0]
 
     def split_script(self, remove_comments: bool = True) -> list[bytes]:
         """Splits the given script text into a sequence of individual statements.
 
         The word DELIMITER and any of its lower and upper case combinations
         such as delimiter, DeLiMiter, etc., are considered reserved words by
-        the connector. Users must quote these when included in multi statements
-        for other purposes different from declaring an actual statement delimiter;
-        e.g., as names for tables, columns, variables, in comments, etc.
+        the connector when found at the start of a statement or of a line,
+        where they are taken for a command declaring a statement delimiter.
+        Users must quote these when used there for other purposes; e.g., as
+        names for tables, columns, variables, etc.
 
         ```
-        CREATE TABLE `delimiter` (begin INT, end INT); -- I am a `DELimiTer` comment
+        CREATE TABLE t (id INT,
+        `delimiter` INT);
         ```
 
         If they are not quoted, the statement-mapping will not produce the expected
@@ -232,65 +344,88 @@ class MySQLScriptSplitter:
         *Note that comments are always ignored as they are not considered to be
         part of statements, with one exeception; **C-style comments representing
         MySQL extensions or optimizer hints are preserved***.
+
+        The script is scanned in one pass, see `iter_script_statements()` to
+        split a script while it is read from a file.
         """
         # If it was already computed, then skip computation and use the cache
-        if self._single_stmts is not None:
-            return self._single_stmts
-
-        # initialize variables
-        self._single_stmts = []
-        delimiter = DEFAULT_DELIMITER
-        buf: list[bytes] = []
-        prev = b""
-
-        # remove comments
-        if remove_comments:
-            code = MySQLScriptSplitter.remove_comments(code=self._code)
-        else:
-            code = self._code
-
-        # let's split the script by `delimiter pattern` - the pattern is also
-        # included in the returned list.
-        for curr in re.split(pattern=DELIMITER_PATTERN, string=code):
-            # Checking if the previous substring is a "switch of context
-            # (delimiter)" point.
-            if re.search(DELIMITER_PATTERN, prev):
-                # The next delimiter must be the sequence of chars until
-                # reaching a control char or whitespace
-                next_delimiter = self.split_by_control_char_or_white_space(curr)[0]
-
-                # We shall remove the delimiter command from the code
-                buf.pop()
-
-                # At this point buf includes all the code where `delimiter` applies.
-                self._single_stmts.extend(
-                    self._split_statement(code=b" ".join(buf), delimiter=delimiter)
-                )
+        if self._single_stmts is None:
+            tokenizer = _ScriptTokenizer(remove_comments)
+            self._single_stmts = tokenizer.feed(self._code) + tokenizer.close()
+        return self._single_stmts
 
-                # From the current substring, let's take everything but the
-                # "next delimiter" portion. Also, let's update the delimiter
-                delimiter, buf = next_delimiter, [curr[len(next_delimiter) :]]
-            else:
-                # Let's accumulate
-                buf.append(curr)
+    def __repr__(self) -> str:
+        return self._code.decode("utf-8")
 
-            # track the previous substring
-            prev = curr
 
-        # Ensure there are no loose ends
-        if buf:
-            self._single_stmts.extend(
-                self._split_statement(code=b" ".join(buf), delimiter=delimiter)
-            )
+def iter_script_statements(
+    script: Union[BinaryIO, Iterable[bytes]],
+    remove_comments: bool = True,
+) -> Generator[bytes, None, None]:
+    """Breaks a MySQL script read from a file into single statements.
 
-        return self._single_stmts
+    The statements are yielded as soon as they are read, so that scripts of
+    any size are split in constant memory, as far as their statements are
+    not that big. `DELIMITER` statements and comments are handled as
+    `MySQLScriptSplitter.split_script()` does.
 
-    def __repr__(self) -> str:
-        return self._code.decode("utf-8")
+    Args:
+        script: Binary file object, or iterable of chunks of bytes, holding
+                the script.
+        remove_comments: If False, comments are kept in the statements.
+
+    Returns:
+        A generator of statements.
+
+    Raises:
+        `InterfaceError` if an invalid delimiter string is found.
+    """
+    if hasattr(script, "read"):
+        chunks = iter(lambda: script.read(SCRIPT_CHUNK_SIZE), b"")
+    else:
+        chunks = iter(script)
+
+    tokenizer = _ScriptTokenizer(remove_comments)
+    for chunk in chunks:
+        yield from tokenizer.feed(chunk)
+    yield from tokenizer.close()
+
+
+def _partition_statements(
+    stmts: Iterable[bytes],
+    map_results: bool,
+    max_size: Optional[int] = None,
+) -> Generator[MySQLScriptPartition, None, None]:
+    """Groups single statements into multi statements.
+
+    When mapping results, CALL statements are sent apart as their number of
+    result sets is unknown. Groups are closed once they reach `max_size`.
+    """
+    group: Deque[bytes] = deque()
+    size = 0
+    for stmt in stmts:
+        if map_results and stmt[:5].upper() == b"CALL ":
+            if group:
+                yield MySQLScriptPartition(
+                    mappable_stmt=b";\n".join(group), single_stmts=group
+                )
+                group, size = deque(), 0
+            yield MySQLScriptPartition(mappable_stmt=stmt, single_stmts=deque([stmt]))
+            continue
+        group.append(stmt)
+        size += len(stmt) + 2
+        if max_size is not None and size >= max_size:
+            yield MySQLScriptPartition(
+                mappable_stmt=b";\n".join(group), single_stmts=group
+            )
+            group, size = deque(), 0
+
+    if group:
+        yield MySQLScriptPartition(mappable_stmt=b";\n".join(group), single_stmts=group)
 
 
 def split_multi_statement(
-    sql_code: bytes,
+    sql_code: Union[bytes, BinaryIO],
     map_results: bool = False,
 ) -> Generator[MySQLScriptPartition, None, None]:
     """Breaks a MySQL script into sub-scripts.
@@ -303,7 +438,7 @@ def split_multi_statement(
     to split the script into multiple query strings.
 
     Args:
-        sql_code: MySQL script.
+        sql_code: MySQL script, or binary file object holding the script.
         map_results: If True, each sub-script is `statement-result` mappable.
 
     Returns:
@@ -324,9 +459,24 @@ def split_multi_statement(
         and the `mappable_stmt` field corresponds to the sub-script (partition) that
         is guaranteed to be mappable.
 
+        Scripts given as file objects are read as the partitions are consumed,
+        and are broken into partitions of about `SCRIPT_PARTITION_SIZE` bytes,
+        whether mapping is enabled or not.
+
     Raises:
         `InterfaceError` if an invalid delimiter string is found.
     """
+    if hasattr(sql_code, "read"):
+        empty = True
+        for partition in _partition_statements(
+            iter_script_statements(sql_code), map_results, SCRIPT_PARTITION_SIZE
+        ):
+            empty = False
+            yield partition
+        if empty:
+            yield MySQLScriptPartition(single_stmts=deque([b""]), mappable_stmt=b"")
+        return
+
     if not MySQLScriptSplitter.has_delimiter(sql_code) and not map_results:
         # For those users executing single statements or scripts with no delimiters,
         # they can get a performance boost by bypassing the multi statement splitter.
@@ -358,28 +508,7 @@ def split_multi_statement(
         return
 
     # group single statements into one or more mappable multi statements.
-    i = 0
-    partition_ids = (j for j, stmt in enumerate(stmts) if stmt[:5].upper() == b"CALL ")
-    for j in partition_ids:
-        if j > i:
-            yield (
-                MySQLScriptPartition(
-                    mappable_stmt=b";\n".join(stmts[i:j]),
-                    single_stmts=deque(stmts[i:j]),
-                )
-            )
-        yield MySQLScriptPartition(
-            mappable_stmt=stmts[j], single_stmts=deque([stmts[j]])
-        )
-        i = j + 1
-
-    if i < len(stmts):
-        yield (
-            MySQLScriptPartition(
-                mappable_stmt=b";\n".join(stmts[i : len(stmts)]),
-                single_stmts=deque(stmts[i : len(stmts)]),
-            )
-        )
+    yield from _partition_statements(stmts, map_results=True)
 
 
 def get_local_infile_filenames(script: bytes) -> Deque[str]:
@@ -34,11 +34,13 @@ from __future__ import annotations
 import datetime
 import getpass
 import os
-import socket
+import re
 import struct
 import sys
+import time
 import warnings
 
+from collections import OrderedDict
 from decimal import Decimal
 from io import IOBase
 from typing import (
@@ -46,11 +48,16 @@ from typing import (
     Any,
     BinaryIO,
     Dict,
+    FrozenSet,
     Generator,
+    Hashable,
+    Iterable,
+    Iterator,
     List,
     Mapping,
     Optional,
     Sequence,
+    Set,
     Tuple,
     Type,
     Union,
@@ -94,9 +101,15 @@ from .errors import (
     get_exception,
 )
 from .logger import logger
-from .network import MySQLSocket, MySQLTCPSocket, MySQLUnixSocket
+from .network import (
+    MAX_PAYLOAD_LENGTH,
+    MySQLSocket,
+    MySQLTCPSocket,
+    MySQLUnixSocket,
+)
 from .opentelemetry.constants import OTEL_ENABLED
 from .opentelemetry.context_propagation import with_context_propagation
+from .pipeline import MySQLPipeline
 from .protocol import (
     EOF_STATUS,
     ERR_STATUS,
@@ -104,6 +117,16 @@ from .protocol import (
     OK_STATUS,
     MySQLProtocol,
 )
+from .query_cache import (
+    READ_ONLY_KEYWORDS,
+    TRANSACTION_KEYWORDS,
+    QueryResultCache,
+    is_cacheable,
+    statement_keyword,
+    statement_tables,
+    use_statement_schema,
+)
+from .stats import CommandHookType, ConnectionStats, WireCounters
 from .types import (
     BinaryProtocolType,
     DescriptionType,
@@ -117,6 +140,7 @@ from .types import (
 )
 from .utils import (
     get_platform,
+    get_source_host,
     int1store,
     int4store,
     lc_int,
@@ -130,6 +154,176 @@ if TYPE_CHECKING:
 if OTEL_ENABLED:
     from .opentelemetry.instrumentation import end_span, record_exception_event
 
+# System variables whose changes the server is asked to report, so that the
+# cached values stay authoritative.
+SESSION_TRACKED_VARIABLES: Tuple[str, ...] = (
+    "autocommit",
+    "character_set_client",
+    "character_set_connection",
+    "character_set_results",
+    "collation_connection",
+    "session_track_schema",
+    "sql_mode",
+    "time_zone",
+)
+
+# Size of the chunks read from local infiles when sending them
+LOCAL_INFILE_CHUNK_SIZE = 131072  # 128 KB
+
+# Escaping of field values in rows of virtual local infiles, matching the
+# defaults of LOAD DATA (FIELDS TERMINATED BY '\t' ESCAPED BY '\\'
+# LINES TERMINATED BY '\n')
+LOCAL_INFILE_ESCAPES = {
+    ord("\\"): "\\\\",
+    ord("\t"): "\\t",
+    ord("\n"): "\\n",
+    ord("\r"): "\\r",
+    0: "\\0",
+}
+# the same escapes for bytes values, which may hold any binary data
+LOCAL_INFILE_BYTES_ESCAPES = {
+    bytes([char]): escape.encode() for char, escape in LOCAL_INFILE_ESCAPES.items()
+}
+RE_LOCAL_INFILE_BYTES_ESCAPE = re.compile(rb"[\\\t\n\r\x00]")
+
+LocalInfileSourceType = Union[
+    str, bytes, bytearray, memoryview, IOBase, Iterable[Any]
+]
+
+
+def _encode_local_infile_row(row: Any, charset: str) -> bytes:
+    """Encode a row of a virtual local infile
+
+    Strings and bytes are sent as a line of their own, sequences of values
+    as a line of tab separated fields, NULL being written as \\N and booleans
+    as 1 or 0. Bytes values are escaped as they are, without being decoded.
+    """
+    if isinstance(row, str):
+        row = row.encode(charset)
+    if isinstance(row, (bytes, bytearray)):
+        return row if row.endswith(b"\n") else row + b"\n"
+    fields = []
+    for value in row:
+        if value is None:
+            fields.append(b"\\N")
+        elif isinstance(value, (bytes, bytearray)):
+            fields.append(
+                RE_LOCAL_INFILE_BYTES_ESCAPE.sub(
+                    lambda match: LOCAL_INFILE_BYTES_ESCAPES[match.group()], value
+                )
+            )
+        elif isinstance(value, bool):
+            fields.append(b"1" if value else b"0")
+        else:
+            fields.append(str(value).translate(LOCAL_INFILE_ESCAPES).encode(charset))
+    return b"\t".join(fields) + b"\n"
+
+
+def _local_infile_chunks(
+    source: LocalInfileSourceType, chunk_size: int, charset: str
+) -> Iterator[bytes]:
+    """Yields the content of a virtual local infile in chunks
+
+    Bytes-like objects are sliced without being copied, file objects are
+    read chunk by chunk and the rows of other iterables are encoded and
+    gathered in chunks of up to chunk_size bytes.
+    """
+    if isinstance(source, str):
+        source = source.encode(charset)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source).cast("B")
+        for offset in range(0, len(view), chunk_size):
+            yield view[offset : offset + chunk_size]
+        return
+    if hasattr(source, "read"):
+        buf = source.read(chunk_size)
+        while buf:
+            yield buf.encode(charset) if isinstance(buf, str) else buf
+            buf = source.read(chunk_size)
+        return
+    chunk = bytearray()
+    for row in source:
+        chunk += _encode_local_infile_row(row, charset)
+        while len(chunk) >= chunk_size:
+            yield bytes(chunk[:chunk_size])
+            del chunk[:chunk_size]
+    if chunk:
+        yield bytes(chunk)
+
+
+class PreparedStatementCache:
+    """LRU cache of server-side prepared statements
+
+    Prepared statements are keyed by the statement sent with
+    COM_STMT_PREPARE. When the cache is full, adding a statement evicts
+    the least recently used one, which is returned so it can be
+    deallocated on the server.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size: int = size
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._statements: OrderedDict[
+            bytes, Mapping[str, Union[int, List[DescriptionType]]]
+        ] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+    def get(
+        self, statement: bytes
+    ) -> Optional[Mapping[str, Union[int, List[DescriptionType]]]]:
+        """Get a prepared statement and mark it as most recently used
+
+        Returns None when the statement is not cached.
+        """
+        prepared = self._statements.get(statement)
+        if prepared is None:
+            self.misses += 1
+            return None
+        self._statements.move_to_end(statement)
+        self.hits += 1
+        return prepared
+
+    def put(
+        self,
+        statement: bytes,
+        prepared: Mapping[str, Union[int, List[DescriptionType]]],
+    ) -> Optional[Mapping[str, Union[int, List[DescriptionType]]]]:
+        """Add a prepared statement
+
+        Returns the evicted prepared statement, or None.
+        """
+        self._statements[statement] = prepared
+        self._statements.move_to_end(statement)
+        if len(self._statements) <= self.size:
+            return None
+        self.evictions += 1
+        return self._statements.popitem(last=False)[1]
+
+    def clear(self) -> None:
+        """Forget all prepared statements
+
+        Used when the server already deallocated them, for example after
+        reconnecting or resetting the session.
+        """
+        self._statements.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get the cache statistics
+
+        Returns a dict.
+        """
+        return {
+            "size": self.size,
+            "statements": len(self._statements),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
 
 class MySQLConnection(MySQLConnectionAbstract):
     """Connection to a MySQL Server"""
@@ -167,13 +361,20 @@ class MySQLConnection(MySQLConnectionAbstract):
         self._raw: bool = False
         self._in_transaction: bool = False
 
-        self._prepared_statements: Any = None
+        self._prepared_statements: Optional[PreparedStatementCache] = None
 
         self._ssl_active: bool = False
         self._auth_plugin: Optional[str] = None
         self._krb_service_principal: Optional[str] = None
         self._pool_config_version: Any = None
         self._query_attrs_supported: int = False
+        self._session_track_supported: bool = False
+        self._session_vars: Dict[str, Optional[str]] = {}
+        self._session_schema: Optional[str] = None
+        self._query_cache_pending: Set[str] = set()
+
+        self._wire: WireCounters = WireCounters()
+        self._command_hook: Optional[CommandHookType] = None
 
         self._columns_desc: List[DescriptionType] = []
         self._mfa_nfactor: int = 1
@@ -200,7 +401,7 @@ class MySQLConnection(MySQLConnectionAbstract):
         default_conn_attrs = {
             "_pid": str(os.getpid()),
             "_platform": platform["arch"],
-            "_source_host": socket.gethostname(),
+            "_source_host": get_source_host(),
             "_client_name": "mysql-connector-python",
             "_client_license": client_license,
             "_client_version": ".".join([str(x) for x in version.VERSION[0:3]]),
@@ -255,6 +456,12 @@ class MySQLConnection(MySQLConnectionAbstract):
             self._query_attrs_supported = True
             self.client_flags = [ClientFlag.CLIENT_QUERY_ATTRIBUTES]
 
+        self._session_track_supported = bool(
+            handshake["capabilities"] & ClientFlag.SESSION_TRACK
+        )
+        if self._session_track_supported:
+            self.client_flags = [ClientFlag.SESSION_TRACK]
+
         if handshake["capabilities"] & ClientFlag.MULTI_FACTOR_AUTHENTICATION:
             self.client_flags = [ClientFlag.MULTI_FACTOR_AUTHENTICATION]
 
@@ -377,6 +584,7 @@ class MySQLConnection(MySQLConnectionAbstract):
             self._user = cls.get_user_from_credentials()
 
         self._protocol = MySQLProtocol()
+        self._wire.retire_socket(self._socket)
         self._socket = self._get_connection()
         try:
             self._socket.open_connection()
@@ -397,9 +605,13 @@ class MySQLConnection(MySQLConnectionAbstract):
 
             if self._client_flags & ClientFlag.COMPRESS:
                 # update the network layer accordingly
-                self._socket.switch_to_compressed_mode()
+                self._socket.switch_to_compressed_mode(
+                    self._compress_threshold, self._compress_level
+                )
 
             self._socket.set_connection_timeout(None)
+            self._reset_prepared_statements()
+            self._reset_session_state(self._database)
         except Exception as err:
             # close socket
             self._socket.close_connection()
@@ -455,6 +667,9 @@ class MySQLConnection(MySQLConnectionAbstract):
         if not self._socket:
             return
 
+        if self._prepared_statements is not None:
+            self._prepared_statements.clear()
+
         try:
             self.cmd_quit()
         except (AttributeError, Error):
@@ -503,6 +718,8 @@ class MySQLConnection(MySQLConnectionAbstract):
         """
         self.handle_unread_result()
 
+        self._wire.commands[command] += 1
+        started = time.monotonic()
         try:
             self._socket.send(
                 self._protocol.make_command(command, packet or argument),
@@ -510,7 +727,7 @@ class MySQLConnection(MySQLConnectionAbstract):
                 compressed_packet_number,
                 write_timeout or self._write_timeout,
             )
-            return (
+            response = (
                 self._socket.recv(read_timeout or self._read_timeout)
                 if expect_response
                 else None
@@ -518,36 +735,44 @@ class MySQLConnection(MySQLConnectionAbstract):
         except AttributeError as err:
             raise OperationalError("MySQL Connection not available") from err
 
+        if self._command_hook is not None:
+            self._command_hook(
+                command, bytes(packet or argument or b""), time.monotonic() - started
+            )
+        return response
+
     @handle_read_write_timeout()
     def _send_data(
         self,
-        data_file: BinaryIO,
+        data_file: Union[BinaryIO, Iterable[bytes]],
         send_empty_packet: bool = False,
         read_timeout: Optional[int] = None,
         write_timeout: Optional[int] = None,
     ) -> bytearray:
         """Send data to the MySQL server
 
-        This method accepts a file-like object and sends its data
-        as is to the MySQL server. If the send_empty_packet is
-        True, it will send an extra empty package (for example
-        when using LOAD LOCAL DATA INFILE).
+        This method accepts a file-like object, or an iterable of chunks
+        of bytes, and sends its data as is to the MySQL server. If the
+        send_empty_packet is True, it will send an extra empty package (for
+        example when using LOAD LOCAL DATA INFILE).
 
         Returns a MySQL packet.
         """
         self.handle_unread_result()
 
-        if not hasattr(data_file, "read"):
+        if hasattr(data_file, "read"):
+            chunk_size = LOCAL_INFILE_CHUNK_SIZE - 16
+            chunks = iter(lambda: data_file.read(chunk_size), b"")
+        elif isinstance(data_file, Iterable):
+            chunks = iter(data_file)
+        else:
             raise ValueError("expecting a file-like object")
 
-        chunk_size = 131072  # 128 KB
         try:
-            buf = data_file.read(chunk_size - 16)
-            while buf:
+            for buf in chunks:
                 self._socket.send(
                     buf, write_timeout=write_timeout or self._write_timeout
                 )
-                buf = data_file.read(chunk_size - 16)
         except AttributeError as err:
             raise OperationalError("MySQL Connection not available") from err
 
@@ -590,11 +815,75 @@ class MySQLConnection(MySQLConnectionAbstract):
         if packet[4] == OK_STATUS:
             ok_pkt = self._protocol.parse_ok(packet)
             self._handle_server_status(ok_pkt["status_flag"])
+            if "session_state" in ok_pkt:
+                self._handle_session_state(ok_pkt["session_state"])
             return ok_pkt
         if packet[4] == ERR_STATUS:
             raise get_exception(packet)
         raise InterfaceError("Expected OK packet")
 
+    def _handle_session_state(self, state: Dict[str, Any]) -> None:
+        """Handle the session state changes found in MySQL OK packets
+
+        This method keeps the cached session variables, schema and
+        character set in sync with the changes reported by the server.
+        """
+        variables = state.get("system_variables", {})
+        tracked = variables.get("session_track_system_variables")
+        if tracked is not None and "*" not in tracked.split(","):
+            # forget the variables the server no longer reports
+            self._session_vars = {
+                name: value
+                for name, value in self._session_vars.items()
+                if name in tracked.split(",")
+            }
+        self._session_vars.update(variables)
+
+        if "schema" in state:
+            self._session_schema = state["schema"] or None
+
+        collation = variables.get("collation_connection")
+        charset = variables.get("character_set_connection")
+        try:
+            if collation:
+                charset_id = self._character_set.get_charset_info(
+                    collation=collation
+                )[0]
+            elif charset and charset != self.charset:
+                charset_id = self._character_set.get_charset_info(charset)[0]
+            else:
+                return
+        except ProgrammingError:
+            return  # unknown to the connector, keep the current one
+        if charset_id != self._charset_id:
+            self._charset_id = charset_id
+            if self.converter:
+                self.converter.set_charset(
+                    self.charset, character_set=self._character_set
+                )
+
+    def _reset_session_state(self, schema: Optional[str] = None) -> None:
+        """Forget the session state reported by the server"""
+        self._session_vars = {}
+        self._session_schema = schema or None
+        self._query_cache_pending.clear()
+
+    def _session_tracking_setup(self) -> List[str]:
+        """Returns the assignments enabling session state tracking
+
+        The tracked variables are assigned their own value so the server
+        reports them right away.
+        """
+        if not self._session_track_supported:
+            return []
+        return [
+            "@@session.session_track_system_variables = "
+            f"'{','.join(SESSION_TRACKED_VARIABLES)}'",
+            "@@session.session_track_schema = ON",
+            "@@session.sql_mode = @@session.sql_mode",
+            "@@session.time_zone = @@session.time_zone",
+        ]
+
     def _handle_eof(self, packet: bytes) -> EofPacketType:
         """Handle a MySQL EOF packet
 
@@ -634,8 +923,18 @@ class MySQLConnection(MySQLConnectionAbstract):
                 "issue to the development team."
             )
 
+        filename_from_request = self._local_infile_filenames.popleft()
+        if filename in self._local_infiles:
+            if filename != filename_from_request:
+                raise InterfaceError(
+                    f"Filename {filename} from the server's response is not the same "
+                    f"as filename {filename_from_request} from the "
+                    "client's request."
+                )
+            return self._send_local_infile(filename, read_timeout, write_timeout)
+
         file_name = os.path.abspath(filename)
-        file_name_from_request = os.path.abspath(self._local_infile_filenames.popleft())
+        file_name_from_request = os.path.abspath(filename_from_request)
 
         # Verify the file location specified by `filename` from client's request exists
         if not os.path.exists(file_name_from_request):
@@ -712,6 +1011,38 @@ class MySQLConnection(MySQLConnectionAbstract):
             except (IOError, NameError):
                 pass
 
+    def _send_local_infile(
+        self,
+        name: str,
+        read_timeout: Optional[int] = None,
+        write_timeout: Optional[int] = None,
+    ) -> OkPacketType:
+        """Send a virtual local infile registered with register_local_infile()
+
+        Chunks are sized to fit the server max_allowed_packet when it is
+        known. When reading the source fails, the data is ended early
+        and the error is raised once the server acknowledged it.
+        """
+        chunk_size = min(
+            self._max_allowed_packet or LOCAL_INFILE_CHUNK_SIZE, MAX_PAYLOAD_LENGTH
+        )
+        failures: List[Exception] = []
+
+        def read_source() -> Iterator[bytes]:
+            try:
+                yield from _local_infile_chunks(
+                    self._local_infiles[name], chunk_size - 16, self.python_charset
+                )
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                failures.append(err)
+
+        packet = self._send_data(read_source(), True, read_timeout, write_timeout)
+        if failures:
+            raise InterfaceError(
+                f"Local infile '{name}' could not be read"
+            ) from failures[0]
+        return self._handle_ok(packet)
+
     @handle_read_write_timeout()
     def _handle_result(
         self,
@@ -815,6 +1146,8 @@ class MySQLConnection(MySQLConnectionAbstract):
         if not self.unread_result:
             raise InternalError("No result set available")
 
+        started = time.monotonic()
+        recv_time = self._socket.recv_time
         rows = ([], None)  # type: ignore[var-annotated]
         try:
             read_timeout = kwargs.get("read_timeout", None)
@@ -849,6 +1182,10 @@ class MySQLConnection(MySQLConnectionAbstract):
         ):
             row_to_python = self.converter.row_to_python
             rows = [row_to_python(row, self._columns_desc) for row in rows]
+        # time spent parsing and converting, not waiting for the packets
+        self._wire.decode_time += (time.monotonic() - started) - (
+            self._socket.recv_time - recv_time
+        )
 
         if eof_p is not None:
             self._handle_server_status(
@@ -874,30 +1211,17 @@ class MySQLConnection(MySQLConnectionAbstract):
 
         Returns a dict()
         """
-        return self._handle_ok(
+        ok_pkt = self._handle_ok(
             self._send_cmd(ServerCmd.INIT_DB, database.encode("utf-8"))
         )
+        self._session_schema = database
+        return ok_pkt
 
-    @with_context_propagation
-    @handle_read_write_timeout()
-    def cmd_query(
-        self,
-        query: StrOrBytes,
-        raw: bool = False,
-        buffered: bool = False,
-        raw_as_string: bool = False,
-        **kwargs: Any,
-    ) -> ResultType:
-        if not isinstance(query, bytearray):
-            if isinstance(query, str):
-                query = query.encode("utf-8")
-            query = bytearray(query)
+    def _make_query_packet(self, query: bytes) -> bytes:
+        """Make the argument of COM_QUERY, prefixed with the query attributes
 
-        # Set/Reset internal state related to query execution
-        self._query = query
-        self._local_infile_filenames = None
-
-        # Prepare query attrs
+        The query attributes are only sent when the server supports them.
+        """
         charset = self.charset if self.charset != "utf8mb4" else "utf8"
         packet = bytearray()
         if not self._query_attrs_supported and self._query_attrs:
@@ -976,7 +1300,28 @@ class MySQLConnection(MySQLConnectionAbstract):
                     packet.extend(value)
 
         packet.extend(query)
-        query = bytes(packet)
+        return bytes(packet)
+
+    @with_context_propagation
+    @handle_read_write_timeout()
+    def cmd_query(
+        self,
+        query: StrOrBytes,
+        raw: bool = False,
+        buffered: bool = False,
+        raw_as_string: bool = False,
+        **kwargs: Any,
+    ) -> ResultType:
+        if not isinstance(query, bytearray):
+            if isinstance(query, str):
+                query = query.encode("utf-8")
+            query = bytearray(query)
+
+        # Set/Reset internal state related to query execution
+        self._query = query
+        self._local_infile_filenames = None
+
+        query = self._make_query_packet(query)
         try:
             read_timeout = kwargs.get("read_timeout", None)
             write_timeout = kwargs.get("write_timeout", None)
@@ -999,6 +1344,8 @@ class MySQLConnection(MySQLConnectionAbstract):
                 )
                 raise DatabaseError(err_msg) from err
             raise
+        if self._query_cache is not None:
+            self._update_query_cache(self._query)
         return result
 
     @handle_read_write_timeout()
@@ -1061,6 +1408,9 @@ class MySQLConnection(MySQLConnectionAbstract):
                 write_timeout,
             )
 
+        if self._query_cache is not None:
+            self._update_query_cache(statements)
+
     @cmd_refresh_verify_options()
     def cmd_refresh(self, options: int) -> OkPacketType:
         if not options & (
@@ -1103,6 +1453,7 @@ class MySQLConnection(MySQLConnectionAbstract):
         self.handle_unread_result()
 
         packet = self._protocol.make_command(ServerCmd.QUIT)
+        self._wire.commands[ServerCmd.QUIT] += 1
         try:
             self._socket.send(packet, 0, 0, self._write_timeout)
         except WriteTimeoutError as _:
@@ -1129,6 +1480,7 @@ class MySQLConnection(MySQLConnectionAbstract):
         self.handle_unread_result()
 
         packet = self._protocol.make_command(ServerCmd.STATISTICS)
+        self._wire.commands[ServerCmd.STATISTICS] += 1
         self._socket.send(packet, 0, 0, self._write_timeout)
         return self._protocol.parse_statistics(self._socket.recv(self._read_timeout))
 
@@ -1244,6 +1596,9 @@ class MySQLConnection(MySQLConnectionAbstract):
             write_timeout=self._write_timeout,
         )
 
+        self._reset_prepared_statements()
+        self._reset_session_state(database)
+
         if not (self._client_flags & ClientFlag.CONNECT_WITH_DB) and database:
             self.cmd_init_db(database)
 
@@ -1255,6 +1610,8 @@ class MySQLConnection(MySQLConnectionAbstract):
     @property
     def database(self) -> str:
         """Get the current database"""
+        if self._session_vars.get("session_track_schema") == "ON":
+            return self._session_schema
         return self.info_query("SELECT DATABASE()")[0]  # type: ignore[return-value]
 
     @database.setter
@@ -1277,6 +1634,27 @@ class MySQLConnection(MySQLConnectionAbstract):
             return False  # This method does not raise
         return True
 
+    def is_alive(self) -> bool:
+        """Reports whether the connection looks usable, without a round trip
+
+        Unlike is_connected(), no COM_PING is sent. The socket is polled
+        locally to find out whether the server closed or reset the
+        connection. A server that vanished without closing the connection
+        is not detected; use is_connected() when that matters.
+
+        Returns True or False.
+        """
+        if self._socket is None:
+            return False
+        return self._socket.is_alive(expect_data=self._unread_result)
+
+    @property
+    def idle_time(self) -> Optional[float]:
+        """Seconds elapsed since the last successful I/O on the connection"""
+        if self._socket is None:
+            return None
+        return self._socket.idle_time
+
     def set_allow_local_infile_in_path(self, path: str) -> None:
         """Set the path that user can upload files.
 
@@ -1285,6 +1663,153 @@ class MySQLConnection(MySQLConnectionAbstract):
         """
         self._allow_local_infile_in_path = path
 
+    def register_local_infile(self, name: str, source: LocalInfileSourceType) -> None:
+        """Register a virtual file for LOAD DATA LOCAL INFILE statements.
+
+        Statements loading the file `name` read the data from `source`
+        instead of the file system, without writing it to disk. The source
+        is one of:
+
+        - a bytes-like object, sent as is;
+        - a file object, opened in binary or text mode;
+        - an iterable of rows. Rows given as strings or bytes are lines of
+          their own, sequences of values are written as tab separated
+          fields, which is the default format of LOAD DATA.
+
+        File objects and generators are consumed by the first statement
+        reading them. Virtual files are not subject to allow_local_infile
+        or allow_local_infile_in_path, but the connection must have been
+        opened with the `ClientFlag.LOCAL_FILES` client flag.
+
+        Args:
+            name: File name used in the LOAD DATA LOCAL INFILE statement.
+            source: Data of the file.
+
+        Raises:
+            ProgrammingError: When the LOCAL_FILES client flag is not set.
+
+        Examples:
+            ```
+            >>> cnx.register_local_infile("logs", [("LOGIN", "user 1"), ("LOGOUT", None)])
+            >>> cur.execute(
+            ...     "LOAD DATA LOCAL INFILE 'logs' INTO TABLE activity_logs "
+            ...     "(action, details)"
+            ... )
+            ```
+        """
+        if not flag_is_set(ClientFlag.LOCAL_FILES, self._client_flags):
+            raise ProgrammingError(
+                "Virtual local infiles require the LOCAL_FILES client flag"
+            )
+        self._local_infiles[name] = source
+
+    def unregister_local_infile(self, name: str) -> None:
+        """Remove a virtual file registered with register_local_infile().
+
+        Args:
+            name: File name given when registering the file.
+        """
+        self._local_infiles.pop(name, None)
+
+    def stats(self) -> ConnectionStats:
+        """Gets the wire-level counters of the connection.
+
+        The counters cover the whole life of the connection object, across
+        reconnections:
+
+        - `commands`: commands sent, by `ServerCmd` name
+        - `packets_sent`, `packets_received`: MySQL packets
+        - `bytes_sent`, `bytes_received`: bytes on the wire, headers included
+        - `recv_time`: seconds spent waiting for and reading packets
+        - `decode_time`: seconds spent parsing and converting rows
+        - `encode_time`: seconds spent converting parameters
+
+        Returns:
+            ConnectionStats: A snapshot of the counters. Used as a context
+                             manager, it holds on exit what was spent within
+                             the block instead.
+
+        Examples:
+            ```
+            >>> with cnx.stats() as stats:
+            ...     cur.execute("SELECT * FROM employees WHERE emp_no = %s", (1,))
+            ...     cur.fetchall()
+            >>> stats["commands"], stats["packets_sent"]
+            ({'QUERY': 1}, 1)
+            ```
+        """
+        return ConnectionStats(lambda: self._wire.snapshot(self._socket))
+
+    @property
+    def command_hook(self) -> Optional[CommandHookType]:
+        """Gets the callback called after each command sent to the server."""
+        return self._command_hook
+
+    @command_hook.setter
+    def command_hook(self, hook: Optional[CommandHookType]) -> None:
+        """Sets a callback called after each command sent to the server.
+
+        The callback takes the command (`ServerCmd`), its argument as bytes
+        and the seconds elapsed until the server started responding, or
+        until the command was sent for those without a response. Reading
+        the rows of a result set is not included.
+
+        Examples:
+            ```
+            >>> def log_slow_queries(command, argument, elapsed):
+            ...     if command == ServerCmd.QUERY and elapsed > 1.0:
+            ...         logger.warning("Slow query (%.1fs): %r", elapsed, argument)
+            >>> cnx.command_hook = log_slow_queries
+            ```
+        """
+        self._command_hook = hook
+
+    def pipeline(self) -> MySQLPipeline:
+        """Creates a pipeline of statements.
+
+        The statements queued in the pipeline are sent back to back when it
+        is synced, and their results read afterwards, saving a round trip
+        per statement. An error returned by the server for a statement is
+        set on its result only, the other statements are not affected.
+
+        Returns:
+            MySQLPipeline: The pipeline, synced when used as a context manager.
+
+        Examples:
+            ```
+            >>> with cnx.pipeline() as pipe:
+            ...     inserted = pipe.execute(
+            ...         "INSERT INTO employees (first_name) VALUES (%s)", ("Jane",)
+            ...     )
+            ...     missing = pipe.execute("SELECT * FROM no_such_table")
+            ...     count = pipe.execute("SELECT COUNT(*) FROM employees")
+            >>> inserted.lastrowid, missing.exception().errno, count.result()
+            (501, 1146, [(501,)])
+            ```
+        """
+        return MySQLPipeline(self)
+
+    @MySQLConnectionAbstract.time_zone.getter
+    def time_zone(self) -> str:
+        """Gets the current time zone"""
+        if "time_zone" in self._session_vars:
+            return self._session_vars["time_zone"]
+        return super().time_zone
+
+    @MySQLConnectionAbstract.sql_mode.getter
+    def sql_mode(self) -> str:
+        """Gets the SQL mode"""
+        if "sql_mode" in self._session_vars:
+            return self._session_vars["sql_mode"]
+        return super().sql_mode
+
+    @MySQLConnectionAbstract.autocommit.getter
+    def autocommit(self) -> bool:
+        """Gets whether autocommit is on or off"""
+        if "autocommit" in self._session_vars:
+            return self._session_vars["autocommit"] == "ON"
+        return super().autocommit
+
     @MySQLConnectionAbstract.use_unicode.setter
     def use_unicode(self, value: bool) -> None:
         self._use_unicode = value
@@ -1378,6 +1903,8 @@ class MySQLConnection(MySQLConnectionAbstract):
         dictionary: Optional[bool] = None,
         read_timeout: Optional[int] = None,
         write_timeout: Optional[int] = None,
+        server_side: Optional[bool] = None,
+        fetch_size: Optional[int] = None,
     ) -> MySQLCursor:
         """Instantiates and returns a cursor
 
@@ -1393,6 +1920,10 @@ class MySQLConnection(MySQLConnectionAbstract):
         cursor_class parameter, but it needs to be a subclass of
         mysql.connector.cursor.MySQLCursor.
 
+        Prepared cursors can fetch result sets from a read-only
+        server-side cursor by setting server_side to True. Rows are then
+        fetched in batches of fetch_size rows.
+
         Raises ProgrammingError when cursor_class is not a subclass of
         MySQLCursor. Raises ValueError when cursor is not available.
         Raises InterfaceError when read_timeout or write_timeout is not
@@ -1402,7 +1933,7 @@ class MySQLConnection(MySQLConnectionAbstract):
         """
         self.handle_unread_result()
 
-        if not self.is_connected():
+        if not self.is_alive():
             raise OperationalError("MySQL Connection not available")
         if read_timeout is not None and (
             not isinstance(read_timeout, int) or read_timeout < 0
@@ -1432,6 +1963,17 @@ class MySQLConnection(MySQLConnectionAbstract):
         if prepared is True:
             cursor_type |= 16
 
+        cursor_args: Dict[str, Any] = {}
+        if server_side is not None or fetch_size is not None:
+            if prepared is not True:
+                raise ValueError(
+                    "Options server_side and fetch_size require a prepared cursor"
+                )
+            if server_side is not None:
+                cursor_args["server_side"] = server_side
+            if fetch_size is not None:
+                cursor_args["fetch_size"] = fetch_size
+
         types = {
             0: MySQLCursor,  # 0
             1: MySQLCursorBuffered,
@@ -1443,7 +1985,9 @@ class MySQLConnection(MySQLConnectionAbstract):
             20: MySQLCursorPreparedDict,
         }
         try:
-            return (types[cursor_type])(self, read_timeout, write_timeout)
+            return (types[cursor_type])(
+                self, read_timeout, write_timeout, **cursor_args
+            )
         except KeyError:
             args = ("buffered", "raw", "dictionary", "prepared")
             raise ValueError(
@@ -1611,6 +2155,169 @@ class MySQLConnection(MySQLConnectionAbstract):
             self._handle_eof(self._socket.recv(read_timeout or self._read_timeout))
         return result
 
+    def _reset_prepared_statements(self) -> None:
+        """Reset the prepared statement cache
+
+        Called whenever the server deallocates all prepared statements of
+        the session, and to apply the prepared_statement_cache_size option.
+        """
+        if self._protocol is not None:
+            self._protocol.forget_stmt_execute_plan()
+        size = self._prepared_statement_cache_size
+        if not size:
+            self._prepared_statements = None
+        elif self._prepared_statements is None or (
+            self._prepared_statements.size != size
+        ):
+            self._prepared_statements = PreparedStatementCache(size)
+        else:
+            self._prepared_statements.clear()
+
+    @property
+    def query_cache(self) -> Optional[QueryResultCache]:
+        """Get the query result cache
+
+        Returns None unless the connection was configured with the
+        query_cache option.
+        """
+        return self._query_cache
+
+    def _query_cache_key(
+        self, statement: bytes
+    ) -> Optional[Tuple[Hashable, FrozenSet[str]]]:
+        """Returns the cache key and the tables of a statement
+
+        Returns None when the result of the statement can't be cached, or
+        when it reads tables written by the ongoing transaction. As the cache
+        holds converted rows and may be shared by connections, the key
+        includes the settings the rows are converted with.
+        """
+        if self._query_cache is None or self._raw or not is_cacheable(statement):
+            return None
+        tables = statement_tables(statement)
+        pending = self._query_cache_pending
+        if pending and ("*" in pending or not pending.isdisjoint(tables)):
+            return None
+        session_vars = self._session_vars
+        key = (
+            self._unix_socket or self._host,
+            self._port,
+            self._user,
+            self._session_schema,
+            # the settings the cached rows were converted with
+            self._converter_class,
+            self._charset_id,
+            self._use_unicode,
+            session_vars.get("character_set_results"),
+            session_vars.get("time_zone", self._time_zone),
+            statement,
+        )
+        return key, tables
+
+    def _update_query_cache(self, statement: bytes) -> None:
+        """Evict the cached results made stale by a statement
+
+        Results read from the tables written by the statement are evicted
+        right away, and again when the transaction ends, as other connections
+        may have cached the rows committed in the meantime. Statements whose
+        tables can't be found, like CALL, evict all the results.
+        """
+        statement = bytes(statement)
+        keyword = statement_keyword(statement)
+        multi = b";" in statement.rstrip().rstrip(b";")
+        if keyword == b"USE" and not multi:
+            if self._session_vars.get("session_track_schema") != "ON":
+                self._session_schema = (
+                    use_statement_schema(statement) or self._session_schema
+                )
+        elif multi or (
+            keyword not in READ_ONLY_KEYWORDS and keyword not in TRANSACTION_KEYWORDS
+        ):
+            tables = statement_tables(statement)
+            if tables:
+                self._query_cache.invalidate(*tables)
+            else:
+                self._query_cache.clear()
+            if self._in_transaction:
+                self._query_cache_pending.update(tables or ("*",))
+
+        if self._query_cache_pending and not self._in_transaction:
+            pending = self._query_cache_pending
+            self._query_cache_pending = set()
+            if "*" in pending:
+                self._query_cache.clear()
+            else:
+                self._query_cache.invalidate(*pending)
+
+    @property
+    def prepared_statement_cache(self) -> Optional[PreparedStatementCache]:
+        """Get the prepared statement cache
+
+        Returns None unless the connection was configured with
+        a prepared_statement_cache_size greater than zero.
+        """
+        return self._prepared_statements
+
+    def get_prepared_statement(
+        self,
+        statement: bytes,
+        **kwargs: Any,
+    ) -> Mapping[str, Union[int, List[DescriptionType]]]:
+        """Get a prepared statement from the cache
+
+        The statement is prepared and added to the cache when it is not
+        cached yet. The least recently used statement is deallocated when
+        the cache is full. Requires the prepared statement cache to be
+        enabled.
+
+        Returns a dict()
+        """
+        prepared = self._prepared_statements.get(statement)
+        if prepared is None:
+            prepared = self.cmd_stmt_prepare(statement, **kwargs)
+            evicted = self._prepared_statements.put(statement, prepared)
+            if evicted is not None:
+                try:
+                    self.cmd_stmt_close(evicted["statement_id"], **kwargs)
+                except Error:
+                    # We tried to deallocate, but it's OK when we fail.
+                    pass
+        return prepared
+
+    def _make_stmt_execute_packet(
+        self,
+        statement_id: int,
+        data: Sequence[BinaryProtocolType],
+        parameters: Sequence,
+        flags: int = 0,
+        long_data_used: Optional[Dict[int, Tuple[bool]]] = None,
+    ) -> bytes:
+        """Make the argument of COM_STMT_EXECUTE"""
+        started = time.monotonic()
+        if self._client_flags & ClientFlag.CLIENT_QUERY_ATTRIBUTES:
+            execute_packet = self._protocol.make_stmt_execute(
+                statement_id,
+                data,
+                tuple(parameters),
+                flags,
+                long_data_used,
+                self.charset,
+                self.query_attrs,
+                self._converter_str_fallback,
+            )
+        else:
+            execute_packet = self._protocol.make_stmt_execute(
+                statement_id,
+                data,
+                tuple(parameters),
+                flags,
+                long_data_used,
+                self.charset,
+                converter_str_fallback=self._converter_str_fallback,
+            )
+        self._wire.encode_time += time.monotonic() - started
+        return execute_packet
+
     @with_context_propagation
     def cmd_stmt_execute(
         self,
@@ -1647,27 +2354,9 @@ class MySQLConnection(MySQLConnectionAbstract):
                 "This version of the server does not support Query Attributes",
                 category=Warning,
             )
-        if self._client_flags & ClientFlag.CLIENT_QUERY_ATTRIBUTES:
-            execute_packet = self._protocol.make_stmt_execute(
-                statement_id,
-                data,
-                tuple(parameters),
-                flags,
-                long_data_used,
-                self.charset,
-                self.query_attrs,
-                self._converter_str_fallback,
-            )
-        else:
-            execute_packet = self._protocol.make_stmt_execute(
-                statement_id,
-                data,
-                tuple(parameters),
-                flags,
-                long_data_used,
-                self.charset,
-                converter_str_fallback=self._converter_str_fallback,
-            )
+        execute_packet = self._make_stmt_execute_packet(
+            statement_id, data, parameters, flags, long_data_used
+        )
         packet = self._send_cmd(
             ServerCmd.STMT_EXECUTE,
             packet=execute_packet,
@@ -1688,6 +2377,7 @@ class MySQLConnection(MySQLConnectionAbstract):
         statement_id. Note that the MySQL server does not return
         anything.
         """
+        self._protocol.forget_stmt_execute_plan(statement_id)
         self._send_cmd(
             ServerCmd.STMT_CLOSE,
             int4store(statement_id),
@@ -1771,6 +2461,8 @@ class MySQLConnection(MySQLConnectionAbstract):
         """
         try:
             self._handle_ok(self._send_cmd(ServerCmd.RESET_CONNECTION))
+            self._reset_prepared_statements()
+            self._reset_session_state(self._session_schema)
             self._post_connection()
             return True
         except (NotSupportedError, OperationalError):
@@ -11,6 +11,7 @@ DB_CONFIG = {
 	'password': os.environ.get('DB_PASSWORD'),
 	'database': os.environ.get('DB_NAME'),
 	'port': int(os.environ.get('DB_PORT', '3306')),
+	'fast_connect': True,
 }
 
 
@@ -32,7 +33,7 @@ def _log_activity(action: str, details: str) -> None:
 	finally:
 		if 'cursor' in locals():
 			cursor.close()
-		if 'conn' in locals() and conn.is_connected():
+		if 'conn' in locals() and conn.is_alive():
 			conn.close()
 
 
@@ -162,5 +163,5 @@ def lambda_handler(event, _context):
 	finally:
 		if 'cursor' in locals():
 			cursor.close()
-		if 'conn' in locals() and conn.is_connected():
+		if 'conn' in locals() and conn.is_alive():
 			conn.close()
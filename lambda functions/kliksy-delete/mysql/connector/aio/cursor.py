@@ -179,16 +179,10 @@ class MySQLCursor(MySQLCursorAbstract):
         res: Dict[bytes, Any] = {}
         try:
             sql_mode = await self._connection.get_sql_mode()
-            to_mysql = self._connection.converter.to_mysql
-            escape = self._connection.converter.escape
-            quote = self._connection.converter.quote
-            for key, value in params.items():
-                conv = value
-                conv = to_mysql(conv)
-                conv = escape(conv, sql_mode)
-                if not isinstance(value, Decimal):
-                    conv = quote(conv)
-                res[key.encode()] = conv
+            literals = self._connection.converter.to_sql_literals(
+                params.values(), sql_mode
+            )
+            res = {key.encode(): conv for key, conv in zip(params, literals)}
         except Exception as err:
             raise ProgrammingError(
                 f"Failed processing pyformat-parameters; {err}"
@@ -202,15 +196,7 @@ class MySQLCursor(MySQLCursorAbstract):
         result = params[:]
         try:
             sql_mode = await self._connection.get_sql_mode()
-            to_mysql = self._connection.converter.to_mysql
-            escape = self._connection.converter.escape
-            quote = self._connection.converter.quote
-            result = [to_mysql(value) for value in result]
-            result = [escape(value, sql_mode) for value in result]
-            result = [
-                quote(value) if not isinstance(params[i], Decimal) else value
-                for i, value in enumerate(result)
-            ]
+            result = self._connection.converter.to_sql_literals(result, sql_mode)
         except Exception as err:
             raise ProgrammingError(
                 f"Failed processing format-parameters; {err}"
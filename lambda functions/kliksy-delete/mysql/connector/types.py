@@ -121,7 +121,7 @@ HandShakeType = Dict[str, Optional[Union[int, str, bytes]]]
 """Dictionary representing the parsed `handshake response`
 sent at `connection` time by the server."""
 
-OkPacketType = Dict[str, Optional[Union[int, str]]]
+OkPacketType = Dict[str, Optional[Union[int, str, Dict[str, Any]]]]
 """Dictionary representing the parsed `OK response`
 produced by the server to signal successful completion of a command."""
 
@@ -34,6 +34,7 @@ from __future__ import annotations
 
 import functools
 import re
+import time
 
 from abc import ABC, abstractmethod
 from contextlib import nullcontext
@@ -58,8 +59,9 @@ from ..version import VERSION_TEXT
 try:
     # pylint: disable=unused-import
     # try to load otel from the system
-    from opentelemetry import trace  # check api
+    from opentelemetry import metrics, trace  # check api
     from opentelemetry.sdk.trace import TracerProvider  # check sdk
+    from opentelemetry.sdk.trace import sampling
     from opentelemetry.semconv.trace import SpanAttributes  # check semconv
 except ImportError as missing_dependencies_err:
     raise connector.errors.ProgrammingError(
@@ -69,21 +71,38 @@ except ImportError as missing_dependencies_err:
 
 from .constants import (
     CONNECTION_SPAN_NAME,
+    DB_OPERATION_NAME,
+    DB_RESPONSE_STATUS_CODE,
     DB_SYSTEM,
     DEFAULT_THREAD_ID,
     DEFAULT_THREAD_NAME,
+    ERROR_TYPE,
     FIRST_SUPPORTED_VERSION,
+    MAX_METRIC_OPERATIONS,
+    METRIC_CONNECTION_CREATE_TIME,
+    METRIC_CONNECTION_WAIT_TIME,
+    METRIC_ERRORS,
+    METRIC_NETWORK_IO,
+    METRIC_OPERATION_DURATION,
+    METRIC_ROWS_FETCHED,
     NET_SOCK_FAMILY,
     NET_SOCK_HOST_ADDR,
     NET_SOCK_HOST_PORT,
     NET_SOCK_PEER_ADDR,
     NET_SOCK_PEER_PORT,
+    NETWORK_IO_DIRECTION,
     OPTION_CNX_SPAN,
     OPTION_CNX_TRACER,
+    OTHER_OPERATION,
 )
 
 leading_comment_remover: re.Pattern = re.compile(r"^/\*.*?\*/")
 
+# How the query spans of a connection are sampled, see get_sampling_mode()
+SAMPLING_OFF = 0
+SAMPLING_PARENT = 1
+SAMPLING_ON = 2
+
 
 def record_exception_event(span: trace.Span, exc: Optional[Exception]) -> None:
     """Records an exeception event."""
@@ -106,10 +125,66 @@ def get_operation_name(operation: str) -> str:
     """Parse query to extract operation name."""
     if operation and isinstance(operation, str):
         # Strip leading comments so we get the operation name.
-        return leading_comment_remover.sub("", operation).split()[0]
+        words = leading_comment_remover.sub("", operation).split(maxsplit=1)
+        return words[0] if words else ""
     return ""
 
 
+def get_sampling_mode(tracer: Optional[trace.Tracer]) -> int:
+    """Tell how the spans started by a tracer are sampled.
+
+    This is checked once per connection, so that query spans which can't be
+    sampled are not started at all:
+
+    * SAMPLING_OFF: spans are never sampled, the tracer is a no-op one (as
+      are proxy tracers while no tracer provider is set) or its sampler
+      always drops spans.
+    * SAMPLING_PARENT: the sampler is parent based, spans are not sampled when
+      the current span isn't.
+    * SAMPLING_ON: the sampler decides for each span.
+    """
+    if isinstance(tracer, trace.ProxyTracer):
+        # pylint: disable=protected-access
+        tracer = tracer._tracer
+    if tracer is None or isinstance(tracer, trace.NoOpTracer):
+        return SAMPLING_OFF
+    sampler = getattr(tracer, "sampler", None)
+    if sampler is sampling.ALWAYS_OFF:
+        return SAMPLING_OFF
+    if (
+        isinstance(sampler, sampling.ParentBased)
+        and getattr(sampler, "_local_parent_not_sampled", None) is sampling.ALWAYS_OFF
+        and getattr(sampler, "_remote_parent_not_sampled", None)
+        is sampling.ALWAYS_OFF
+    ):
+        return SAMPLING_PARENT
+    return SAMPLING_ON
+
+
+def may_sample(sampling_mode: int) -> bool:
+    """Check whether a span started now may be sampled."""
+    if sampling_mode == SAMPLING_ON:
+        return True
+    if sampling_mode == SAMPLING_OFF:
+        return False
+    ctx = trace.get_current_span().get_span_context()
+    return not ctx.is_valid or ctx.trace_flags.sampled
+
+
+def get_query_span_attrs(user: str, wrapper_type: str, wrapped_class: str) -> Dict:
+    """Returns the attributes shared by the query spans of a connection or cursor.
+
+    These are static, so they are built once and reused for every span.
+    """
+    return {
+        SpanAttributes.DB_SYSTEM: DB_SYSTEM,
+        SpanAttributes.DB_USER: user,
+        SpanAttributes.THREAD_ID: DEFAULT_THREAD_ID,
+        SpanAttributes.THREAD_NAME: DEFAULT_THREAD_NAME,
+        wrapper_type: wrapped_class,
+    }
+
+
 def set_connection_span_attrs(
     cnx: Optional["MySQLConnectionAbstract"],
     cnx_span: trace.Span,
@@ -195,6 +270,139 @@ def set_connection_span_attrs(
     cnx_span.set_attributes(attrs)
 
 
+class ConnectorMetrics:
+    """OpenTelemetry instruments recording the connector metrics.
+
+    Attributes are kept low-cardinality: the database system, the operation
+    name (the leading SQL keyword, or the instrumented connection method) and,
+    for errors, the error class and MySQL error number.
+    """
+
+    def __init__(self, meter_provider: Optional[metrics.MeterProvider] = None):
+        """Constructor."""
+        meter = metrics.get_meter(
+            "MySQL Connector/Python", VERSION_TEXT, meter_provider=meter_provider
+        )
+        self.operation_duration = meter.create_histogram(
+            METRIC_OPERATION_DURATION,
+            unit="s",
+            description="Duration of database client operations.",
+        )
+        self.connection_create_time = meter.create_histogram(
+            METRIC_CONNECTION_CREATE_TIME,
+            unit="s",
+            description="The time it took to create a new connection.",
+        )
+        self.connection_wait_time = meter.create_histogram(
+            METRIC_CONNECTION_WAIT_TIME,
+            unit="s",
+            description="The time it took to obtain a connection from the pool.",
+        )
+        self.rows_fetched = meter.create_counter(
+            METRIC_ROWS_FETCHED,
+            unit="{row}",
+            description="Rows fetched from result sets.",
+        )
+        self.network_io = meter.create_counter(
+            METRIC_NETWORK_IO,
+            unit="By",
+            description="Bytes sent to and received from the server.",
+        )
+        self.errors = meter.create_counter(
+            METRIC_ERRORS,
+            unit="{error}",
+            description="Errors raised by database client operations.",
+        )
+        self.attrs: Dict[str, Any] = {SpanAttributes.DB_SYSTEM: DB_SYSTEM}
+        self._operation_attrs: Dict[str, Dict[str, Any]] = {}
+        self._other_attrs = {**self.attrs, DB_OPERATION_NAME: OTHER_OPERATION}
+        self._transmit_attrs = {**self.attrs, NETWORK_IO_DIRECTION: "transmit"}
+        self._receive_attrs = {**self.attrs, NETWORK_IO_DIRECTION: "receive"}
+
+    def operation_attrs(self, operation: str) -> Dict[str, Any]:
+        """Returns the attributes of an operation, built once per operation.
+
+        Malformed operations, and new ones once MAX_METRIC_OPERATIONS are
+        known, share the attributes of OTHER_OPERATION without being stored.
+        """
+        attrs = self._operation_attrs.get(operation)
+        if attrs is None:
+            name = operation.upper()
+            if (
+                not name.replace("_", "").isalpha()
+                or len(self._operation_attrs) >= MAX_METRIC_OPERATIONS
+            ):
+                return self._other_attrs
+            attrs = self._operation_attrs.setdefault(
+                operation, {**self.attrs, DB_OPERATION_NAME: name}
+            )
+        return attrs
+
+    def measure(
+        self,
+        operation: str,
+        cnx: TracedMySQLConnection,
+        method: Callable,
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        """Call a method, recording its duration, errors and network I/O."""
+        started = time.perf_counter()
+        attrs = self.operation_attrs(operation)
+        try:
+            return method(*args, **kwargs)
+        except connector.errors.Error as err:
+            attrs = {**attrs, ERROR_TYPE: err.__class__.__name__}
+            self.errors.add(
+                1, {**attrs, DB_RESPONSE_STATUS_CODE: str(err.errno or "")}
+            )
+            raise
+        finally:
+            self.operation_duration.record(time.perf_counter() - started, attrs)
+            self.record_network_io(cnx)
+
+    def measure_connect(
+        self, histogram: Any, connect: Callable, /, *args: Any, **kwargs: Any
+    ) -> Any:
+        """Call `connect`, recording its duration in `histogram` and its errors."""
+        started = time.perf_counter()
+        try:
+            return connect(*args, **kwargs)
+        except connector.errors.Error as err:
+            self.errors.add(
+                1,
+                {
+                    **self.operation_attrs("connect"),
+                    ERROR_TYPE: err.__class__.__name__,
+                    DB_RESPONSE_STATUS_CODE: str(err.errno or ""),
+                },
+            )
+            raise
+        finally:
+            histogram.record(time.perf_counter() - started, self.attrs)
+
+    def record_network_io(self, cnx: TracedMySQLConnection) -> None:
+        """Count the bytes sent and received since the last recording.
+
+        Connections without access to their socket (`CMySQLConnection`) are
+        not accounted.
+        """
+        sock = getattr(cnx._wrapped, "_socket", None)
+        if sock is None:
+            return
+        seen_sock, seen_sent, seen_received = cnx._network_io_seen
+        if sock is not seen_sock:
+            # new socket after a reconnection
+            seen_sent = seen_received = 0
+        sent, received = sock.bytes_sent, sock.bytes_received
+        if sent > seen_sent:
+            self.network_io.add(sent - seen_sent, self._transmit_attrs)
+        if received > seen_received:
+            self.network_io.add(received - seen_received, self._receive_attrs)
+        cnx._network_io_seen = (sock, sent, received)
+
+
 def with_cnx_span_attached(method: Callable) -> Callable:
     """Attach the connection span while executing the connection method."""
 
@@ -209,57 +417,74 @@ def with_cnx_span_attached(method: Callable) -> Callable:
 
 
 def with_cnx_query_span(method: Callable) -> Callable:
-    """Create a query span while executing the connection method."""
+    """Create a query span while executing the connection method.
+
+    Nothing is done when the connection span isn't recording, or when the
+    query span can't be sampled.
+    """
+    span_name = method.__name__.upper()
 
     def wrapper(cnx: TracedMySQLConnection, *args: Any, **kwargs: Any) -> Any:
         """Query span creator decorator."""
-        logger.info("Creating query span for connection.%s", method.__name__)
-
-        query_span_attributes: Dict = {
-            SpanAttributes.DB_SYSTEM: DB_SYSTEM,
-            SpanAttributes.DB_USER: cnx._user,
-            SpanAttributes.THREAD_ID: DEFAULT_THREAD_ID,
-            SpanAttributes.THREAD_NAME: DEFAULT_THREAD_NAME,
-            "connection_type": cnx.get_wrapped_class(),
-        }
+        if cnx._metrics is not None:
+            return cnx._metrics.measure(span_name, cnx, traced, cnx, *args, **kwargs)
+        return traced(cnx, *args, **kwargs)
+
+    def traced(cnx: TracedMySQLConnection, *args: Any, **kwargs: Any) -> Any:
+        """Start the query span if it may be sampled."""
+        cnx_span = cnx._span
+        if (
+            not cnx_span
+            or not cnx_span.is_recording()
+            or not may_sample(cnx._sampling_mode)
+        ):
+            return method(cnx, *args, **kwargs)
 
+        logger.info("Creating query span for connection.%s", method.__name__)
         with cnx._tracer.start_as_current_span(
-            name=method.__name__.upper(),
+            name=span_name,
             kind=trace.SpanKind.CLIENT,
-            links=[trace.Link(cnx._span.get_span_context())],
-            attributes=query_span_attributes,
-        ) if cnx._span and cnx._span.is_recording() else nullcontext():
+            links=[trace.Link(cnx_span.get_span_context())],
+            attributes=cnx._query_span_attrs,
+        ):
             return method(cnx, *args, **kwargs)
 
     return wrapper
 
 
 def with_cursor_query_span(method: Callable) -> Callable:
-    """Create a query span while executing the cursor method."""
+    """Create a query span while executing the cursor method.
+
+    Nothing is done when the query span can't be sampled.
+    """
 
     def wrapper(cur: TracedMySQLCursor, *args: Any, **kwargs: Any) -> Any:
         """Query span creator decorator."""
-        logger.info("Creating query span for cursor.%s", method.__name__)
-
-        connection: "MySQLConnectionAbstract" = (
-            getattr(cur._wrapped, "_connection")
-            if hasattr(cur._wrapped, "_connection")
-            else getattr(cur._wrapped, "_cnx")
-        )
+        if cur._metrics is not None:
+            operation = get_operation_name(
+                args[0] if args else kwargs.get("operation", "")
+            )
+            return cur._metrics.measure(
+                operation or OTHER_OPERATION,
+                cur._traced_connection,
+                traced,
+                cur,
+                *args,
+                **kwargs,
+            )
+        return traced(cur, *args, **kwargs)
 
-        query_span_attributes: Dict = {
-            SpanAttributes.DB_SYSTEM: DB_SYSTEM,
-            SpanAttributes.DB_USER: connection._user,
-            SpanAttributes.THREAD_ID: DEFAULT_THREAD_ID,
-            SpanAttributes.THREAD_NAME: DEFAULT_THREAD_NAME,
-            "cursor_type": cur.get_wrapped_class(),
-        }
+    def traced(cur: TracedMySQLCursor, *args: Any, **kwargs: Any) -> Any:
+        """Start the query span if it may be sampled."""
+        if not may_sample(cur._sampling_mode):
+            return method(cur, *args, **kwargs)
 
+        logger.info("Creating query span for cursor.%s", method.__name__)
         with cur._tracer.start_as_current_span(
             name=get_operation_name(args[0]) or "SQL statement",
             kind=trace.SpanKind.CLIENT,
             links=[cur._connection_span_link],
-            attributes=query_span_attributes,
+            attributes=cur._query_span_attrs,
         ):
             return method(cur, *args, **kwargs)
 
@@ -320,12 +545,27 @@ class TracedMySQLCursor(BaseMySQLTracer):
         wrapped: "MySQLCursorAbstract",
         tracer: trace.Tracer,
         connection_span: trace.Span,
+        sampling_mode: int = SAMPLING_ON,
+        traced_connection: Optional[TracedMySQLConnection] = None,
     ):
         """Constructor."""
         self._wrapped: "MySQLCursorAbstract" = wrapped
-        self._tracer: trace.Tracer = tracer
-        self._connection_span_link: trace.Link = trace.Link(
-            connection_span.get_span_context()
+
+        connection: "MySQLConnectionAbstract" = (
+            getattr(wrapped, "_connection")
+            if hasattr(wrapped, "_connection")
+            else getattr(wrapped, "_cnx")
+        )
+        # kept in the wrapper, they are read for every query
+        self.__dict__.update(
+            _tracer=tracer,
+            _sampling_mode=sampling_mode,
+            _connection_span_link=trace.Link(connection_span.get_span_context()),
+            _query_span_attrs=get_query_span_attrs(
+                connection._user, "cursor_type", self.get_wrapped_class()
+            ),
+            _traced_connection=traced_connection,
+            _metrics=traced_connection._metrics if traced_connection else None,
         )
 
     @with_cursor_query_span
@@ -343,13 +583,48 @@ class TracedMySQLCursor(BaseMySQLTracer):
         """Instrument method."""
         return self._wrapped.callproc(*args, **kwargs)
 
+    def fetchone(self) -> Any:
+        """Instrument method."""
+        row = self._wrapped.fetchone()
+        if row is not None and self._metrics is not None:
+            self._metrics.rows_fetched.add(1, self._metrics.attrs)
+        return row
+
+    def fetchmany(self, *args: Any, **kwargs: Any) -> Any:
+        """Instrument method."""
+        rows = self._wrapped.fetchmany(*args, **kwargs)
+        if self._metrics is not None:
+            self._metrics.rows_fetched.add(len(rows), self._metrics.attrs)
+            self._metrics.record_network_io(self._traced_connection)
+        return rows
+
+    def fetchall(self) -> Any:
+        """Instrument method."""
+        rows = self._wrapped.fetchall()
+        if self._metrics is not None:
+            self._metrics.rows_fetched.add(len(rows), self._metrics.attrs)
+            self._metrics.record_network_io(self._traced_connection)
+        return rows
+
 
 class TracedMySQLConnection(BaseMySQLTracer):
     """Wrapper class for a `MySQLConnection` or `CMySQLConnection` object."""
 
-    def __init__(self, wrapped: "MySQLConnectionAbstract") -> None:
+    def __init__(
+        self,
+        wrapped: "MySQLConnectionAbstract",
+        metrics: Optional[ConnectorMetrics] = None,
+    ) -> None:
         """Constructor."""
         self._wrapped: "MySQLConnectionAbstract" = wrapped
+        self.__dict__.update(
+            _metrics=metrics,
+            _network_io_seen=(None, 0, 0),
+            _sampling_mode=get_sampling_mode(wrapped._tracer),
+            _query_span_attrs=get_query_span_attrs(
+                wrapped._user, "connection_type", self.get_wrapped_class()
+            ),
+        )
 
         # call `sql_mode` so its value is cached internally and querying it does not
         # interfere when recording query span events later.
@@ -361,12 +636,18 @@ class TracedMySQLConnection(BaseMySQLTracer):
             wrapped=self._wrapped.cursor(*args, **kwargs),
             tracer=self._tracer,
             connection_span=self._span,
+            sampling_mode=self._sampling_mode,
+            traced_connection=self,
         )
 
     @with_cnx_query_span
     def cmd_change_user(self, *args: Any, **kwargs: Any) -> Any:
         """Instrument method."""
-        return self._wrapped.cmd_change_user(*args, **kwargs)
+        result = self._wrapped.cmd_change_user(*args, **kwargs)
+        self._query_span_attrs = get_query_span_attrs(
+            self._wrapped._user, "connection_type", self.get_wrapped_class()
+        )
+        return result
 
     @with_cnx_query_span
     def commit(self, *args: Any, **kwargs: Any) -> Any:
@@ -517,6 +798,7 @@ class TracedMySQLConnection(BaseMySQLTracer):
 def _instrument_connect(
     connect: Callable[..., Union["MySQLConnectionAbstract", "PooledMySQLConnection"]],
     tracer_provider: Optional[trace.TracerProvider] = None,
+    metrics: Optional[ConnectorMetrics] = None,
 ) -> Callable[..., Union["MySQLConnectionAbstract", "PooledMySQLConnection"]]:
     """Retrurn the instrumented version of `connect`."""
 
@@ -527,11 +809,16 @@ def _instrument_connect(
     ) -> Union["MySQLConnectionAbstract", "PooledMySQLConnection"]:
         """Wraps the connection object returned by the method `connect`.
 
-        Instrumentation for PooledConnections is not supported.
+        Instrumentation for PooledConnections is not supported, only the time
+        spent getting them from the pool is recorded in metrics.
         """
         if any(key in kwargs for key in CNX_POOL_ARGS):
             logger.warning("Instrumentation for pooled connections not supported")
-            return connect(*args, **kwargs)
+            if metrics is None:
+                return connect(*args, **kwargs)
+            return metrics.measure_connect(
+                metrics.connection_wait_time, connect, *args, **kwargs
+            )
 
         tracer = trace.get_tracer(
             instrumenting_module_name="MySQL Connector/Python",
@@ -554,13 +841,19 @@ def _instrument_connect(
 
             # Connection may fail at this point, in case it does, basic net info is already
             # included so the user can check the net configuration she/he provided.
-            cnx = connect(*args, **kwargs)
+            if metrics is None:
+                cnx = connect(*args, **kwargs)
+            else:
+                cnx = metrics.measure_connect(
+                    metrics.connection_create_time, connect, *args, **kwargs
+                )
 
             # connection went ok, let's refine the net information.
             set_connection_span_attrs(cnx, cnx_span, kwargs)  # type: ignore[arg-type]
 
             return TracedMySQLConnection(
                 wrapped=cnx,  # type: ignore[return-value, arg-type]
+                metrics=metrics,
             )
 
     return wrapper
@@ -588,14 +881,34 @@ class MySQLInstrumentor:
         that the will be instrumented (e.g., versions >= 8.1.0)."""
         return [f"mysql-connector-python >= {FIRST_SUPPORTED_VERSION}"]
 
+    def _get_metrics(
+        self,
+        meter_provider: Optional[metrics.MeterProvider] = None,
+        enable_metrics: bool = False,
+    ) -> Optional[ConnectorMetrics]:
+        """Returns the metrics recorder for a meter provider.
+
+        Returns None when metrics are not enabled.
+        """
+        if meter_provider is None and not enable_metrics:
+            return None
+        recorders = self.__dict__.setdefault("_metrics", {})
+        if meter_provider not in recorders:
+            recorders[meter_provider] = ConnectorMetrics(meter_provider)
+        return recorders[meter_provider]
+
     def instrument(self, **kwargs: Any) -> None:
         """Instrument the library.
 
         Args:
             trace_module: reference to the 'trace' module from opentelemetry.
             tracer_provider (optional): TracerProvider instance.
+            meter_provider (optional): MeterProvider instance, enables metrics.
+            enable_metrics (optional): Record metrics with the global
+                                       MeterProvider.
 
-        NOTE: Instrumentation for pooled connections not supported.
+        NOTE: Instrumentation for pooled connections not supported, only the
+        time spent getting them from the pool is recorded in metrics.
         """
         if connector.connect != getattr(self, "_original_connect"):
             logger.warning("MySQL Connector/Python module already instrumented.")
@@ -603,12 +916,17 @@ class MySQLInstrumentor:
         connector.connect = _instrument_connect(
             connect=getattr(self, "_original_connect"),
             tracer_provider=kwargs.get("tracer_provider"),
+            metrics=self._get_metrics(
+                kwargs.get("meter_provider"), kwargs.get("enable_metrics", False)
+            ),
         )
 
     def instrument_connection(
         self,
         connection: "MySQLConnectionAbstract",
         tracer_provider: Optional[trace.TracerProvider] = None,
+        meter_provider: Optional[metrics.MeterProvider] = None,
+        enable_metrics: bool = False,
     ) -> "MySQLConnectionAbstract":
         """Enable instrumentation in a MySQL connection.
 
@@ -616,6 +934,9 @@ class MySQLInstrumentor:
             connection: uninstrumented connection instance.
             trace_module: reference to the 'trace' module from opentelemetry.
             tracer_provider (optional): TracerProvider instance.
+            meter_provider (optional): MeterProvider instance, enables metrics.
+            enable_metrics (optional): Record metrics with the global
+                                       MeterProvider.
 
         Returns:
             connection: instrumented connection instace.
@@ -645,7 +966,10 @@ class MySQLInstrumentor:
 
         set_connection_span_attrs(connection, connection._span)
 
-        return TracedMySQLConnection(wrapped=connection)  # type: ignore[return-value]
+        return TracedMySQLConnection(  # type: ignore[return-value]
+            wrapped=connection,
+            metrics=self._get_metrics(meter_provider, enable_metrics),
+        )
 
     def uninstrument(self, **kwargs: Any) -> None:
         """Uninstrument the library."""
@@ -37,7 +37,6 @@ import contextlib
 import datetime
 import getpass
 import os
-import socket
 import struct
 import warnings
 
@@ -93,6 +92,7 @@ from ..types import (
 )
 from ..utils import (
     get_platform,
+    get_source_host,
     int1store,
     int4store,
     lc_int,
@@ -139,6 +139,7 @@ class MySQLConnection(MySQLConnectionAbstract):
             )
             await self._do_handshake()
             await self._do_auth()
+            self._protocol.forget_stmt_execute_plan()
         except Exception as err:
             await self._socket.close_connection()
             if isinstance(err, (asyncio.CancelledError, asyncio.TimeoutError)):
@@ -191,7 +192,7 @@ class MySQLConnection(MySQLConnectionAbstract):
         default_conn_attrs = {
             "_pid": str(os.getpid()),
             "_platform": platform["arch"],
-            "_source_host": socket.gethostname(),
+            "_source_host": get_source_host(),
             "_client_name": "mysql-connector-python",
             "_client_license": client_license,
             "_client_version": ".".join([str(x) for x in version.VERSION[0:3]]),
@@ -1003,6 +1004,7 @@ class MySQLConnection(MySQLConnectionAbstract):
         """
         try:
             self._handle_ok(await self._send_cmd(ServerCmd.RESET_CONNECTION))
+            self._protocol.forget_stmt_execute_plan()
             await self._post_connection()
             return True
         except (NotSupportedError, OperationalError):
@@ -1352,6 +1354,7 @@ class MySQLConnection(MySQLConnectionAbstract):
         This method deallocates the prepared statement using the statement_id.
         Note that the MySQL server does not return anything.
         """
+        self._protocol.forget_stmt_execute_plan(statement_id)
         await self._send_cmd(
             ServerCmd.STMT_CLOSE,
             int4store(statement_id),
@@ -1572,6 +1575,7 @@ class MySQLConnection(MySQLConnectionAbstract):
             read_timeout=self._read_timeout,
             write_timeout=self._write_timeout,
         )
+        self._protocol.forget_stmt_execute_plan()
 
         if not (self._client_flags & ClientFlag.CONNECT_WITH_DB) and database:
             await self.cmd_init_db(database)
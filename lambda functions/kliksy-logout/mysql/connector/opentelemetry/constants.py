@@ -75,3 +75,24 @@ NET_SOCK_PEER_ADDR = "net.sock.peer.addr"
 NET_SOCK_PEER_PORT = "net.sock.peer.port"
 NET_SOCK_HOST_ADDR = "net.sock.host.addr"
 NET_SOCK_HOST_PORT = "net.sock.host.port"
+
+# Reference: https://github.com/open-telemetry/semantic-conventions/blob/main/
+# docs/database/database-metrics.md
+METRIC_OPERATION_DURATION = "db.client.operation.duration"
+METRIC_CONNECTION_CREATE_TIME = "db.client.connection.create_time"
+METRIC_CONNECTION_WAIT_TIME = "db.client.connection.wait_time"
+METRIC_ROWS_FETCHED = "mysql.client.rows.fetched"
+METRIC_NETWORK_IO = "mysql.client.network.io"
+METRIC_ERRORS = "mysql.client.errors"
+
+DB_OPERATION_NAME = "db.operation.name"
+DB_RESPONSE_STATUS_CODE = "db.response.status_code"
+ERROR_TYPE = "error.type"
+NETWORK_IO_DIRECTION = "network.io.direction"
+
+MAX_METRIC_OPERATIONS = 64
+"""
+Number of distinct operation names recorded in metrics, the next ones being
+recorded as `OTHER_OPERATION`.
+"""
+OTHER_OPERATION = "OTHER"
@@ -29,13 +29,27 @@
 """Implementing pooling of connections to MySQL servers."""
 from __future__ import annotations
 
-import queue
 import random
 import re
 import threading
+import time
+import weakref
 
+from collections import deque
 from types import TracebackType
-from typing import TYPE_CHECKING, Any, Dict, NoReturn, Optional, Tuple, Type, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    NoReturn,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
 from uuid import uuid4
 
 try:
@@ -60,6 +74,7 @@ from .errors import (
     PoolError,
     ProgrammingError,
 )
+from .logger import logger
 from .optionfiles import read_option_files
 
 if TYPE_CHECKING:
@@ -69,6 +84,24 @@ CONNECTION_POOL_LOCK = threading.RLock()
 CNX_POOL_MAXSIZE = 32
 CNX_POOL_MAXNAMESIZE = 64
 CNX_POOL_NAMEREGEX = re.compile(r"[^a-zA-Z0-9._:\-*$#]")
+# Upper bounds, in seconds, of the checkout wait time histogram buckets
+CNX_POOL_WAIT_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    float("inf"),
+)
+# Largest part of pool_max_lifetime randomly cut off each connection lifetime
+CNX_POOL_LIFETIME_JITTER = 0.1
+# Number of most recent checkout wait times used for the stats() percentiles
+CNX_POOL_STATS_SAMPLES = 1024
+# Events for which listeners can be registered with add_event_listener()
+CNX_POOL_EVENTS: Tuple[str, ...] = ("create", "checkout", "checkin", "close")
 ERROR_NO_CEXT = "MySQL Connector/Python C Extension not available"
 MYSQL_CNX_CLASS: Union[type, Tuple[type, ...]] = (
     MySQLConnection if CMySQLConnection is None else (MySQLConnection, CMySQLConnection)
@@ -77,6 +110,13 @@ MYSQL_CNX_CLASS: Union[type, Tuple[type, ...]] = (
 _CONNECTION_POOLS: Dict[str, MySQLConnectionPool] = {}
 
 
+def _percentile(samples: List[float], fraction: float) -> Optional[float]:
+    """Returns the nearest-rank percentile of sorted samples, None if empty"""
+    if not samples:
+        return None
+    return samples[max(0, int(round(fraction * len(samples))) - 1)]
+
+
 def _get_pooled_connection(**kwargs: Any) -> PooledMySQLConnection:
     """Return a pooled MySQL connection."""
     # If no pool name specified, generate one
@@ -94,7 +134,8 @@ def _get_pooled_connection(**kwargs: Any) -> PooledMySQLConnection:
         elif isinstance(_CONNECTION_POOLS[pool_name], MySQLConnectionPool):
             # pool_size must be the same
             check_size = _CONNECTION_POOLS[pool_name].pool_size
-            if "pool_size" in kwargs and kwargs["pool_size"] != check_size:
+            size = kwargs.get("pool_max_size", kwargs.get("pool_size"))
+            if size is not None and size != check_size:
                 raise PoolError("Size can not be changed for active pools.")
 
     # Return pooled connection
@@ -407,9 +448,12 @@ class PooledMySQLConnection:
         try:
             cnx = self._cnx
             if self._cnx_pool.reset_session:
+                started = time.monotonic()
                 cnx.reset_session()
+                # pylint: disable=protected-access
+                self._cnx_pool._record_reset_time(time.monotonic() - started)
         finally:
-            self._cnx_pool.add_connection(cnx)
+            self._cnx_pool._release_connection(cnx)  # pylint: disable=protected-access
             self._cnx = None
 
     @staticmethod
@@ -431,6 +475,16 @@ class PooledMySQLConnection:
         return self._cnx_pool.pool_name
 
 
+class _PoolWaiter:
+    """A thread waiting for a connection to be handed over by the pool"""
+
+    __slots__ = ("event", "cnx")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.cnx: Optional[MySQLConnectionAbstract] = None
+
+
 class MySQLConnectionPool:
     """Class defining a pool of MySQL connections"""
 
@@ -439,6 +493,12 @@ class MySQLConnectionPool:
         pool_size: int = 5,
         pool_name: Optional[str] = None,
         pool_reset_session: bool = True,
+        pool_ping_threshold: float = 0,
+        pool_timeout: Optional[float] = None,
+        pool_min_size: Optional[int] = None,
+        pool_max_size: Optional[int] = None,
+        pool_max_idle: Optional[float] = None,
+        pool_max_lifetime: Optional[float] = None,
         **kwargs: Any,
     ) -> None:
         """Constructor.
@@ -456,6 +516,25 @@ class MySQLConnectionPool:
             pool_size:  The pool size. If this argument is not given, the default is 5.
             pool_reset_session: Whether to reset session variables when the connection
                                 is returned to the pool.
+            pool_ping_threshold: Idle time, in seconds, after which a connection is
+                                 checked with a ping on checkout. Connections used
+                                 more recently are only checked locally, without a
+                                 round trip. The default, 0, always pings.
+            pool_timeout: Seconds to wait for a connection to be returned when the
+                          pool is exhausted. Waiting threads are served in arrival
+                          order. If this argument is not given, the default is to
+                          raise `PoolError` without waiting.
+            pool_min_size: Number of connections opened up front and kept open
+                           while idle. More connections are opened on demand, up to
+                           the maximum size. Defaults to the maximum size.
+            pool_max_size: Maximum number of connections, takes precedence over
+                           `pool_size`.
+            pool_max_idle: Seconds after which idle connections above the minimum
+                           size are closed. Not set by default.
+            pool_max_lifetime: Seconds after which connections are closed and
+                               replaced. Each connection gets up to 10% less, so
+                               that connections opened together aren't replaced
+                               at once. Not set by default.
             **kwargs: Optional additional connection arguments, as described in [1].
 
         Examples:
@@ -473,23 +552,59 @@ class MySQLConnectionPool:
             [1]: https://dev.mysql.com/doc/connector-python/en/connector-python-connectargs.html
         """
         self._pool_size: Optional[int] = None
+        self._min_size: int = 0
         self._pool_name: Optional[str] = None
         self._reset_session = pool_reset_session
-        self._set_pool_size(pool_size)
+        self._ping_threshold: float = 0
+        self._timeout: Optional[float] = None
+        self._max_idle: Optional[float] = None
+        self._max_lifetime: Optional[float] = None
+        self._set_pool_size(pool_max_size if pool_max_size is not None else pool_size)
+        self._set_min_size(pool_min_size)
+        self._set_ping_threshold(pool_ping_threshold)
+        self._set_timeout(pool_timeout)
+        self._max_idle = self._check_seconds("pool_max_idle", pool_max_idle)
+        self._max_lifetime = self._check_seconds("pool_max_lifetime", pool_max_lifetime)
+        self._lock = threading.RLock()
+        self._waiters: Deque[_PoolWaiter] = deque()
+        self._wait_counts: List[int] = [0] * len(CNX_POOL_WAIT_BUCKETS)
         self._set_pool_name(pool_name or generate_pool_name(**kwargs))
         self._cnx_config: Dict[str, Any] = {}
-        self._cnx_queue: queue.Queue[MySQLConnectionAbstract] = queue.Queue(
-            self._pool_size
-        )
+        # idle connections with the time they were queued, most recent last
+        self._idle: Deque[Tuple[MySQLConnectionAbstract, float]] = deque()
+        # connections open, whether idle, in use or being opened
+        self._cnx_count: int = 0
+        self._expires_at: Dict[int, float] = {}
         self._config_version = uuid4()
+        self._listeners: Dict[str, List[Callable[..., Any]]] = {
+            event: [] for event in CNX_POOL_EVENTS
+        }
+        self._wait_samples: Deque[float] = deque(maxlen=CNX_POOL_STATS_SAMPLES)
+        self._counters: Dict[str, Union[int, float]] = {
+            "created": 0,
+            "closed": 0,
+            "checkouts": 0,
+            "reconnects": 0,
+            "reset_session": 0,
+            "reset_session_time": 0.0,
+        }
 
         if kwargs:
             self.set_config(**kwargs)
             cnt = 0
-            while cnt < self._pool_size:
+            while cnt < self._min_size:
                 self.add_connection()
                 cnt += 1
 
+        if self._max_idle or self._max_lifetime:
+            interval = min(filter(None, (self._max_idle, self._max_lifetime))) / 2
+            threading.Thread(
+                target=_reap_pool,
+                args=(weakref.ref(self), interval),
+                name=f"{self._pool_name}-reaper",
+                daemon=True,
+            ).start()
+
     @property
     def pool_name(self) -> str:
         """Returns the name of the connection pool."""
@@ -500,11 +615,121 @@ class MySQLConnectionPool:
         """Returns number of connections managed by the pool."""
         return self._pool_size
 
+    @property
+    def pool_min_size(self) -> int:
+        """Returns the number of connections kept open while idle."""
+        return self._min_size
+
     @property
     def reset_session(self) -> bool:
         """Returns whether to reset session."""
         return self._reset_session
 
+    @property
+    def pool_timeout(self) -> Optional[float]:
+        """Returns the seconds to wait for a connection when exhausted."""
+        return self._timeout
+
+    def wait_time_histogram(self) -> Dict[float, int]:
+        """Returns the number of checkouts per wait time bucket.
+
+        Keys are the upper bounds, in seconds, of the buckets defined in
+        `CNX_POOL_WAIT_BUCKETS`. Checkouts served without waiting fall in
+        the first bucket.
+        """
+        with self._lock:
+            return dict(zip(CNX_POOL_WAIT_BUCKETS, self._wait_counts))
+
+    def _record_wait_time(self, wait_time: float) -> None:
+        """Count a checkout in the wait time histogram and stats"""
+        with self._lock:
+            self._counters["checkouts"] += 1
+            self._wait_samples.append(wait_time)
+            for index, bound in enumerate(CNX_POOL_WAIT_BUCKETS):
+                if wait_time <= bound:
+                    self._wait_counts[index] += 1
+                    return
+
+    def _record_reset_time(self, reset_time: float) -> None:
+        """Count a session reset done when a connection is returned"""
+        with self._lock:
+            self._counters["reset_session"] += 1
+            self._counters["reset_session_time"] += reset_time
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns a snapshot of the pool usage.
+
+        The snapshot holds the current number of connections `in_use` and
+        `idle`, and of threads `waiting` for one; the totals of connections
+        `created` and `closed`, of `checkouts`, `reconnects` and
+        `reset_session` calls, with the seconds spent in the latter as
+        `reset_session_time`; and the median and 99th percentile checkout
+        wait times, `wait_p50` and `wait_p99`, in seconds, over the last
+        `CNX_POOL_STATS_SAMPLES` checkouts.
+
+        Returns a dict().
+        """
+        with self._lock:
+            stats: Dict[str, Any] = {
+                "pool_name": self._pool_name,
+                "pool_size": self._pool_size,
+                "pool_min_size": self._min_size,
+                "in_use": self._cnx_count - len(self._idle),
+                "idle": len(self._idle),
+                "waiting": len(self._waiters),
+            }
+            stats.update(self._counters)
+            samples = sorted(self._wait_samples)
+        stats["wait_p50"] = _percentile(samples, 0.5)
+        stats["wait_p99"] = _percentile(samples, 0.99)
+        return stats
+
+    def add_event_listener(self, event: str, listener: Callable[..., Any]) -> None:
+        """Register a callable to be notified of pool events.
+
+        The listener is called with the pool and the connection as arguments,
+        from the thread triggering the event, without holding the pool lock.
+        Errors raised by listeners are logged and ignored.
+
+        Args:
+            event: One of `CNX_POOL_EVENTS`: "create" when the pool opens a
+                   connection, "checkout" when it is handed out, "checkin"
+                   when it is returned and "close" when the pool closes it.
+            listener: The callable to register.
+
+        Raises:
+            ProgrammingError: When the event is not known.
+        """
+        if event not in CNX_POOL_EVENTS:
+            raise ProgrammingError(f"Unknown pool event '{event}'")
+        with self._lock:
+            self._listeners[event].append(listener)
+
+    def remove_event_listener(self, event: str, listener: Callable[..., Any]) -> None:
+        """Unregister a callable registered with add_event_listener().
+
+        Raises:
+            ProgrammingError: When the event is not known.
+        """
+        if event not in CNX_POOL_EVENTS:
+            raise ProgrammingError(f"Unknown pool event '{event}'")
+        with self._lock:
+            if listener in self._listeners[event]:
+                self._listeners[event].remove(listener)
+
+    def _notify(self, event: str, cnx: MySQLConnectionAbstract) -> None:
+        """Call the listeners registered for an event"""
+        for listener in tuple(self._listeners[event]):
+            try:
+                listener(self, cnx)
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                logger.warning(
+                    "Pool '%s' %s event listener failed: %s",
+                    self._pool_name,
+                    event,
+                    err,
+                )
+
     def set_config(self, **kwargs: Any) -> None:
         """Set the connection configuration for `MySQLConnectionAbstract` subclass instances.
 
@@ -526,7 +751,7 @@ class MySQLConnectionPool:
         if not kwargs:
             return
 
-        with CONNECTION_POOL_LOCK:
+        with self._lock:
             try:
                 test_cnx = connect()
                 test_cnx.config(**kwargs)
@@ -550,6 +775,72 @@ class MySQLConnectionPool:
             )
         self._pool_size = pool_size
 
+    def _set_min_size(self, min_size: Optional[int]) -> None:
+        """Set the number of connections kept open while idle
+
+        Raises an AttributeError when min_size is negative or higher than
+        the pool size.
+        """
+        if min_size is None:
+            min_size = self._pool_size
+        if min_size < 0 or min_size > self._pool_size:
+            raise AttributeError(
+                "Pool minimum size should be positive and lower or equal to "
+                f"the pool size ({self._pool_size})"
+            )
+        self._min_size = min_size
+
+    @staticmethod
+    def _check_seconds(option: str, value: Optional[float]) -> Optional[float]:
+        """Check a duration option, which is either None or a positive number
+
+        Raises an AttributeError when the value is not valid.
+        """
+        if value is not None and (
+            isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0
+        ):
+            raise AttributeError(f"Option {option} should be a positive number")
+        return value
+
+    def _set_timeout(self, timeout: Optional[float]) -> None:
+        """Set the seconds to wait for a connection when the pool is exhausted
+
+        Raises an AttributeError when timeout is neither None nor a
+        non-negative number.
+        """
+        if timeout is not None and (
+            isinstance(timeout, bool)
+            or not isinstance(timeout, (int, float))
+            or timeout < 0
+        ):
+            raise AttributeError("Pool timeout should be a non-negative number")
+        self._timeout = timeout
+
+    def _set_ping_threshold(self, ping_threshold: float) -> None:
+        """Set the idle time after which checkouts ping the server
+
+        Raises an AttributeError when ping_threshold is not a non-negative
+        number.
+        """
+        if (
+            isinstance(ping_threshold, bool)
+            or not isinstance(ping_threshold, (int, float))
+            or ping_threshold < 0
+        ):
+            raise AttributeError("Pool ping threshold should be a non-negative number")
+        self._ping_threshold = ping_threshold
+
+    def _is_usable(self, cnx: MySQLConnectionAbstract) -> bool:
+        """Check whether a connection taken from the queue can be handed out
+
+        Connections idle for less than the ping threshold are checked locally,
+        others are pinged.
+        """
+        idle_time = cnx.idle_time
+        if idle_time is not None and idle_time < self._ping_threshold:
+            return cnx.is_alive()
+        return cnx.is_connected()
+
     def _set_pool_name(self, pool_name: str) -> None:
         r"""Set the name of the pool.
 
@@ -564,12 +855,71 @@ class MySQLConnectionPool:
             raise AttributeError(f"Pool name '{pool_name}' is too long")
         self._pool_name = pool_name
 
+    def _track_connection(self, cnx: MySQLConnectionAbstract) -> None:
+        """Start the lifetime of a newly opened connection
+
+        The lifetime is shortened by a random part of up to
+        CNX_POOL_LIFETIME_JITTER. The lock must be held.
+        """
+        if self._max_lifetime:
+            jitter = 1 - random.uniform(0, CNX_POOL_LIFETIME_JITTER)
+            self._expires_at[id(cnx)] = (
+                time.monotonic() + self._max_lifetime * jitter
+            )
+
+    def _untrack_connection(self, cnx: MySQLConnectionAbstract) -> None:
+        """Forget a connection leaving the pool. The lock must be held."""
+        self._expires_at.pop(id(cnx), None)
+        self._cnx_count -= 1
+
+    def _is_expired(self, cnx: MySQLConnectionAbstract, now: float) -> bool:
+        """Check whether a connection outlived pool_max_lifetime"""
+        return now >= self._expires_at.get(id(cnx), float("inf"))
+
+    def _close_connections(self, cnxs: List[MySQLConnectionAbstract]) -> None:
+        """Close connections removed from the pool"""
+        for cnx in cnxs:
+            try:
+                cnx.disconnect()
+            except Error:
+                # Any error when closing means connection is closed
+                pass
+            with self._lock:
+                self._counters["closed"] += 1
+            self._notify("close", cnx)
+
+    def _new_connection(
+        self, cnx_config: Dict[str, Any], config_version: Any
+    ) -> MySQLConnectionAbstract:
+        """Open a connection for the pool, without holding the lock"""
+        cnx = connect(**cnx_config)  # type: ignore[assignment]
+        try:
+            if (
+                self._reset_session
+                and cnx_config["compress"]
+                and cnx.server_version < (5, 7, 3)
+            ):
+                raise NotSupportedError(
+                    "Pool reset session is not supported with "
+                    "compression for MySQL server version 5.7.2 "
+                    "or earlier"
+                )
+        except KeyError:
+            pass
+
+        cnx.pool_config_version = config_version
+        with self._lock:
+            self._counters["created"] += 1
+        self._notify("create", cnx)
+        return cnx
+
     def _queue_connection(self, cnx: MySQLConnectionAbstract) -> None:
         """Put connection back in the queue
 
-        This method is putting a connection back in the queue. It will not
-        acquire a lock as the methods using _queue_connection() will have it
-        set.
+        This method is putting a connection back in the queue. When threads
+        are waiting for a connection, it is handed over to the one waiting
+        the longest instead. It will not acquire a lock as the methods using
+        _queue_connection() will have it set.
 
         Raises `PoolError` on errors.
         """
@@ -578,10 +928,15 @@ class MySQLConnectionPool:
                 "Connection instance not subclass of MySQLConnectionAbstract"
             )
 
-        try:
-            self._cnx_queue.put(cnx, block=False)
-        except queue.Full as err:
-            raise PoolError("Failed adding connection; queue is full") from err
+        if self._waiters:
+            waiter = self._waiters.popleft()
+            waiter.cnx = cnx
+            waiter.event.set()
+            return
+
+        if len(self._idle) >= self._pool_size:
+            raise PoolError("Failed adding connection; queue is full")
+        self._idle.append((cnx, time.monotonic()))
 
     def add_connection(self, cnx: Optional[MySQLConnectionAbstract] = None) -> None:
         """Adds a connection to the pool.
@@ -602,38 +957,101 @@ class MySQLConnectionPool:
                        connection can be added (maximum reached) or when the connection
                        can not be instantiated.
         """
-        with CONNECTION_POOL_LOCK:
+        with self._lock:
             if not self._cnx_config:
                 raise PoolError("Connection configuration not available")
 
-            if self._cnx_queue.full():
+            if self._cnx_count >= self._pool_size:
                 raise PoolError("Failed adding connection; queue is full")
 
-            if not cnx:
-                cnx = connect(**self._cnx_config)  # type: ignore[assignment]
-                try:
-                    if (
-                        self._reset_session
-                        and self._cnx_config["compress"]
-                        and cnx.server_version < (5, 7, 3)
-                    ):
-                        raise NotSupportedError(
-                            "Pool reset session is not supported with "
-                            "compression for MySQL server version 5.7.2 "
-                            "or earlier"
-                        )
-                except KeyError:
-                    pass
-
-                cnx.pool_config_version = self._config_version
-            else:
-                if not isinstance(cnx, MYSQL_CNX_CLASS):
-                    raise PoolError(
-                        "Connection instance not subclass of MySQLConnectionAbstract"
-                    )
+            # reserve the slot while connecting without holding the lock
+            self._cnx_count += 1
+            cnx_config = self._cnx_config
+            config_version = self._config_version
 
+        try:
+            if not cnx:
+                cnx = self._new_connection(cnx_config, config_version)
+            elif not isinstance(cnx, MYSQL_CNX_CLASS):
+                raise PoolError(
+                    "Connection instance not subclass of MySQLConnectionAbstract"
+                )
+        except BaseException:
+            with self._lock:
+                self._cnx_count -= 1
+            raise
+
+        with self._lock:
+            self._track_connection(cnx)
             self._queue_connection(cnx)
 
+    def _release_connection(self, cnx: MySQLConnectionAbstract) -> None:
+        """Give back a connection handed out by get_connection()
+
+        Connections which outlived pool_max_lifetime are closed instead, and
+        replaced if needed.
+        """
+        self._notify("checkin", cnx)
+        with self._lock:
+            if not self._is_expired(cnx, time.monotonic()):
+                self._queue_connection(cnx)
+                return
+            self._untrack_connection(cnx)
+        self._close_connections([cnx])
+        self._replenish()
+
+    def _replenish(self) -> None:
+        """Open connections for waiting threads and up to the minimum size
+
+        Errors are not raised, the connections are opened again on demand.
+        """
+        while True:
+            with self._lock:
+                if (
+                    not self._cnx_config
+                    or self._cnx_count >= self._pool_size
+                    or (self._cnx_count >= self._min_size and not self._waiters)
+                ):
+                    return
+                self._cnx_count += 1
+                cnx_config = self._cnx_config
+                config_version = self._config_version
+
+            try:
+                cnx = self._new_connection(cnx_config, config_version)
+            except Error:
+                with self._lock:
+                    self._cnx_count -= 1
+                return
+
+            with self._lock:
+                self._track_connection(cnx)
+                self._queue_connection(cnx)
+
+    def _reap(self) -> None:
+        """Close the expired connections and those idle for too long
+
+        Idle connections are kept down to the minimum size, the longest
+        idle ones being closed first.
+        """
+        now = time.monotonic()
+        stale = []
+        with self._lock:
+            idle: Deque[Tuple[MySQLConnectionAbstract, float]] = deque()
+            for cnx, idle_since in self._idle:
+                if self._is_expired(cnx, now) or (
+                    self._max_idle
+                    and now - idle_since > self._max_idle
+                    and self._cnx_count > self._min_size
+                ):
+                    self._untrack_connection(cnx)
+                    stale.append(cnx)
+                else:
+                    idle.append((cnx, idle_since))
+            self._idle = idle
+        self._close_connections(stale)
+        self._replenish()
+
     def get_connection(self) -> PooledMySQLConnection:
         """Gets a connection from the pool.
 
@@ -643,32 +1061,82 @@ class MySQLConnectionPool:
 
         When the MySQL connection is not connect, a reconnect is attempted.
 
+        When no connection is idle, a new one is opened if the pool has not
+        reached its maximum size. Otherwise, if `pool_timeout` is set, this
+        method waits for a connection to be returned, serving waiting threads
+        in arrival order.
+
         Returns:
             A `PooledMySQLConnection` instance.
 
         Raises:
             PoolError: On errors.
         """
-        with CONNECTION_POOL_LOCK:
+        started = time.monotonic()
+        cnx = None
+        waiter = None
+        expired = []
+        with self._lock:
+            while self._idle:
+                cnx = self._idle.pop()[0]
+                if not self._is_expired(cnx, started):
+                    break
+                self._untrack_connection(cnx)
+                expired.append(cnx)
+                cnx = None
+            if cnx is None:
+                if self._cnx_count < self._pool_size and self._cnx_config:
+                    # grow the pool, connecting without holding the lock
+                    self._cnx_count += 1
+                    cnx_config = self._cnx_config
+                    config_version = self._config_version
+                elif not self._timeout:
+                    raise PoolError("Failed getting connection; pool exhausted")
+                else:
+                    waiter = _PoolWaiter()
+                    self._waiters.append(waiter)
+        self._close_connections(expired)
+
+        if waiter is not None:
+            waiter.event.wait(self._timeout)
+            with self._lock:
+                if waiter.cnx is None:
+                    self._waiters.remove(waiter)
+                    raise PoolError(
+                        "Failed getting connection; pool exhausted, timed out "
+                        f"after {self._timeout} seconds"
+                    )
+            cnx = waiter.cnx
+        elif cnx is None:
             try:
-                cnx = self._cnx_queue.get(block=False)
-            except queue.Empty as err:
-                raise PoolError("Failed getting connection; pool exhausted") from err
-
-            if (
-                not cnx.is_connected()
-                or self._config_version != cnx.pool_config_version
-            ):
-                cnx.config(**self._cnx_config)
-                try:
-                    cnx.reconnect()
-                except InterfaceError:
-                    # Failed to reconnect, give connection back to pool
+                cnx = self._new_connection(cnx_config, config_version)
+            except BaseException:
+                with self._lock:
+                    self._cnx_count -= 1
+                raise
+            with self._lock:
+                self._track_connection(cnx)
+        self._record_wait_time(time.monotonic() - started)
+
+        # health check and reconnect without holding the lock
+        if (
+            not self._is_usable(cnx)
+            or self._config_version != cnx.pool_config_version
+        ):
+            cnx.config(**self._cnx_config)
+            try:
+                cnx.reconnect()
+            except InterfaceError:
+                # Failed to reconnect, give connection back to pool
+                with self._lock:
                     self._queue_connection(cnx)
-                    raise
-                cnx.pool_config_version = self._config_version
+                raise
+            cnx.pool_config_version = self._config_version
+            with self._lock:
+                self._counters["reconnects"] += 1
 
-            return PooledMySQLConnection(self, cnx)
+        self._notify("checkout", cnx)
+        return PooledMySQLConnection(self, cnx)
 
     def _remove_connections(self) -> int:
         """Close all connections
@@ -680,20 +1148,27 @@ class MySQLConnectionPool:
 
         Returns int.
         """
-        with CONNECTION_POOL_LOCK:
-            cnt = 0
-            cnxq = self._cnx_queue
-            while cnxq.qsize():
-                try:
-                    cnx = cnxq.get(block=False)
-                    cnx.disconnect()
-                    cnt += 1
-                except queue.Empty:
-                    return cnt
-                except PoolError:
-                    raise
-                except Error:
-                    # Any other error when closing means connection is closed
-                    pass
-
-            return cnt
+        with self._lock:
+            cnxs = []
+            while self._idle:
+                cnx = self._idle.popleft()[0]
+                self._untrack_connection(cnx)
+                cnxs.append(cnx)
+
+        self._close_connections(cnxs)
+        return len(cnxs)
+
+
+def _reap_pool(pool_ref: weakref.ref, interval: float) -> None:
+    """Periodically close the expired and idle connections of a pool
+
+    The pool is only weakly referenced, so that the thread ends once the
+    pool is garbage collected.
+    """
+    while True:
+        time.sleep(interval)
+        pool = pool_ref()
+        if pool is None:
+            return
+        pool._reap()  # pylint: disable=protected-access
+        del pool
@@ -13,6 +13,7 @@ DB_CONFIG = {
     'password': os.environ.get('DB_PASSWORD'),
     'database': os.environ.get('DB_NAME'),
     'port': int(os.environ.get('DB_PORT', '3306')),
+    'fast_connect': True,
 }
 PAGE_SIZE_DEFAULT = int(os.environ.get('PAGE_SIZE', '8'))
 MAX_PAGE_SIZE = int(os.environ.get('MAX_PAGE_SIZE', '24'))
@@ -193,5 +194,5 @@ def lambda_handler(event, _context):
     finally:
         if 'cursor' in locals():
             cursor.close()
-        if 'conn' in locals() and conn.is_connected():
+        if 'conn' in locals() and conn.is_alive():
             conn.close()
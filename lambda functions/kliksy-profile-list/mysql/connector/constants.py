@@ -76,6 +76,8 @@ DEFAULT_CONFIGURATION: Dict[str, Optional[Union[str, bool, int]]] = {
     "write_timeout": None,
     "client_flags": 0,
     "compress": False,
+    "compress_threshold": 50,
+    "compress_level": -1,
     "buffered": False,
     "raw": False,
     "ssl_ca": None,
@@ -106,9 +108,22 @@ DEFAULT_CONFIGURATION: Dict[str, Optional[Union[str, bool, int]]] = {
     "kerberos_auth_mode": None,
     "init_command": None,
     "openid_token_file": None,
+    "prepared_statement_cache_size": 0,
+    "fast_connect": False,
+    "query_cache": False,
 }
 
-CNX_POOL_ARGS: Tuple[str, str, str] = ("pool_name", "pool_size", "pool_reset_session")
+CNX_POOL_ARGS: Tuple[str, ...] = (
+    "pool_name",
+    "pool_size",
+    "pool_reset_session",
+    "pool_ping_threshold",
+    "pool_timeout",
+    "pool_min_size",
+    "pool_max_size",
+    "pool_max_idle",
+    "pool_max_lifetime",
+)
 
 CONN_ATTRS_DN: Tuple[str, ...] = (
     "_pid",
@@ -958,6 +973,51 @@ class ShutdownType(_Constants):
     }
 
 
+class CursorType(_Constants):
+    """MySQL Cursor types
+
+    Cursor types used as flags by the COM_STMT_EXECUTE server command.
+    """
+
+    _prefix: str = "CURSOR_TYPE_"
+    NO_CURSOR: int = 0
+    READ_ONLY: int = 1
+    FOR_UPDATE: int = 2
+    SCROLLABLE: int = 4
+
+    desc: Dict[str, Tuple[int, str]] = {
+        "NO_CURSOR": (0, "no server-side cursor"),
+        "READ_ONLY": (1, "read-only server-side cursor"),
+        "FOR_UPDATE": (2, "server-side cursor for update"),
+        "SCROLLABLE": (4, "scrollable server-side cursor"),
+    }
+
+
+class SessionTrackType(_Constants):
+    """MySQL session state change types
+
+    Types of the session state changes reported in OK packets when the
+    client has the SESSION_TRACK capability.
+    """
+
+    _prefix: str = "SESSION_TRACK_"
+    SYSTEM_VARIABLES: int = 0
+    SCHEMA: int = 1
+    STATE_CHANGE: int = 2
+    GTIDS: int = 3
+    TRANSACTION_CHARACTERISTICS: int = 4
+    TRANSACTION_STATE: int = 5
+
+    desc: Dict[str, Tuple[int, str]] = {
+        "SYSTEM_VARIABLES": (0, "session system variable changed"),
+        "SCHEMA": (1, "current schema changed"),
+        "STATE_CHANGE": (2, "session state changed"),
+        "GTIDS": (3, "GTIDs of the session"),
+        "TRANSACTION_CHARACTERISTICS": (4, "transaction characteristics"),
+        "TRANSACTION_STATE": (5, "transaction state"),
+    }
+
+
 class CharacterSet:
     """MySQL supported character sets and collations
 
@@ -31,12 +31,13 @@
 import array
 import datetime
 import math
+import re
 import struct
 import time
 
 from decimal import Decimal
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 from .constants import (
     MYSQL_VECTOR_TYPE_CODE,
@@ -58,6 +59,23 @@ from .utils import NUMERIC_TYPES
 
 CONVERT_ERROR = "Could not convert '{value}' to python {pytype}"
 
+RE_SQL_ESCAPE = re.compile(b"[\\\\\n\r'\"\032]")
+"""Matches every byte MySQLConverter.escape() prefixes with a backslash."""
+
+SQL_ESCAPE_MAP: Dict[bytes, bytes] = {
+    b"\\": b"\\\\",
+    b"\n": b"\\n",
+    b"\r": b"\\r",
+    b"\047": b"\134\047",  # single quotes
+    b"\042": b"\134\042",  # double quotes
+    b"\032": b"\134\032",  # for Win32
+}
+
+
+def _escape_match(match: re.Match) -> bytes:
+    """Return the escape sequence for a byte matched by RE_SQL_ESCAPE."""
+    return SQL_ESCAPE_MAP[match.group()]
+
 
 class MySQLConverterBase:
     """Base class for conversion classes
@@ -158,6 +176,25 @@ class MySQLConverterBase:
         """Quote buffer for sending to MySQL"""
         return str(buf)
 
+    def to_sql_literals(
+        self,
+        values: Iterable[MySQLConvertibleType],
+        sql_mode: Optional[Union[str, bytes]] = None,
+    ) -> List[Any]:
+        """Convert, escape and quote query parameters
+
+        Returns a list holding, for each value, the result of passing it
+        through to_mysql(), escape() and quote(). Decimal values are not
+        quoted.
+        """
+        result = []
+        for value in values:
+            conv = self.escape(self.to_mysql(value), sql_mode)
+            if not isinstance(value, Decimal):
+                conv = self.quote(conv)
+            result.append(conv)
+        return result
+
 
 class MySQLConverter(MySQLConverterBase):
     """Default conversion class for MySQL Connector/Python.
@@ -184,6 +221,9 @@ class MySQLConverter(MySQLConverterBase):
             int,
             Callable[[bytes, DescriptionType], PythonProducedType],
         ] = {}
+        self._cache_sql_literals: Optional[
+            Dict[type, Callable[[Any, bool], bytes]]
+        ] = None
 
     @staticmethod
     def escape(value: Any, sql_mode: Optional[Union[str, bytes]] = None) -> Any:
@@ -233,6 +273,116 @@ class MySQLConverter(MySQLConverterBase):
             return bytearray(b"NULL")
         return bytearray(b"'" + buf + b"'")  # type: ignore[operator]
 
+    def _sql_literal_encoders(self) -> Dict[type, Callable[[Any, bool], bytes]]:
+        """Build the table of fused encoders used by to_sql_literals()
+
+        Each encoder takes a value and whether backslash escaping is
+        disabled, and returns the quoted and escaped SQL literal. A type is
+        left out of the table when a subclass overrides its conversion
+        method, so that values of that type still go through to_mysql().
+        """
+        cls = type(self)
+        if (
+            cls.to_mysql is not MySQLConverter.to_mysql
+            or cls.escape is not MySQLConverter.escape
+            or cls.quote is not MySQLConverter.quote
+        ):
+            return {}
+
+        def quoted(value: bytes, no_backslash_escapes: bool) -> bytes:
+            if no_backslash_escapes:
+                return b"'" + value.replace(b"'", b"''") + b"'"
+            if RE_SQL_ESCAPE.search(value) is None:
+                return b"'" + value + b"'"
+            return b"'" + RE_SQL_ESCAPE.sub(_escape_match, value) + b"'"
+
+        def encode_str(value: str, no_backslash_escapes: bool) -> bytes:
+            charset = self.charset
+            charset_id = self.charset_id
+            if charset == "binary":
+                charset = "utf8"
+                charset_id = self._character_set.get_charset_info(charset)[0]
+            encoded = value.encode(charset)
+            if charset_id in self._character_set.slash_charsets:
+                if b"\x5c" in encoded:
+                    return b"0x" + encoded.hex().encode("ascii")
+            return quoted(encoded, no_backslash_escapes)
+
+        def encode_float(value: float, _: bool) -> bytes:
+            if math.isnan(value):
+                return b"NULL"
+            return str(value).encode("ascii")
+
+        encoders: Dict[type, Callable[[Any, bool], bytes]] = {
+            int: lambda value, _: str(value).encode("ascii"),
+            bool: lambda value, _: b"1" if value else b"0",
+            float: encode_float,
+            str: encode_str,
+            bytes: quoted,
+            bytearray: lambda value, nbe: quoted(bytes(value), nbe),
+            type(None): lambda value, _: b"NULL",
+            Decimal: lambda value, _: str(value).encode("ascii"),
+        }
+        for pytype in (
+            datetime.datetime,
+            datetime.date,
+            datetime.time,
+            datetime.timedelta,
+            time.struct_time,
+        ):
+            name = NATIVE_SUPPORTED_CONVERSION_TYPES[pytype]
+            method = getattr(self, f"_{name}_to_mysql")
+            encoders[pytype] = (
+                lambda value, nbe, method=method: quoted(method(value), nbe)
+            )
+
+        for pytype in list(encoders):
+            name = NATIVE_SUPPORTED_CONVERSION_TYPES[pytype]
+            method_names = [f"_{name}_to_mysql"]
+            if pytype is str:
+                method_names.append("_unicode_to_mysql")
+            if any(
+                getattr(cls, method_name) is not getattr(MySQLConverter, method_name)
+                for method_name in method_names
+            ):
+                del encoders[pytype]
+        return encoders
+
+    def to_sql_literals(
+        self,
+        values: Iterable[MySQLConvertibleType],
+        sql_mode: Optional[Union[str, bytes]] = None,
+    ) -> List[Any]:
+        """Convert, escape and quote query parameters
+
+        Values of the native supported types are turned into their final
+        SQL literal in a single step, with escaping done in one regular
+        expression pass. Any other value falls back to to_mysql(), escape()
+        and quote(). The result is byte-for-byte the same in both cases.
+
+        Returns a list.
+        """
+        if self._cache_sql_literals is None:
+            self._cache_sql_literals = self._sql_literal_encoders()
+        encoders = self._cache_sql_literals
+        if isinstance(sql_mode, bytes):
+            sql_mode = sql_mode.decode()
+        no_backslash_escapes = (
+            sql_mode is not None and SQLMode.NO_BACKSLASH_ESCAPES in sql_mode
+        )
+
+        result = []
+        for value in values:
+            encoder = encoders.get(type(value))
+            if encoder is not None:
+                result.append(encoder(value, no_backslash_escapes))
+                continue
+            conv = self.escape(self.to_mysql(value), sql_mode)
+            if not isinstance(value, Decimal):
+                conv = self.quote(conv)
+            result.append(conv)
+        return result
+
     def to_mysql(self, value: MySQLConvertibleType) -> MySQLProducedType:
         """Convert Python data type to MySQL"""
         if isinstance(value, Enum):
@@ -32,13 +32,19 @@
 from __future__ import annotations
 
 import re
+import time
 import warnings
 
+from collections import deque
 from decimal import Decimal
 from typing import (
     TYPE_CHECKING,
     Any,
+    Deque,
     Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
     Iterator,
     List,
     NoReturn,
@@ -52,7 +58,7 @@ from typing import (
 from ._decorating import deprecated
 from ._scripting import split_multi_statement
 from .abstracts import MySQLCursorAbstract
-from .constants import ServerFlag
+from .constants import ClientFlag, CursorType, ServerFlag
 from .errors import (
     Error,
     InterfaceError,
@@ -95,6 +101,9 @@ RE_SQL_INSERT_STMT = re.compile(
     re.I | re.M | re.S,
 )
 RE_SQL_INSERT_VALUES = re.compile(r".*VALUES\s*(\(.+\)).*", re.I | re.M | re.S)
+RE_SQL_UPDATE_DELETE_STMT = re.compile(
+    rf"({SQL_COMMENT}|\s)*(?:UPDATE|DELETE)\b", re.I | re.M | re.S
+)
 RE_PY_PARAM = re.compile(b"(%s)")
 RE_PY_MAPPING_PARAM = re.compile(
     rb"""
@@ -114,6 +123,13 @@ RE_SQL_PYTHON_CAPTURE_PARAM_NAME = re.compile(r"%\((.*?)\)s")
 ERR_NO_RESULT_TO_FETCH = "No result set to fetch from"
 
 MAX_RESULTS = 4294967295
+DEFAULT_FETCH_SIZE = 1000
+# Bytes kept below max_allowed_packet when batching statements in
+# executemany(), for the command byte and query attributes
+BATCH_PACKET_HEADROOM = 1024
+# Separator of pipelined statements, a trailing "-- comment" in the
+# operation can't swallow it
+PIPELINE_SEPARATOR = b"\n;\n"
 
 
 class _ParamSubstitutor:
@@ -195,6 +211,8 @@ class MySQLCursor(MySQLCursorAbstract):
         """Initialize"""
         super().__init__(connection, read_timeout, write_timeout)
         self._connection: MySQLConnection = cast("MySQLConnection", self._connection)
+        # rows of a result read at once for the query cache
+        self._cached_rows: Optional[Deque[RowType]] = None
 
     def __iter__(self) -> Iterator[RowType]:
         """
@@ -217,6 +235,7 @@ class MySQLCursor(MySQLCursorAbstract):
         self._warnings: Optional[List[WarningType]] = None
         self._warning_count: int = 0
         self._description: Optional[List[DescriptionType]] = None
+        self._cached_rows = None
 
         if not preserve_last_executed_stmt:
             # reset inner state related to statement execution
@@ -275,22 +294,18 @@ class MySQLCursor(MySQLCursorAbstract):
     ) -> Dict[bytes, Union[bytes, Decimal]]:
         """Process query parameters given as dictionary"""
         res: Dict[bytes, Any] = {}
+        started = time.monotonic()
         try:
             sql_mode = self._connection.sql_mode
-            to_mysql = self._connection.converter.to_mysql
-            escape = self._connection.converter.escape
-            quote = self._connection.converter.quote
-            for key, value in params.items():
-                conv = value
-                conv = to_mysql(conv)
-                conv = escape(conv, sql_mode)
-                if not isinstance(value, Decimal):
-                    conv = quote(conv)
-                res[key.encode()] = conv
+            literals = self._connection.converter.to_sql_literals(
+                params.values(), sql_mode
+            )
+            res = {key.encode(): conv for key, conv in zip(params, literals)}
         except Exception as err:
             raise ProgrammingError(
                 f"Failed processing pyformat-parameters; {err}"
             ) from err
+        self._connection._wire.encode_time += time.monotonic() - started
         return res
 
     def _process_params(
@@ -298,21 +313,15 @@ class MySQLCursor(MySQLCursorAbstract):
     ) -> Tuple[Union[bytes, Decimal], ...]:
         """Process query parameters."""
         res = params[:]
+        started = time.monotonic()
         try:
             sql_mode = self._connection.sql_mode
-            to_mysql = self._connection.converter.to_mysql
-            escape = self._connection.converter.escape
-            quote = self._connection.converter.quote
-            res = [to_mysql(value) for value in res]
-            res = [escape(value, sql_mode) for value in res]
-            res = [
-                quote(value) if not isinstance(params[i], Decimal) else value
-                for i, value in enumerate(res)
-            ]
+            res = self._connection.converter.to_sql_literals(res, sql_mode)
         except Exception as err:
             raise ProgrammingError(
                 f"Failed processing format-parameters; {err}"
             ) from err
+        self._connection._wire.encode_time += time.monotonic() - started
         return tuple(res)
 
     def _handle_noresultset(self, res: ResultType) -> None:
@@ -375,30 +384,29 @@ class MySQLCursor(MySQLCursorAbstract):
         self._connection.handle_unread_result()
         self._reset_result()
 
+        if params and hasattr(operation, "read"):
+            raise ProgrammingError("Parameters are not supported with file objects")
+
         stmt = b""
         try:
             if isinstance(operation, str):
                 stmt = operation.encode(self._connection.python_charset)
             else:
+                # bytes, or a binary file object split as it is read
                 stmt = cast(bytes, operation)
         except (UnicodeDecodeError, UnicodeEncodeError) as err:
             raise ProgrammingError(str(err)) from err
 
         if params:
-            if isinstance(params, dict):
-                stmt = _bytestr_format_dict(stmt, self._process_params_dict(params))
-            elif isinstance(params, (list, tuple)):
-                psub = _ParamSubstitutor(self._process_params(params))
-                stmt = RE_PY_PARAM.sub(psub, stmt)
-                if psub.remaining != 0:
-                    raise ProgrammingError(
-                        "Not all parameters were used in the SQL statement"
-                    )
-            else:
-                raise ProgrammingError(
-                    f"Could not process parameters: {type(params).__name__}({params}),"
-                    " it must be of type list, tuple or dict"
-                )
+            stmt = self._substitute_params(stmt, params)
+
+        cache_key = None if hasattr(stmt, "read") else self._query_cache_key(stmt)
+        if cache_key is not None:
+            cached = self._connection.query_cache.get(cache_key[0])
+            if cached is not None:
+                self._executed = stmt
+                self._handle_cached_result(*cached)
+                return None
 
         self._stmt_partitions = split_multi_statement(
             sql_code=stmt, map_results=map_results
@@ -419,13 +427,75 @@ class MySQLCursor(MySQLCursorAbstract):
                 write_timeout=self._write_timeout,
             )
         )
+        if cache_key is not None:
+            self._cache_result(*cache_key)
+
+        return None
+
+    def _query_cache_key(
+        self, stmt: bytes
+    ) -> Optional[Tuple[Hashable, FrozenSet[str]]]:
+        """Returns the query cache key and the tables of a statement
 
+        Returns None when the result is not to be cached, which is always
+        the case for cursors returning tuples without buffering the result.
+        """
         return None
 
+    def _handle_cached_result(
+        self, description: List[DescriptionType], rows: List[RowType]
+    ) -> None:
+        """Handle a result taken from the query cache"""
+        self._description = description
+        self._cached_rows = deque(rows)
+        self._rowcount = len(rows)
+
+    def _cache_result(self, key: Hashable, tables: FrozenSet[str]) -> None:
+        """Store the result of the statement in the query cache
+
+        The rows are read at once, and then fetched from memory.
+        """
+        if not self._have_unread_result():
+            return
+        (rows, eof) = self._connection.get_rows(read_timeout=self._read_timeout)
+        self._handle_eof(eof)
+        if not self._connection._have_next_result:
+            self._connection.query_cache.put(key, tables, self._description, rows)
+        self._cached_rows = deque(rows)
+        self._rowcount = len(rows)
+
+    def _substitute_params(
+        self, stmt: bytes, params: ParamsSequenceOrDictType
+    ) -> bytes:
+        """Returns the statement with the parameters substituted
+
+        Raises ProgrammingError when the parameters don't match the statement.
+        """
+        if isinstance(params, dict):
+            return _bytestr_format_dict(stmt, self._process_params_dict(params))
+        if isinstance(params, (list, tuple)):
+            psub = _ParamSubstitutor(self._process_params(params))
+            stmt = RE_PY_PARAM.sub(psub, stmt)
+            if psub.remaining != 0:
+                raise ProgrammingError(
+                    "Not all parameters were used in the SQL statement"
+                )
+            return stmt
+        raise ProgrammingError(
+            f"Could not process parameters: {type(params).__name__}({params}),"
+            " it must be of type list, tuple or dict"
+        )
+
     def _batch_insert(
-        self, operation: str, seq_params: Sequence[ParamsSequenceOrDictType]
-    ) -> Optional[bytes]:
-        """Implements multi row insert"""
+        self, operation: str, seq_params: Iterable[ParamsSequenceOrDictType]
+    ) -> Optional[Iterator[bytes]]:
+        """Implements multi row insert
+
+        Returns an iterator over multi-row INSERT statements, each holding as
+        many rows as fit in the server max_allowed_packet, or None when the
+        operation can't be rewritten. Rows are consumed from seq_params as
+        the statements are iterated.
+        """
 
         def remove_comments(match: re.Match) -> str:
             """Remove comments from INSERT statements.
@@ -449,11 +519,28 @@ class MySQLCursor(MySQLCursorAbstract):
             raise InterfaceError(
                 "Failed rewriting statement for multi-row INSERT. Check SQL syntax"
             )
-        fmt = matches.group(1).encode(self._connection.python_charset)
-        values = []
-
         try:
+            fmt = matches.group(1).encode(self._connection.python_charset)
             stmt = operation.encode(self._connection.python_charset)
+        except (UnicodeDecodeError, UnicodeEncodeError) as err:
+            raise ProgrammingError(str(err)) from err
+        if fmt not in stmt:
+            return None
+        head, tail = stmt.split(fmt, 1)
+        return self._batch_insert_chunks(fmt, head, tail, seq_params)
+
+    def _batch_insert_chunks(
+        self,
+        fmt: bytes,
+        head: bytes,
+        tail: bytes,
+        seq_params: Iterable[ParamsSequenceOrDictType],
+    ) -> Iterator[bytes]:
+        """Yields multi-row INSERT statements fitting max_allowed_packet"""
+        max_size = self._connection.max_allowed_packet - BATCH_PACKET_HEADROOM
+        values: List[bytes] = []
+        size = len(head) + len(tail)
+        try:
             for params in seq_params:
                 tmp = fmt
                 if isinstance(params, dict):
@@ -465,21 +552,45 @@ class MySQLCursor(MySQLCursorAbstract):
                         raise ProgrammingError(
                             "Not all parameters were used in the SQL statement"
                         )
+                if values and size + len(tmp) + 1 > max_size:
+                    yield head + b",".join(values) + tail
+                    values = []
+                    size = len(head) + len(tail)
                 values.append(tmp)
-            if fmt in stmt:
-                stmt = stmt.replace(fmt, b",".join(values), 1)
-                self._executed = stmt
-                return stmt
-            return None
+                size += len(tmp) + 1
         except (UnicodeDecodeError, UnicodeEncodeError) as err:
             raise ProgrammingError(str(err)) from err
         except Error:
             raise
         except Exception as err:
             raise InterfaceError(f"Failed executing the operation; {err}") from None
+        if values:
+            yield head + b",".join(values) + tail
+
+    def _pipeline_groups(
+        self, operation: bytes, seq_params: Iterable[ParamsSequenceOrDictType]
+    ) -> Iterator[bytes]:
+        """Yields multi-statement groups fitting max_allowed_packet
+
+        Each group holds the operation once for each parameters, saving a
+        round trip per statement.
+        """
+        max_size = self._connection.max_allowed_packet - BATCH_PACKET_HEADROOM
+        group: List[bytes] = []
+        size = 0
+        for params in seq_params:
+            stmt = self._substitute_params(operation, params) if params else operation
+            if group and size + len(stmt) > max_size:
+                yield PIPELINE_SEPARATOR.join(group)
+                group = []
+                size = 0
+            group.append(stmt)
+            size += len(stmt) + len(PIPELINE_SEPARATOR)
+        if group:
+            yield PIPELINE_SEPARATOR.join(group)
 
     def executemany(
-        self, operation: str, seq_params: Sequence[ParamsSequenceOrDictType]
+        self, operation: str, seq_params: Iterable[ParamsSequenceOrDictType]
     ) -> None:
         """Execute the given operation multiple times
 
@@ -497,7 +608,12 @@ class MySQLCursor(MySQLCursorAbstract):
         cursor.executemany(stmt, data)
 
         INSERT statements are optimized by batching the data, that is
-        using the MySQL multiple rows syntax.
+        using the MySQL multiple rows syntax. The rows are sent in as many
+        statements as needed to stay below the server max_allowed_packet.
+        UPDATE and DELETE statements are sent in multi-statement groups, when
+        the connection allows multiple statements. seq_params can be any
+        iterable, including a generator, and is only consumed once. The
+        rowcount is the total over all the statements.
 
         Results are discarded. If they are needed, consider looping over
         data using the execute() method.
@@ -513,13 +629,38 @@ class MySQLCursor(MySQLCursorAbstract):
 
         # Optimize INSERTs by batching them
         if re.match(RE_SQL_INSERT_STMT, operation):
-            if not seq_params:
-                self._rowcount = 0
+            stmts = self._batch_insert(operation, seq_params)
+            if stmts is not None:
+                rowcnt = 0
+                for stmt in stmts:
+                    self.execute(stmt)
+                    rowcnt += self._rowcount
+                self._rowcount = rowcnt
+                return None
+
+        # Pipeline UPDATEs and DELETEs consisting of a single statement
+        if re.match(RE_SQL_UPDATE_DELETE_STMT, operation) and (
+            self._connection.client_flags & ClientFlag.MULTI_STATEMENTS
+        ):
+            try:
+                stmt = operation.encode(self._connection.python_charset)
+            except (UnicodeDecodeError, UnicodeEncodeError) as err:
+                raise ProgrammingError(str(err)) from err
+            stmt = stmt.strip().rstrip(b";")
+            if not RE_SQL_SPLIT_STMTS.search(stmt):
+                rowcnt = 0
+                try:
+                    for group in self._pipeline_groups(stmt, seq_params):
+                        self.execute(group)
+                        rowcnt += self._rowcount
+                        while self.nextset():
+                            rowcnt += self._rowcount
+                except (ValueError, TypeError) as err:
+                    raise InterfaceError(
+                        f"Failed executing the operation; {err}"
+                    ) from None
+                self._rowcount = rowcnt
                 return None
-            stmt = self._batch_insert(operation, seq_params)
-            if stmt is not None:
-                self._executed = stmt
-                return self.execute(stmt)
 
         rowcnt = 0
         try:
@@ -728,6 +869,8 @@ class MySQLCursor(MySQLCursorAbstract):
 
         Returns a tuple or None.
         """
+        if self._cached_rows is not None:
+            return self._cached_rows.popleft() if self._cached_rows else None
         if not self._have_unread_result():
             return None
         row = None
@@ -783,7 +926,7 @@ class MySQLCursor(MySQLCursorAbstract):
         self._check_executed()
         res = []
         cnt = size or self.arraysize
-        while cnt > 0 and self._have_unread_result():
+        while cnt > 0 and (self._cached_rows or self._have_unread_result()):
             cnt -= 1
             row = self.fetchone()
             if row:
@@ -797,6 +940,10 @@ class MySQLCursor(MySQLCursorAbstract):
             list: A list of tuples with all rows of a query result set.
         """
         self._check_executed()
+        if self._cached_rows is not None:
+            rows = list(self._cached_rows)
+            self._cached_rows.clear()
+            return rows
         if not self._have_unread_result():
             return []
 
@@ -931,6 +1078,24 @@ class MySQLCursorBuffered(MySQLCursor):
     def reset(self, free: bool = True) -> None:
         self._rows = None
 
+    def _query_cache_key(
+        self, stmt: bytes
+    ) -> Optional[Tuple[Hashable, FrozenSet[str]]]:
+        return self._connection._query_cache_key(stmt)
+
+    def _handle_cached_result(
+        self, description: List[DescriptionType], rows: List[RowType]
+    ) -> None:
+        self._description = description
+        self._rows = rows
+        self._rowcount = len(rows)
+        self._next_row = 0
+
+    def _cache_result(self, key: Hashable, tables: FrozenSet[str]) -> None:
+        if self._rows is None or self._connection._have_next_result:
+            return
+        self._connection.query_cache.put(key, tables, self._description, self._rows)
+
     def _fetch_row(self, raw: bool = False) -> Optional[RowType]:
         row = None
         try:
@@ -1060,6 +1225,12 @@ class MySQLCursorBufferedRaw(MySQLCursorBuffered):
         except AttributeError:
             pass
 
+    def _query_cache_key(
+        self, stmt: bytes
+    ) -> Optional[Tuple[Hashable, FrozenSet[str]]]:
+        # the cache holds converted rows only
+        return None
+
     def fetchone(self) -> Optional[RowType]:
         """Return next row of a query result set.
 
@@ -1086,25 +1257,46 @@ class MySQLCursorBufferedRaw(MySQLCursorBuffered):
 
 
 class MySQLCursorPrepared(MySQLCursor):
-    """Cursor using MySQL Prepared Statements"""
+    """Cursor using MySQL Prepared Statements
+
+    When server_side is True, statements returning a result set open a
+    read-only cursor on the server. Rows are then fetched from it in
+    batches of fetch_size rows while the result is consumed, so at most
+    one batch is held in memory. As the server-side cursor belongs to the
+    prepared statement, such cursors don't share statements through the
+    prepared statement cache; closing the cursor deallocates both.
+    """
 
     def __init__(
         self,
         connection: Optional[MySQLConnection] = None,
         read_timeout: Optional[int] = None,
         write_timeout: Optional[int] = None,
+        server_side: bool = False,
+        fetch_size: int = DEFAULT_FETCH_SIZE,
     ):
         super().__init__(connection, read_timeout, write_timeout)
+        if (
+            isinstance(fetch_size, bool)
+            or not isinstance(fetch_size, int)
+            or fetch_size <= 0
+        ):
+            raise ProgrammingError("fetch_size must be a positive integer")
+        self._server_side: bool = server_side
+        self._fetch_size: int = fetch_size
+        self._batch: Deque[RowType] = deque()
+        self._server_cursor_open: bool = False
         self._rows: Optional[List[RowType]] = None
         self._next_row: int = 0
         self._prepared: Optional[Dict[str, Union[int, List[DescriptionType]]]] = None
+        self._prepared_key: Optional[bytes] = None
         self._binary: bool = True
         self._have_result: Optional[bool] = None
         self._last_row_sent: bool = False
         self._cursor_exists: bool = False
 
     def reset(self, free: bool = True) -> None:
-        if self._prepared:
+        if self._prepared and self._prepared_key is None:
             try:
                 self._connection.cmd_stmt_close(
                     self._prepared["statement_id"],
@@ -1114,10 +1306,13 @@ class MySQLCursorPrepared(MySQLCursor):
             except Error:
                 # We tried to deallocate, but it's OK when we fail.
                 pass
-            self._prepared = None
+        self._prepared = None
+        self._prepared_key = None
         self._executed = None
         self._last_row_sent = False
         self._cursor_exists = False
+        self._batch.clear()
+        self._server_cursor_open = False
 
     def _handle_noresultset(self, res: ResultType) -> None:
         self._handle_server_status(res.get("status_flag", res.get("server_status", 0)))
@@ -1159,6 +1354,8 @@ class MySQLCursorPrepared(MySQLCursor):
 
     def _handle_result(self, result: ResultType) -> None:
         """Handle result after execution"""
+        self._batch.clear()
+        self._server_cursor_open = False
         if isinstance(result, dict):
             self._connection.unread_result = False
             self._have_result = False
@@ -1173,6 +1370,59 @@ class MySQLCursorPrepared(MySQLCursor):
             elif "server_status" in result[2]:  # type: ignore[operator]
                 self._handle_server_status(result[2]["server_status"])
 
+            self._server_cursor_open = self._cursor_exists
+            if self._server_cursor_open:
+                # Rows are only sent by the server when fetched
+                self._connection.unread_result = False
+                self._rowcount = -1
+
+    def _fetch_batch(self, count: int) -> None:
+        """Fetch the next rows from the server-side cursor
+
+        Up to count rows are fetched with COM_STMT_FETCH and added to the
+        batch of rows not returned yet.
+        """
+        self._connection.cmd_stmt_fetch(
+            self._prepared["statement_id"],
+            count,
+            read_timeout=self._read_timeout,
+            write_timeout=self._write_timeout,
+        )
+        (rows, eof) = self._connection.get_rows(
+            binary=self._binary,
+            columns=self.description,
+            read_timeout=self._read_timeout,
+        )
+        self._batch.extend(rows)
+        self._handle_eof(eof)
+        if self._last_row_sent or not rows:
+            self._server_cursor_open = False
+
+    def _fetch_batched_row(self) -> Optional[RowType]:
+        """Return the next row of the server-side cursor
+
+        Returns a tuple or None.
+        """
+        if not self._batch and self._server_cursor_open:
+            self._fetch_batch(self._fetch_size)
+        if not self._batch:
+            return None
+        if self._rowcount == -1:
+            self._rowcount = 1
+        else:
+            self._rowcount += 1
+        return self._batch.popleft()
+
+    @property
+    def server_side(self) -> bool:
+        """Returns whether result sets are fetched from a server-side cursor"""
+        return self._server_side
+
+    @property
+    def fetch_size(self) -> int:
+        """Returns the number of rows fetched per server-side cursor batch"""
+        return self._fetch_size
+
     def execute(
         self,
         operation: StrOrBytes,
@@ -1185,7 +1435,10 @@ class MySQLCursorPrepared(MySQLCursor):
         the optionally given parameters.
 
         If the cursor instance already had a prepared statement, it is
-        first closed.
+        first closed. When the connection has a prepared statement cache,
+        the statement is taken from the cache instead and is left open,
+        unless the cursor is server-side: executing the cached statement
+        elsewhere would close its server-side cursor.
 
         *Argument "map_results" is unused as multi statement execution
         is not supported for prepared statements*.
@@ -1222,12 +1475,13 @@ class MySQLCursorPrepared(MySQLCursor):
             operation = re.sub(RE_SQL_PYTHON_REPLACE_PARAM, "?", operation)
 
         if operation is not self._executed:
-            if self._prepared:
+            if self._prepared and self._prepared_key is None:
                 self._connection.cmd_stmt_close(
                     self._prepared["statement_id"],
                     read_timeout=self._read_timeout,
                     write_timeout=self._write_timeout,
                 )
+            self._prepared_key = None
             self._executed = operation
 
             try:
@@ -1240,14 +1494,33 @@ class MySQLCursorPrepared(MySQLCursor):
                 operation = re.sub(RE_SQL_FIND_PARAM, b"?", operation)
 
             try:
-                self._prepared = self._connection.cmd_stmt_prepare(
-                    operation,
-                    read_timeout=self._read_timeout,
-                    write_timeout=self._write_timeout,
-                )
+                if (
+                    self._connection.prepared_statement_cache is not None
+                    and not self._server_side
+                ):
+                    self._prepared = self._connection.get_prepared_statement(
+                        operation,
+                        read_timeout=self._read_timeout,
+                        write_timeout=self._write_timeout,
+                    )
+                    self._prepared_key = operation
+                else:
+                    self._prepared = self._connection.cmd_stmt_prepare(
+                        operation,
+                        read_timeout=self._read_timeout,
+                        write_timeout=self._write_timeout,
+                    )
             except Error:
                 self._executed = None
                 raise
+        elif self._prepared_key is not None:
+            # The cached statement may have been evicted or deallocated
+            # since the last execution
+            self._prepared = self._connection.get_prepared_statement(
+                self._prepared_key,
+                read_timeout=self._read_timeout,
+                write_timeout=self._write_timeout,
+            )
 
         self._connection.cmd_stmt_reset(
             self._prepared["statement_id"],
@@ -1278,6 +1551,9 @@ class MySQLCursorPrepared(MySQLCursor):
                 self._prepared["statement_id"],
                 data=params,
                 parameters=self._prepared["parameters"],
+                flags=(
+                    CursorType.READ_ONLY if self._server_side else CursorType.NO_CURSOR
+                ),
                 read_timeout=self._read_timeout,
                 write_timeout=self._write_timeout,
             )
@@ -1285,6 +1561,8 @@ class MySQLCursorPrepared(MySQLCursor):
         except (ReadTimeoutError, WriteTimeoutError) as err:
             self.reset()
             raise err
+        if self._connection.query_cache is not None:
+            self._connection._update_query_cache(self._executed.encode(charset))
 
     def executemany(
         self,
@@ -1319,12 +1597,8 @@ class MySQLCursorPrepared(MySQLCursor):
             tuple or None: A row from query result set.
         """
         self._check_executed()
-        if self._cursor_exists:
-            self._connection.cmd_stmt_fetch(
-                self._prepared["statement_id"],
-                read_timeout=self._read_timeout,
-                write_timeout=self._write_timeout,
-            )
+        if self._server_cursor_open or self._batch:
+            return self._fetch_batched_row()
         return self._fetch_row() or None
 
     def fetchmany(self, size: Optional[int] = None) -> List[RowType]:
@@ -1340,6 +1614,14 @@ class MySQLCursorPrepared(MySQLCursor):
         self._check_executed()
         res = []
         cnt = size or self.arraysize
+        if self._server_cursor_open or self._batch:
+            while cnt > 0:
+                cnt -= 1
+                row = self._fetch_batched_row()
+                if row is None:
+                    break
+                res.append(row)
+            return res
         while cnt > 0 and self._have_unread_result():
             cnt -= 1
             row = self._fetch_row()
@@ -1354,17 +1636,19 @@ class MySQLCursorPrepared(MySQLCursor):
             list: A list of tuples with all rows of a query result set.
         """
         self._check_executed()
+        if self._server_cursor_open or self._batch:
+            if self._server_cursor_open:
+                self._fetch_batch(MAX_RESULTS)
+            rows = list(self._batch)
+            self._batch.clear()
+            if self._rowcount == -1:
+                self._rowcount = 0
+            self._rowcount += len(rows)
+            return rows
         rows = []
         if self._nextrow[0]:
             rows.append(self._nextrow[0])
         while self._have_unread_result():
-            if self._cursor_exists:
-                self._connection.cmd_stmt_fetch(
-                    self._prepared["statement_id"],
-                    MAX_RESULTS,
-                    read_timeout=self._read_timeout,
-                    write_timeout=self._write_timeout,
-                )
             (tmp, eof) = self._connection.get_rows(
                 binary=self._binary,
                 columns=self.description,
@@ -1399,6 +1683,11 @@ class MySQLCursorDict(MySQLCursor):
         """
         return dict(zip(self.column_names, rowdata)) if rowdata else None
 
+    def _query_cache_key(
+        self, stmt: bytes
+    ) -> Optional[Tuple[Hashable, FrozenSet[str]]]:
+        return self._connection._query_cache_key(stmt)
+
     def fetchone(self) -> Optional[Dict[str, RowItemType]]:
         """Return next row of a query result set.
 
@@ -0,0 +1,113 @@
+import asyncio
+import math
+
+import mysql.connector.aio
+
+from lambda_function import (
+	DB_CONFIG,
+	_build_response,
+	_clamp_page_size,
+	_parse_int,
+	_serialize_row,
+)
+
+
+# mysql.connector.aio has no fast_connect option
+ASYNC_DB_CONFIG = {key: value for key, value in DB_CONFIG.items() if key != 'fast_connect'}
+POOL_CONFIG = {
+	'pool_name': 'kliksy-s3-load-feed',
+	'pool_size': 2,
+	'pool_min_size': 0,
+	'pool_timeout': 5,
+}
+
+# One loop for the lifetime of the execution environment, so that pooled
+# connections survive across warm invocations.
+_loop = asyncio.new_event_loop()
+_pool = None
+# concurrent first calls must not each create a pool
+_pool_lock = asyncio.Lock()
+
+
+async def _get_connection():
+	global _pool
+	if _pool is None:
+		async with _pool_lock:
+			if _pool is None:
+				pool = mysql.connector.aio.MySQLConnectionPool(**POOL_CONFIG, **ASYNC_DB_CONFIG)
+				await pool.initialize_pool()
+				_pool = pool
+	return await _pool.get_connection()
+
+
+async def _query(query: str, args: list, fetch_all: bool):
+	async with await _get_connection() as conn:
+		async with await conn.cursor(dictionary=True) as cursor:
+			await cursor.execute(query, args)
+			if fetch_all:
+				return await cursor.fetchall()
+			return await cursor.fetchone()
+
+
+async def _handle(event):
+	params = event.get('queryStringParameters') or {}
+	page = max(1, _parse_int(params.get('page'), 1))
+	page_size = _clamp_page_size(params.get('pageSize'))
+
+	where_clause = "m.privacy = 'public'"
+	args: list = []
+
+	count_query = f"""
+		SELECT COUNT(*) AS total
+		FROM memes m
+		WHERE {where_clause}
+	"""
+
+	offset = (page - 1) * page_size
+
+	data_query = f"""
+		SELECT
+			m.id,
+			m.user_id,
+			m.description,
+			m.privacy,
+			m.s3_key,
+			m.file_type,
+			m.file_size_bytes,
+			m.created_at,
+			u.username,
+			u.email
+		FROM memes m
+		JOIN users u ON u.id = m.user_id
+		WHERE {where_clause}
+		ORDER BY m.created_at DESC
+		LIMIT %s OFFSET %s
+	"""
+
+	# the page does not depend on the count, run both on their own connection
+	count_row, rows = await asyncio.gather(
+		_query(count_query, args, fetch_all=False),
+		_query(data_query, args + [page_size, offset], fetch_all=True),
+	)
+	total_items = count_row.get('total', 0)
+
+	total_pages = max(1, math.ceil(total_items / page_size)) if total_items else 1
+
+	payload = {
+		'items': [_serialize_row(row) for row in rows],
+		'pagination': {
+			'page': page,
+			'pageSize': page_size,
+			'totalItems': total_items,
+			'totalPages': total_pages,
+		},
+	}
+	return _build_response(200, payload)
+
+
+def lambda_handler(event, _context):
+	try:
+		return _loop.run_until_complete(_handle(event))
+	except Exception as exc:  # noqa: BLE001
+		print(f"Feed lambda error: {exc}")
+		return _build_response(500, {'error': 'Unable to load feed'})
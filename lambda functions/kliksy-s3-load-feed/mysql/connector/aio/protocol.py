@@ -267,7 +267,9 @@ class MySQLProtocol(_MySQLProtocol):
                 values = None
             elif packet[4] == 0:
                 eof = None
-                values = self._parse_binary_values(columns, packet[5:], charset)
+                values = self._parse_binary_values(
+                    columns, memoryview(packet)[5:], charset
+                )
             if eof is None and values is not None:
                 rows.append(values)
             elif eof is None and values is None:
@@ -32,7 +32,6 @@
 
 import os
 import platform
-import socket
 import sys
 import warnings
 
@@ -72,6 +71,7 @@ from .types import (
     StrOrBytes,
 )
 from .utils import (
+    get_source_host,
     import_object,
     warn_ciphersuites_deprecated,
     warn_tls_version_deprecated,
@@ -157,7 +157,7 @@ class CMySQLConnection(MySQLConnectionAbstract):
                 "_connector_name": "mysql-connector-python",
                 "_connector_license": client_license,
                 "_connector_version": ".".join([str(x) for x in version.VERSION[0:3]]),
-                "_source_host": socket.gethostname(),
+                "_source_host": get_source_host(),
             }
         )
 
@@ -0,0 +1,479 @@
+# Copyright (c) 2025, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0, as
+# published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms,
+# as designated in a particular file or component or in included license
+# documentation. The authors of MySQL hereby grant you an
+# additional permission to link the program and your derivative works
+# with the separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# Without limiting anything contained in the foregoing, this file,
+# which is part of MySQL Connector/Python, is also subject to the
+# Universal FOSS Exception, version 1.0, a copy of which can be found at
+# http://oss.oracle.com/licenses/universal-foss-exception.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301  USA
+
+
+
+"""Pipelined execution of statements."""
+from __future__ import annotations
+
+import re
+import time
+from collections import deque
+from io import IOBase
+from itertools import chain
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, Deque, List, Mapping, Optional, Sequence, Type
+
+from .constants import ServerCmd
+from .cursor import RE_SQL_FIND_PARAM, MySQLCursor
+from .errors import (
+    Error,
+    InterfaceError,
+    NotSupportedError,
+    OperationalError,
+    ProgrammingError,
+    get_exception,
+)
+from .protocol import ERR_STATUS
+from .query_cache import statement_keyword
+from .types import (
+    DescriptionType,
+    EofPacketType,
+    OkPacketType,
+    ParamsSequenceOrDictType,
+    RowType,
+    StrOrBytes,
+)
+
+if TYPE_CHECKING:
+    from .connection import MySQLConnection
+
+PIPELINE_WINDOW = 65536
+"""Bytes of requests sent ahead of the responses read. Socket buffers hold
+at least as much, so the server is never left blocked writing responses
+while the client is blocked writing requests."""
+
+RE_LOAD_LOCAL = re.compile(rb"\bLOCAL\b", re.IGNORECASE)
+
+
+class PipelineResult:
+    """Result of a statement queued in a pipeline
+
+    The result is available once the pipeline is synced. A statement failing
+    on the server gets its error set instead, the statements queued after it
+    are executed all the same.
+
+    Extra results, returned for example by CALL or by several statements
+    sent at once, are found in `next_results`.
+    """
+
+    def __init__(self, statement: bytes) -> None:
+        self.statement: bytes = statement
+        self.description: Optional[List[DescriptionType]] = None
+        self.rowcount: int = -1
+        self.lastrowid: Optional[int] = None
+        self.warning_count: int = 0
+        self.next_results: List[PipelineResult] = []
+        self._rows: List[RowType] = []
+        self._error: Optional[Error] = None
+        self._done: bool = False
+
+    def __repr__(self) -> str:
+        state = "pending"
+        if self._error is not None:
+            state = f"error={self._error!r}"
+        elif self._done:
+            state = f"rowcount={self.rowcount}"
+        return f"<{self.__class__.__name__} {self.statement[:40]!r} {state}>"
+
+    def _set_ok(self, ok_pkt: OkPacketType) -> None:
+        """Set the result of a statement without result set"""
+        self.rowcount = ok_pkt.get("affected_rows", -1)
+        self.lastrowid = ok_pkt.get("insert_id")
+        self.warning_count = ok_pkt.get("warning_count", 0)
+        self._done = True
+
+    def _set_rows(
+        self,
+        columns: List[DescriptionType],
+        rows: List[RowType],
+        eof: Optional[EofPacketType],
+    ) -> None:
+        """Set the result set of a statement"""
+        self.description = columns
+        self._rows = rows
+        self.rowcount = len(rows)
+        if eof is not None:
+            self.warning_count = eof.get("warning_count", 0)
+        self._done = True
+
+    def _set_error(self, err: Error) -> None:
+        """Set the error the statement failed with"""
+        self._error = err
+        self._done = True
+
+    def done(self) -> bool:
+        """Returns whether the statement was executed, or failed"""
+        return self._done
+
+    def exception(self) -> Optional[Error]:
+        """Returns the error the statement failed with, or None
+
+        Raises InterfaceError when the pipeline was not synced yet.
+        """
+        if not self._done:
+            raise InterfaceError("Pipeline was not synced yet")
+        return self._error
+
+    def result(self) -> List[RowType]:
+        """Returns the rows of the result set
+
+        Statements without result set give an empty list. The error of
+        a failed statement is raised.
+
+        Raises InterfaceError when the pipeline was not synced yet.
+        """
+        if self.exception() is not None:
+            raise self._error
+        return self._rows
+
+    @property
+    def column_names(self) -> List[str]:
+        """Returns the column names of the result set"""
+        if not self.description:
+            return []
+        return [column[0] for column in self.description]
+
+
+class _PipelineRequest:
+    """Command queued in a pipeline"""
+
+    __slots__ = (
+        "command",
+        "packet",
+        "statement_id",
+        "result",
+        "sent",
+        "prepared",
+        "params",
+    )
+
+    def __init__(
+        self,
+        command: int,
+        packet: Optional[bytes],
+        result: PipelineResult,
+        statement_id: Optional[int] = None,
+        prepared: Optional[Mapping[str, Any]] = None,
+        params: Sequence[Any] = (),
+    ) -> None:
+        self.command = command
+        # None for prepared statements until the request is sent
+        self.packet = packet
+        self.result = result
+        # prepared statement to deallocate once executed
+        self.statement_id = statement_id
+        self.sent: float = 0.0
+        self.prepared = prepared
+        self.params = params
+
+
+class MySQLPipeline:
+    """Pipeline of statements executed over one connection
+
+    Statements are queued by `execute()` and sent by `sync()` back to back,
+    without waiting for the response to each of them, which are read in
+    order afterwards. This saves a round trip per statement.
+
+    Prepared statements are prepared when queued, which takes a round trip
+    unless the statement is found in the prepared statement cache. Their
+    parameters are packed when sent.
+
+    Used as a context manager, the pipeline is synced when leaving the
+    block, and discarded if an exception was raised.
+    """
+
+    def __init__(self, connection: MySQLConnection) -> None:
+        self._connection = connection
+        self._cursor = MySQLCursor(connection)
+        self._queue: List[_PipelineRequest] = []
+
+    def __enter__(self) -> MySQLPipeline:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]] = None,
+        exc_value: Optional[BaseException] = None,
+        traceback: Optional[TracebackType] = None,
+    ) -> None:
+        if exc_type is None:
+            self.sync()
+        else:
+            self.discard()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def execute(
+        self,
+        operation: StrOrBytes,
+        params: Optional[ParamsSequenceOrDictType] = None,
+        prepared: bool = False,
+    ) -> PipelineResult:
+        """Queue a statement
+
+        Parameters are substituted the way `MySQLCursor.execute()` does,
+        or sent using the binary protocol when `prepared` is True, in which
+        case they must be a sequence.
+
+        Returns:
+            PipelineResult: The result of the statement, set by `sync()`.
+
+        Raises:
+            ProgrammingError: When the parameters don't match the statement.
+                              For prepared statements, parameters which can't
+                              be sent with the binary protocol are reported
+                              in the result instead.
+            NotSupportedError: For LOAD DATA LOCAL statements, which need the
+                               file to be sent before the next statements.
+        """
+        cnx = self._connection
+        if isinstance(operation, str):
+            try:
+                stmt = operation.encode(cnx.python_charset)
+            except UnicodeEncodeError as err:
+                raise ProgrammingError(str(err)) from err
+        else:
+            stmt = bytes(operation)
+
+        if statement_keyword(stmt) == b"LOAD" and RE_LOAD_LOCAL.search(stmt):
+            raise NotSupportedError("LOAD DATA LOCAL can't be pipelined")
+
+        if not prepared:
+            if params:
+                # pylint: disable=protected-access
+                stmt = self._cursor._substitute_params(stmt, params)
+            request = _PipelineRequest(
+                ServerCmd.QUERY, cnx._make_query_packet(stmt), PipelineResult(stmt)
+            )
+        else:
+            request = self._prepare(stmt, params or ())
+        self._queue.append(request)
+        return request.result
+
+    def _prepare(self, stmt: bytes, params: Any) -> _PipelineRequest:
+        """Prepare a statement and make the request executing it"""
+        cnx = self._connection
+        if not isinstance(params, (tuple, list)):
+            raise ProgrammingError(
+                errno=1210,
+                msg=f"Incorrect type of argument: {type(params).__name__}({params})"
+                ", it must be of type tuple or list the argument given to "
+                "the prepared statement",
+            )
+        if any(isinstance(param, IOBase) for param in params):
+            raise NotSupportedError("Streaming parameters can't be pipelined")
+
+        if b"%s" in stmt:
+            # Convert %s to ? before sending it to MySQL
+            stmt = re.sub(RE_SQL_FIND_PARAM, b"?", stmt)
+        statement_id = None
+        if cnx.prepared_statement_cache is not None:
+            prepared = cnx.get_prepared_statement(stmt)
+        else:
+            prepared = cnx.cmd_stmt_prepare(stmt)
+            statement_id = prepared["statement_id"]
+
+        if len(prepared["parameters"]) != len(params):
+            if statement_id is not None:
+                cnx.cmd_stmt_close(statement_id)
+            raise ProgrammingError(
+                errno=1210,
+                msg="Incorrect number of arguments executing prepared statement",
+            )
+        # the execute packet is made when sent, as making it records the
+        # parameter types as bound on the server
+        return _PipelineRequest(
+            ServerCmd.STMT_EXECUTE,
+            None,
+            PipelineResult(stmt),
+            statement_id,
+            prepared,
+            params,
+        )
+
+    def _make_packet(self, request: _PipelineRequest) -> bool:
+        """Make the packet of a request about to be sent
+
+        Returns False, with the error set on the result, when the
+        parameters can't be packed.
+        """
+        if request.packet is None:
+            try:
+                # pylint: disable=protected-access
+                request.packet = self._connection._make_stmt_execute_packet(
+                    request.prepared["statement_id"],
+                    request.params,
+                    request.prepared["parameters"],
+                )
+            except Error as err:
+                request.result._set_error(err)
+                return False
+        return True
+
+    def discard(self) -> None:
+        """Drop the queued statements without executing them"""
+        queue, self._queue = self._queue, []
+        for request in queue:
+            request.result._set_error(InterfaceError("Pipeline was discarded"))
+        self._close_statements(queue)
+
+    def sync(self) -> List[PipelineResult]:
+        """Execute the queued statements and read their results
+
+        Requests are sent ahead of the responses by up to `PIPELINE_WINDOW`
+        bytes. Errors returned by the server are set on the result of the
+        failing statement. Other errors, like a lost connection, are set
+        on the results not read yet and raised; the connection is then
+        shut down, as its responses can't be matched to the requests anymore.
+
+        Returns:
+            list: The results of the statements, in order.
+        """
+        # pylint: disable=protected-access
+        queue, self._queue = self._queue, []
+        if not queue:
+            return []
+        cnx = self._connection
+        cnx.handle_unread_result()
+        sock = cnx._socket
+        if sock is None:
+            err = OperationalError("MySQL Connection not available")
+            for request in queue:
+                request.result._set_error(err)
+            raise err
+
+        pending: Deque[_PipelineRequest] = deque(queue)
+        in_flight: Deque[_PipelineRequest] = deque()
+        in_flight_size = 0
+        try:
+            while pending or in_flight:
+                while pending:
+                    if not self._make_packet(pending[0]):
+                        pending.popleft()
+                        continue
+                    if (
+                        in_flight
+                        and in_flight_size + len(pending[0].packet) > PIPELINE_WINDOW
+                    ):
+                        break
+                    request = pending.popleft()
+                    cnx._wire.commands[request.command] += 1
+                    sock.send(
+                        cnx._protocol.make_command(request.command, request.packet),
+                        0,
+                        0,
+                        cnx._write_timeout,
+                    )
+                    request.sent = time.monotonic()
+                    in_flight.append(request)
+                    in_flight_size += len(request.packet)
+                if in_flight:
+                    request = in_flight.popleft()
+                    in_flight_size -= len(request.packet)
+                    self._read_response(request)
+        except BaseException as err:
+            if in_flight:
+                cnx.shutdown()
+            for request in pending:
+                if request.prepared is not None and request.packet is not None:
+                    # made but not sent, the server didn't bind its types
+                    cnx._protocol.forget_stmt_execute_plan(
+                        request.prepared["statement_id"]
+                    )
+            if isinstance(err, Error):
+                for request in chain(in_flight, pending):
+                    request.result._set_error(err)
+            raise
+        finally:
+            self._close_statements(queue)
+        return [request.result for request in queue]
+
+    def _read_response(self, request: _PipelineRequest) -> None:
+        """Read the response to a request and set its result"""
+        # pylint: disable=protected-access
+        cnx = self._connection
+        result = request.result
+        packet = cnx._socket.recv(cnx._read_timeout)
+        if cnx._command_hook is not None:
+            cnx._command_hook(
+                request.command, request.packet, time.monotonic() - request.sent
+            )
+        try:
+            self._read_result(request, packet, result)
+            while cnx._have_next_result:
+                next_result = PipelineResult(result.statement)
+                result.next_results.append(next_result)
+                self._read_result(
+                    request, cnx._socket.recv(cnx._read_timeout), next_result
+                )
+        except Error as err:
+            if err.sqlstate is None:
+                # not sent by the server, the connection is to blame
+                raise
+            cnx._have_next_result = False
+            result._set_error(err)
+            return
+        if cnx._query_cache is not None:
+            cnx._update_query_cache(result.statement)
+
+    def _read_result(
+        self, request: _PipelineRequest, packet: bytes, result: PipelineResult
+    ) -> None:
+        """Read one result of a request"""
+        # pylint: disable=protected-access
+        cnx = self._connection
+        if packet[4] == ERR_STATUS:
+            raise get_exception(packet)
+        if request.command == ServerCmd.STMT_EXECUTE:
+            res = cnx._handle_binary_result(packet)
+            if isinstance(res, dict):
+                result._set_ok(res)
+                return
+            columns = res[1]
+            cnx.unread_result = True
+            rows, eof = cnx.get_rows(binary=True, columns=columns)
+        else:
+            res = cnx._handle_result(packet)
+            if "columns" not in res:
+                result._set_ok(res)
+                return
+            columns = res["columns"]
+            rows, eof = cnx.get_rows()
+        result._set_rows(columns, rows, eof)
+
+    def _close_statements(self, queue: List[_PipelineRequest]) -> None:
+        """Deallocate the prepared statements not kept in the cache"""
+        for request in queue:
+            if request.statement_id is not None:
+                try:
+                    self._connection.cmd_stmt_close(request.statement_id)
+                except Error:
+                    # We tried to deallocate, but it's OK when we fail.
+                    pass
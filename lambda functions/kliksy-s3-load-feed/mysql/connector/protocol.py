@@ -53,6 +53,8 @@ from .constants import (
     FieldFlag,
     FieldType,
     ServerCmd,
+    ServerFlag,
+    SessionTrackType,
 )
 from .conversion import MySQLConverter
 from .errors import DatabaseError, InterfaceError, ProgrammingError, get_exception
@@ -84,6 +86,65 @@ LOCAL_INFILE_STATUS = 0xFB
 DEFAULT_CHARSET_ID = 45
 DEFAULT_MAX_ALLOWED_PACKET = 1073741824
 
+# Kinds of column decoding steps used by binary result row plans
+BINARY_FIXED = 0
+BINARY_DECIMAL = 1
+BINARY_TIMESTAMP = 2
+BINARY_TIME = 3
+BINARY_VECTOR = 4
+BINARY_BYTES = 5
+BINARY_STRING = 6
+
+BINARY_FIXED_FORMATS = {
+    FieldType.TINY: "b",
+    FieldType.SHORT: "h",
+    FieldType.INT24: "i",
+    FieldType.LONG: "i",
+    FieldType.LONGLONG: "q",
+    FieldType.FLOAT: "f",
+    FieldType.DOUBLE: "d",
+}
+"""Struct format characters of the fixed-width binary protocol types."""
+
+STRUCT_LONGLONG = struct.Struct("<q")
+STRUCT_ULONGLONG = struct.Struct("<Q")
+STRUCT_DOUBLE = struct.Struct("<d")
+STRUCT_DATE = struct.Struct("<HBB")
+STRUCT_DATETIME = struct.Struct("<HBBBBB")
+STRUCT_TIME = struct.Struct("<BIBBB")
+STRUCT_UINT = struct.Struct("<I")
+
+BINARY_PARAM_TYPES: Dict[Any, Tuple[int, int]] = {
+    "q": (FieldType.LONGLONG, 0),
+    "Q": (FieldType.LONGLONG, 128),
+    float: (FieldType.DOUBLE, 0),
+    str: (FieldType.STRING, 0),
+    bytes: (FieldType.STRING, 0),
+    Decimal: (FieldType.DECIMAL, 0),
+    datetime.datetime: (FieldType.DATETIME, 0),
+    datetime.date: (FieldType.DATE, 0),
+    datetime.timedelta: (FieldType.TIME, 0),
+    datetime.time: (FieldType.TIME, 0),
+    type(None): (FieldType.NULL, 0),
+}
+"""Field type and flags sent for each kind of prepared statement parameter.
+
+Integers are keyed by the struct format used to pack them."""
+
+MIN_BINARY_INTEGER = -(2**63)
+MAX_BINARY_INTEGER = 2**64 - 1
+
+
+def _pack_lenenc_str(value: str, charset: str) -> bytes:
+    """Pack a string parameter as a length-encoded string, encoding it once"""
+    data = value.encode(charset)
+    return utils.lc_int(len(data)) + data
+
+
+def _pack_lenenc_decimal(value: Decimal, charset: str) -> bytes:
+    """Pack a Decimal parameter as a length-encoded string"""
+    return _pack_lenenc_str(str(value), charset)
+
 
 class MySQLProtocol:
     """Implements MySQL client/server protocol
@@ -91,6 +152,11 @@ class MySQLProtocol:
     Create and parses MySQL packets.
     """
 
+    _binary_row_fields: Optional[List[DescriptionType]] = None
+    _binary_row_plan: List[Tuple[int, int, Any]] = []
+    _stmt_execute_plans: Optional[Dict[int, Tuple[Any, ...]]] = None
+    _stmt_execute_buffer: Optional[bytearray] = None
+
     @staticmethod
     def parse_auth_more_data(pkt: bytes) -> bytes:
         """Parse a MySQL auth more data packet.
@@ -517,10 +583,52 @@ class MySQLProtocol:
             if packet:
                 packet, ok_packet["info_msg"] = utils.read_lc_string(packet)
                 ok_packet["info_msg"] = ok_packet["info_msg"].decode("utf-8")
-        except ValueError as err:
+            if (
+                packet
+                and ok_packet["status_flag"] & ServerFlag.SERVER_SESSION_STATE_CHANGED
+            ):
+                packet, session_state = utils.read_lc_string(packet)
+                ok_packet["session_state"] = MySQLProtocol.parse_session_state(
+                    session_state
+                )
+        except (IndexError, ValueError) as err:
             raise InterfaceError("Failed parsing OK packet.") from err
         return ok_packet
 
+    @staticmethod
+    def parse_session_state(data: bytes) -> Dict[str, Any]:
+        """Parse the session state changes found in a MySQL OK-packet
+
+        Changed system variables are returned in a dictionary under the key
+        `system_variables`. The other changes use the lowercase name of their
+        type in `constants.SessionTrackType` as key.
+
+        Returns a dict()
+        """
+        state: Dict[str, Any] = {}
+        while data:
+            track_type = data[0]
+            data, entry = utils.read_lc_string(data[1:])
+            if track_type == SessionTrackType.SYSTEM_VARIABLES:
+                entry, name = utils.read_lc_string(entry)
+                value = utils.read_lc_string(entry)[1]
+                state.setdefault("system_variables", {})[name.decode("utf-8")] = (
+                    value.decode("utf-8") if value is not None else None
+                )
+            elif track_type == SessionTrackType.STATE_CHANGE:
+                state["state_change"] = utils.read_lc_string(entry)[1] == b"1"
+            elif track_type == SessionTrackType.GTIDS:
+                # skip the encoding specification
+                state["gtids"] = utils.read_lc_string(entry[1:])[1].decode("utf-8")
+            elif track_type in (
+                SessionTrackType.SCHEMA,
+                SessionTrackType.TRANSACTION_CHARACTERISTICS,
+                SessionTrackType.TRANSACTION_STATE,
+            ):
+                key = SessionTrackType.get_info(track_type)
+                state[key.lower()] = utils.read_lc_string(entry)[1].decode("utf-8")
+        return state
+
     @staticmethod
     def parse_column_count(packet: bytes) -> Optional[int]:
         """Parse a MySQL packet with the number of columns in result set"""
@@ -763,61 +871,178 @@ class MySQLProtocol:
 
         return (packet[length + 1 :], tmp)
 
-    def _parse_binary_values(
-        self,
+    @staticmethod
+    def _compile_binary_row_plan(
         fields: List[DescriptionType],
-        packet: bytes,
-        charset: str = "utf-8",
-    ) -> Tuple[BinaryProtocolType, ...]:
-        """Parse values from a binary result packet"""
-        null_bitmap_length = (len(fields) + 7 + 2) // 8
-        null_bitmap = [int(i) for i in packet[0:null_bitmap_length]]
-        packet = packet[null_bitmap_length:]
+    ) -> List[Tuple[int, int, Any]]:
+        """Compile the decoding plan of binary result rows
+
+        The plan holds one step per column, except that consecutive
+        fixed-width columns are merged into a single step decoded with one
+        precompiled struct. Each step is a tuple holding the kind of step,
+        the mask of the step columns in the NULL bitmap and an argument
+        depending on the kind of step.
+
+        Returns a list.
+        """
+        plan: List[Tuple[int, int, Any]] = []
+        run: List[Tuple[int, str]] = []
+
+        def flush_run() -> None:
+            if not run:
+                return
+            mask = 0
+            for pos, _ in run:
+                mask |= 1 << pos
+            columns = [(1 << pos, struct.Struct(f"<{fmt}")) for pos, fmt in run]
+            run_struct = struct.Struct("<" + "".join(fmt for _, fmt in run))
+            plan.append((BINARY_FIXED, mask, (run_struct, columns)))
+            run.clear()
 
-        values: List[Any] = []
-        value: BinaryProtocolType = None
         for pos, field in enumerate(fields):
-            if null_bitmap[int((pos + 2) / 8)] & (1 << (pos + 2) % 8):
-                values.append(None)
+            fmt = BINARY_FIXED_FORMATS.get(field[1])
+            if fmt is not None:
+                if fmt in "bhiq" and field[7] & FieldFlag.UNSIGNED:
+                    fmt = fmt.upper()
+                run.append((pos, fmt))
                 continue
-            if field[1] in (
-                FieldType.TINY,
-                FieldType.SHORT,
-                FieldType.INT24,
-                FieldType.LONG,
-                FieldType.LONGLONG,
-            ):
-                packet, value = self._parse_binary_integer(packet, field)
-                values.append(value)
-            elif field[1] in (FieldType.DOUBLE, FieldType.FLOAT):
-                packet, value = self._parse_binary_float(packet, field)
-                values.append(value)
-            elif field[1] in (FieldType.DECIMAL, FieldType.NEWDECIMAL):
-                packet, value = self._parse_binary_new_decimal(packet, charset)
-                values.append(value)
+            flush_run()
+            if field[1] in (FieldType.DECIMAL, FieldType.NEWDECIMAL):
+                step = (BINARY_DECIMAL, None)
             elif field[1] in (
                 FieldType.DATETIME,
                 FieldType.DATE,
                 FieldType.TIMESTAMP,
             ):
-                (packet, value) = self._parse_binary_timestamp(packet, field[1])
-                values.append(value)
+                step = (BINARY_TIMESTAMP, field[1] != FieldType.DATE)
             elif field[1] == FieldType.TIME:
-                (packet, value) = self._parse_binary_time(packet)
-                values.append(value)
+                step = (BINARY_TIME, None)
             elif field[1] == FieldType.VECTOR:
-                # pylint: disable=protected-access
-                (packet, value) = utils.read_lc_string(packet)
-                values.append(MySQLConverter._vector_to_python(value))
+                step = (BINARY_VECTOR, None)
             elif field[7] == FieldFlag.BINARY or field[8] == 63:  # "binary" charset
-                (packet, value) = utils.read_lc_string(packet)
+                step = (BINARY_BYTES, None)
+            else:
+                step = (BINARY_STRING, None)
+            plan.append((step[0], 1 << pos, step[1]))
+        flush_run()
+        return plan
+
+    def _parse_binary_values(
+        self,
+        fields: List[DescriptionType],
+        packet: bytes,
+        charset: str = "utf-8",
+    ) -> Tuple[BinaryProtocolType, ...]:
+        """Parse values from a binary result packet
+
+        The decoding plan is compiled once per list of fields and reused
+        for the following rows.
+        """
+        if self._binary_row_fields is not fields:
+            self._binary_row_plan = self._compile_binary_row_plan(fields)
+            self._binary_row_fields = fields
+
+        buf = memoryview(packet)
+        null_bitmap_length = (len(fields) + 7 + 2) // 8
+        # The first two bits of the NULL bitmap are reserved
+        nulls = int.from_bytes(buf[:null_bitmap_length], "little") >> 2
+        offset = null_bitmap_length
+
+        values: List[Any] = []
+        for kind, mask, arg in self._binary_row_plan:
+            if kind == BINARY_FIXED:
+                run_struct, columns = arg
+                if not nulls & mask:
+                    values.extend(run_struct.unpack_from(buf, offset))
+                    offset += run_struct.size
+                    continue
+                for column_mask, column_struct in columns:
+                    if nulls & column_mask:
+                        values.append(None)
+                    else:
+                        values.append(column_struct.unpack_from(buf, offset)[0])
+                        offset += column_struct.size
+                continue
+            if nulls & mask:
+                values.append(None)
+                continue
+
+            if kind == BINARY_TIMESTAMP:
+                length = buf[offset]
+                value: BinaryProtocolType = None
+                if length == 4:
+                    year, month, day = STRUCT_DATE.unpack_from(buf, offset + 1)
+                    if arg:
+                        value = datetime.datetime(year, month, day)
+                    else:
+                        value = datetime.date(year, month, day)
+                elif length >= 7:
+                    mcs = 0
+                    if length == 11:
+                        mcs = STRUCT_UINT.unpack_from(buf, offset + 8)[0]
+                    value = datetime.datetime(
+                        *STRUCT_DATETIME.unpack_from(buf, offset + 1),
+                        microsecond=mcs,
+                    )
                 values.append(value)
+                offset += length + 1
+                continue
+            if kind == BINARY_TIME:
+                length = buf[offset]
+                if not length:
+                    values.append(datetime.timedelta())
+                    offset += 1
+                    continue
+                negative, days, hours, minutes, seconds = STRUCT_TIME.unpack_from(
+                    buf, offset + 1
+                )
+                mcs = 0
+                if length > 8:
+                    mcs = STRUCT_UINT.unpack_from(buf, offset + 9)[0]
+                values.append(
+                    datetime.timedelta(
+                        days=-days if negative == 1 else days,
+                        seconds=seconds,
+                        microseconds=mcs,
+                        minutes=minutes,
+                        hours=hours,
+                    )
+                )
+                offset += length + 1
+                continue
+
+            # Length-coded string
+            length = buf[offset]
+            if length < 251:
+                offset += 1
+            elif length == 251:
+                values.append(None)
+                offset += 1
+                continue
+            elif length == 252:
+                length = buf[offset + 1] | buf[offset + 2] << 8
+                offset += 3
+            elif length == 253:
+                length = buf[offset + 1] | buf[offset + 2] << 8 | buf[offset + 3] << 16
+                offset += 4
             else:
-                (packet, value) = utils.read_lc_string(packet)
+                length = int.from_bytes(buf[offset + 1 : offset + 9], "little")
+                offset += 9
+            data = buf[offset : offset + length]
+            offset += length
+
+            if kind == BINARY_STRING:
                 try:
-                    values.append(value.decode(charset))
+                    values.append(str(data, charset))
                 except UnicodeDecodeError:
-                    values.append(value)
+                    values.append(data.tobytes())
+            elif kind == BINARY_BYTES:
+                values.append(data.tobytes())
+            elif kind == BINARY_DECIMAL:
+                values.append(Decimal(str(data, charset)))
+            else:
+                # pylint: disable=protected-access
+                values.append(MySQLConverter._vector_to_python(data.tobytes()))
 
         return tuple(values)
 
@@ -845,13 +1070,15 @@ class MySQLProtocol:
                 break
             if i == count:
                 break
-            packet = bytes(sock.recv(read_timeout))
+            packet = sock.recv(read_timeout)
             if packet[4] == 254:
                 eof = self.parse_eof(packet)
                 values = None
             elif packet[4] == 0:
                 eof = None
-                values = self._parse_binary_values(columns, packet[5:], charset)
+                values = self._parse_binary_values(
+                    columns, memoryview(packet)[5:], charset
+                )
             if eof is None and values is not None:
                 rows.append(values)
             elif eof is None and values is None:
@@ -880,6 +1107,10 @@ class MySQLProtocol:
     @staticmethod
     def prepare_binary_integer(value: int) -> Tuple[bytes, int, int]:
         """Prepare an integer for the MySQL binary protocol"""
+        if not MIN_BINARY_INTEGER <= value <= MAX_BINARY_INTEGER:
+            raise ProgrammingError(
+                f"Integer {value} is out of the range of MySQL BIGINT values"
+            )
         field_type = None
         flags = 0
         if value < 0:
@@ -1018,6 +1249,120 @@ class MySQLProtocol:
         """
         return b"".join([utils.int4store(statement), utils.int2store(param), data])
 
+    def _compile_stmt_execute_plan(
+        self, signature: Tuple[Any, ...], with_parameter_count: bool
+    ) -> Tuple[Any, ...]:
+        """Compile the packing plan of statement parameters
+
+        The plan depends only on the type signature of the parameters. It
+        holds the signature, the block sent before the values when the
+        parameter types have to be bound, the same block when the types
+        bound by a previous execution are reused, and one packing function
+        per parameter (None for NULL values).
+
+        Returns a tuple.
+        """
+        null_bitmap = bytearray((len(signature) + 7) // 8)
+        types = bytearray()
+        packers: List[Optional[Any]] = []
+        for pos, kind in enumerate(signature):
+            field_type, flags = BINARY_PARAM_TYPES[kind]
+            types.append(field_type)
+            types.append(flags)
+            if with_parameter_count:
+                # Empty parameter name
+                types.append(0)
+
+            if kind is type(None):
+                null_bitmap[pos // 8] |= 1 << (pos % 8)
+                packers.append(None)
+            elif kind == "q":
+                packers.append(lambda value, _: STRUCT_LONGLONG.pack(value))
+            elif kind == "Q":
+                packers.append(lambda value, _: STRUCT_ULONGLONG.pack(value))
+            elif kind is float:
+                packers.append(lambda value, _: STRUCT_DOUBLE.pack(value))
+            elif kind is str:
+                packers.append(_pack_lenenc_str)
+            elif kind is bytes:
+                packers.append(lambda value, _: utils.lc_int(len(value)) + value)
+            elif kind is Decimal:
+                packers.append(_pack_lenenc_decimal)
+            elif field_type == FieldType.TIME:
+                packers.append(lambda value, _: self.prepare_binary_time(value)[0])
+            else:
+                packers.append(lambda value, _: self.prepare_binary_timestamp(value)[0])
+
+        prefix = utils.lc_int(len(signature)) if with_parameter_count else b""
+        prefix += bytes(null_bitmap)
+        return (signature, prefix + b"\x01" + bytes(types), prefix + b"\x00", packers)
+
+    def _make_planned_stmt_execute(
+        self,
+        statement_id: int,
+        data: Sequence[BinaryProtocolType],
+        flags: int,
+        charset: str,
+        with_parameter_count: bool,
+    ) -> Optional[bytes]:
+        """Make a Statement Execute packet using a cached packing plan
+
+        Plans are cached per statement and type signature of the
+        parameters. When the signature is the same as in the previous
+        execution of the statement, the parameter types are not sent again
+        and the server reuses the ones it has bound.
+
+        Returns None when a parameter type is not supported by plans.
+        """
+        signature: List[Any] = []
+        for value in data:
+            value_type = type(value)
+            if value_type is int or value_type is bool:
+                if not MIN_BINARY_INTEGER <= value <= MAX_BINARY_INTEGER:
+                    raise ProgrammingError(
+                        f"Integer {value} is out of the range of MySQL BIGINT values"
+                    )
+                signature.append("q" if value <= 9223372036854775807 else "Q")
+            elif value_type in BINARY_PARAM_TYPES:
+                signature.append(value_type)
+            else:
+                return None
+
+        if self._stmt_execute_plans is None:
+            self._stmt_execute_plans = {}
+            self._stmt_execute_buffer = bytearray()
+        plan = self._stmt_execute_plans.get(statement_id)
+        new_params_bound = plan is None or plan[0] != tuple(signature)
+        if new_params_bound:
+            plan = self._compile_stmt_execute_plan(
+                tuple(signature), with_parameter_count
+            )
+            self._stmt_execute_plans[statement_id] = plan
+
+        buf = self._stmt_execute_buffer
+        buf.clear()
+        buf += utils.int4store(statement_id)
+        buf.append(flags)
+        buf += b"\x01\x00\x00\x00"  # iteration count
+        buf += plan[1] if new_params_bound else plan[2]
+        for pack, value in zip(plan[3], data):
+            if pack is not None:
+                buf += pack(value, charset)
+        return bytes(buf)
+
+    def forget_stmt_execute_plan(self, statement_id: Optional[int] = None) -> None:
+        """Forget the parameter packing plan of a statement
+
+        Must be called when the statement is deallocated. When no
+        statement ID is given, the plans of all statements are forgotten.
+        """
+        if self._stmt_execute_plans is None:
+            return
+        if statement_id is None:
+            self._stmt_execute_plans.clear()
+        else:
+            self._stmt_execute_plans.pop(statement_id, None)
+
     def make_stmt_execute(
         self,
         statement_id: int,
@@ -1045,6 +1390,21 @@ class MySQLProtocol:
         if long_data_used is None:
             long_data_used = {}
 
+        if data and not query_attrs and not long_data_used:
+            if data_len != len(parameters):
+                raise InterfaceError(
+                    "Failed executing prepared statement: data values does not"
+                    " match number of parameters"
+                )
+            packet = self._make_planned_stmt_execute(
+                statement_id, data, flags, charset, query_attrs is not None
+            )
+            if packet is not None:
+                return packet
+
+        # The types sent below replace the ones bound by a planned execution
+        self.forget_stmt_execute_plan(statement_id)
+
         if query_attrs:
             data = list(data)
             for _, attr_val in query_attrs:
@@ -0,0 +1,324 @@
+# Copyright (c) 2025, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0, as
+# published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms,
+# as designated in a particular file or component or in included license
+# documentation. The authors of MySQL hereby grant you an
+# additional permission to link the program and your derivative works
+# with the separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# Without limiting anything contained in the foregoing, this file,
+# which is part of MySQL Connector/Python, is also subject to the
+# Universal FOSS Exception, version 1.0, a copy of which can be found at
+# http://oss.oracle.com/licenses/universal-foss-exception.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301  USA
+
+
+"""Caching the results of read-only queries on the client side."""
+from __future__ import annotations
+
+import re
+import threading
+import time
+
+from collections import OrderedDict
+from functools import lru_cache, wraps
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+from .types import DescriptionType, RowType
+
+DEFAULT_QUERY_CACHE_SIZE = 16 * 1024 * 1024  # 16 MB
+DEFAULT_QUERY_CACHE_TTL = 5.0
+
+# Statements longer than this are analyzed each time they are executed
+MEMOIZED_STATEMENT_LENGTH = 4096
+
+# Bytes accounted for each row and value on top of the data
+ROW_OVERHEAD = 64
+VALUE_OVERHEAD = 16
+
+# Leading keywords of statements which don't change any table
+READ_ONLY_KEYWORDS = frozenset(
+    (b"SELECT", b"SHOW", b"DESCRIBE", b"DESC", b"EXPLAIN", b"SET", b"DO", b"HELP")
+)
+# Leading keywords of statements which don't change any table, but may end
+# or start a transaction
+TRANSACTION_KEYWORDS = frozenset(
+    (b"BEGIN", b"START", b"COMMIT", b"ROLLBACK", b"SAVEPOINT", b"RELEASE")
+)
+
+RE_SQL_COMMENTS = re.compile(rb"/\*.*?\*/|(?:--\s|#)[^\n]*", re.S)
+RE_SQL_KEYWORD = re.compile(rb"[\s(]*(\w+)")
+RE_SQL_USE = re.compile(rb"\s*USE\s+`?([^`;\s]+)`?", re.I)
+RE_SQL_TABLE_REFS = re.compile(
+    rb"\b(?:FROM|JOIN|INTO|UPDATE|TABLE)\s+"
+    rb"((?:`[^`]+`|[\w$]+)(?:\s*\.\s*(?:`[^`]+`|[\w$]+))?"
+    rb"(?:\s+(?:AS\s+)?[\w$]+)?"
+    rb"(?:\s*,\s*(?:`[^`]+`|[\w$]+)(?:\s*\.\s*(?:`[^`]+`|[\w$]+))?"
+    rb"(?:\s+(?:AS\s+)?[\w$]+)?)*)",
+    re.I,
+)
+RE_SQL_TABLE_NAME = re.compile(
+    rb"\s*((?:`[^`]+`|[\w$]+)(?:\s*\.\s*(?:`[^`]+`|[\w$]+))?)"
+)
+# String literals and comments, replaced before looking for variables
+RE_SQL_LITERALS_AND_COMMENTS = re.compile(
+    rb"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.|\"\")*\""
+    rb"|/\*.*?\*/|(?:--\s|#)[^\n]*",
+    re.S,
+)
+# User and system variables, and statement separators, outside of literals
+RE_SQL_VARIABLE_OR_SEPARATOR = re.compile(rb"@|;")
+# Constructs making the result of a SELECT depend on more than the tables,
+# searched in the whole statement, literals and comments included, so that
+# they are never missed
+RE_SQL_UNCACHEABLE = re.compile(
+    rb"\bINTO\b|\bFOR\s+(?:UPDATE|SHARE)\b|\bLOCK\s+IN\s+SHARE\s+MODE\b"
+    rb"|\bSQL_NO_CACHE\b|\b(?:CURRENT_DATE|CURRENT_TIME|CURRENT_TIMESTAMP"
+    rb"|CURRENT_USER|LOCALTIME|LOCALTIMESTAMP)\b|\b(?:NOW|CURDATE|CURTIME"
+    rb"|SYSDATE|UTC_DATE|UTC_TIME|UTC_TIMESTAMP|UNIX_TIMESTAMP|RAND|UUID"
+    rb"|UUID_SHORT|LAST_INSERT_ID|FOUND_ROWS|ROW_COUNT|CONNECTION_ID|USER"
+    rb"|SESSION_USER|SYSTEM_USER|DATABASE|SCHEMA|SLEEP|GET_LOCK|IS_FREE_LOCK"
+    rb"|IS_USED_LOCK|RELEASE_LOCK|BENCHMARK)\s*\(",
+    re.I,
+)
+
+T = TypeVar("T")
+QueryCacheEntry = Tuple[
+    float, int, List[DescriptionType], List[RowType], FrozenSet[str]
+]
+
+
+def _memoize_short_statements(func: Callable[[bytes], T]) -> Callable[[bytes], T]:
+    """Memoize the analysis of statements up to MEMOIZED_STATEMENT_LENGTH
+
+    Longer statements, like multi-row INSERTs, are rarely repeated and
+    would pin a lot of memory.
+    """
+    memoized = lru_cache(maxsize=1024)(func)
+
+    @wraps(func)
+    def wrapper(stmt: bytes) -> T:
+        if len(stmt) > MEMOIZED_STATEMENT_LENGTH:
+            return func(stmt)
+        return memoized(stmt)
+
+    return wrapper
+
+
+@_memoize_short_statements
+def statement_keyword(stmt: bytes) -> bytes:
+    """Returns the leading keyword of a statement, in upper case"""
+    match = RE_SQL_KEYWORD.match(RE_SQL_COMMENTS.sub(b" ", stmt[:1024]))
+    return match.group(1).upper() if match else b""
+
+
+@_memoize_short_statements
+def statement_tables(stmt: bytes) -> FrozenSet[str]:
+    """Returns the names of the tables a statement refers to
+
+    Names are lower case and stripped of the database name. The statement
+    is scanned for table references following FROM, JOIN, INTO, UPDATE and
+    TABLE, which may find more tables than the statement uses but not less,
+    views excepted.
+    """
+    tables = set()
+    for refs in RE_SQL_TABLE_REFS.findall(RE_SQL_COMMENTS.sub(b" ", stmt)):
+        for ref in refs.split(b","):
+            name = RE_SQL_TABLE_NAME.match(ref).group(1)
+            name = name.rsplit(b".", 1)[-1].strip().strip(b"`")
+            tables.add(name.decode("utf-8", "replace").lower())
+    return frozenset(tables)
+
+
+def _blank_literal_or_comment(match: re.Match) -> bytes:
+    """Replace a string literal by an empty one, and a comment by a space"""
+    return b"''" if match.group()[:1] in (b"'", b'"') else b" "
+
+
+@_memoize_short_statements
+def is_cacheable(stmt: bytes) -> bool:
+    """Check whether the result of a statement can be cached
+
+    Only single SELECT statements whose result depends on nothing but the
+    content of the tables are cached.
+    """
+    if statement_keyword(stmt) != b"SELECT" or RE_SQL_UNCACHEABLE.search(stmt):
+        return False
+    code = RE_SQL_LITERALS_AND_COMMENTS.sub(_blank_literal_or_comment, stmt)
+    return not RE_SQL_VARIABLE_OR_SEPARATOR.search(code.rstrip().rstrip(b";"))
+
+
+def use_statement_schema(stmt: bytes) -> Optional[str]:
+    """Returns the database selected by a USE statement"""
+    match = RE_SQL_USE.match(stmt)
+    return match.group(1).decode("utf-8") if match else None
+
+
+def _result_size(rows: List[RowType]) -> int:
+    """Estimate the memory used by the rows of a result"""
+    size = 0
+    for row in rows:
+        size += ROW_OVERHEAD
+        for value in row:
+            size += VALUE_OVERHEAD
+            if isinstance(value, (str, bytes, bytearray)):
+                size += len(value)
+    return size
+
+
+class QueryResultCache:
+    """LRU cache of the results of read-only queries
+
+    Results are kept for `ttl` seconds, the least recently used ones being
+    evicted when their estimated size exceeds `max_bytes`. Each result is
+    tagged with the tables its statement refers to, so that writes to a
+    table evict the results read from it.
+
+    A cache can be shared by the connections of a process, see the
+    `query_cache` connection option.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_QUERY_CACHE_SIZE,
+        ttl: float = DEFAULT_QUERY_CACHE_TTL,
+    ) -> None:
+        self.max_bytes: int = max_bytes
+        self.ttl: float = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.invalidations: int = 0
+        self._size: int = 0
+        self._entries: OrderedDict[Hashable, QueryCacheEntry] = OrderedDict()
+        self._tags: Dict[str, Set[Hashable]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Estimated size in bytes of the cached results"""
+        return self._size
+
+    def _remove(self, key: Hashable) -> None:
+        """Remove an entry, the lock being held"""
+        _, size, _, _, tables = self._entries.pop(key)
+        self._size -= size
+        for table in tables:
+            keys = self._tags.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[table]
+
+    def get(
+        self, key: Hashable
+    ) -> Optional[Tuple[List[DescriptionType], List[RowType]]]:
+        """Get a result and mark it as most recently used
+
+        Returns the description and the rows, or None when the result is
+        not cached or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2], entry[3]
+
+    def put(
+        self,
+        key: Hashable,
+        tables: FrozenSet[str],
+        description: List[DescriptionType],
+        rows: List[RowType],
+    ) -> None:
+        """Cache a result tagged with the tables it was read from
+
+        Results larger than the cache are not cached.
+        """
+        size = _result_size(rows)
+        if size > self.max_bytes or self.ttl <= 0:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            while self._entries and self._size + size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            self._entries[key] = (
+                time.monotonic() + self.ttl,
+                size,
+                description,
+                rows,
+                tables,
+            )
+            self._size += size
+            for table in tables:
+                self._tags.setdefault(table, set()).add(key)
+
+    def invalidate(self, *tables: str) -> int:
+        """Evict the results read from any of the given tables
+
+        All results are evicted when no table is given.
+
+        Returns the number of results evicted.
+        """
+        with self._lock:
+            if not tables:
+                keys = set(self._entries)
+            else:
+                keys = set()
+                for table in tables:
+                    keys.update(self._tags.get(table.lower(), ()))
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Evict all the results"""
+        self.invalidate()
+
+
+_SHARED_QUERY_CACHE: Optional[QueryResultCache] = None
+_SHARED_QUERY_CACHE_LOCK = threading.Lock()
+
+
+def shared_query_cache() -> QueryResultCache:
+    """Returns the cache shared by connections using query_cache=True"""
+    global _SHARED_QUERY_CACHE  # pylint: disable=global-statement
+    with _SHARED_QUERY_CACHE_LOCK:
+        if _SHARED_QUERY_CACHE is None:
+            _SHARED_QUERY_CACHE = QueryResultCache()
+        return _SHARED_QUERY_CACHE
@@ -13,6 +13,7 @@ DB_CONFIG = {
 	'password': os.environ.get('DB_PASSWORD'),
 	'database': os.environ.get('DB_NAME'),
 	'port': int(os.environ.get('DB_PORT', '3306')),
+	'fast_connect': True,
 }
 UPLOAD_BUCKET = os.environ.get('UPLOAD_BUCKET')
 MAX_FILE_BYTES = int(os.environ.get('MAX_FILE_BYTES', str(10 * 1024 * 1024)))  # default 10 MB
@@ -37,7 +38,7 @@ def _log_activity(action: str, details: str) -> None:
 	finally:
 		if 'cursor' in locals():
 			cursor.close()
-		if 'conn' in locals() and conn.is_connected():
+		if 'conn' in locals() and conn.is_alive():
 			conn.close()
 
 
@@ -171,5 +172,5 @@ def lambda_handler(event, context):
 	finally:
 		if 'cursor' in locals():
 			cursor.close()
-		if 'conn' in locals() and conn.is_connected():
+		if 'conn' in locals() and conn.is_alive():
 			conn.close()
@@ -0,0 +1,185 @@
+import asyncio
+import base64
+import uuid
+
+import mysql.connector.aio
+
+from lambda_function import (
+	DB_CONFIG,
+	MAX_FILE_BYTES,
+	UPLOAD_BUCKET,
+	_build_response,
+	_parse_body,
+	s3_client,
+)
+
+
+# mysql.connector.aio has no fast_connect option
+ASYNC_DB_CONFIG = {key: value for key, value in DB_CONFIG.items() if key != 'fast_connect'}
+POOL_CONFIG = {
+	'pool_name': 'kliksy-s3-upload',
+	'pool_size': 2,
+	'pool_min_size': 0,
+	'pool_timeout': 5,
+}
+
+# One loop for the lifetime of the execution environment, so that pooled
+# connections survive across warm invocations.
+_loop = asyncio.new_event_loop()
+_pool = None
+# concurrent first calls must not each create a pool
+_pool_lock = asyncio.Lock()
+
+
+async def _get_connection():
+	global _pool
+	if _pool is None:
+		async with _pool_lock:
+			if _pool is None:
+				pool = mysql.connector.aio.MySQLConnectionPool(**POOL_CONFIG, **ASYNC_DB_CONFIG)
+				await pool.initialize_pool()
+				_pool = pool
+	return await _pool.get_connection()
+
+
+async def _log_activity(action: str, details: str) -> None:
+	try:
+		async with await _get_connection() as conn:
+			async with await conn.cursor() as cursor:
+				await cursor.execute(
+					"INSERT INTO activity_logs (action, details) VALUES (%s, %s)",
+					(action, details),
+				)
+			await conn.commit()
+	except Exception as exc:  # noqa: BLE001
+		print(f"activity log failed: {exc}")
+
+
+async def _fetch_user(cursor, identifier: str):
+	await cursor.execute(
+		"SELECT id, email, username FROM users WHERE email=%s OR username=%s LIMIT 1",
+		(identifier, identifier),
+	)
+	return await cursor.fetchone()
+
+
+async def _store_file_to_s3(key: str, file_data: bytes, content_type: str) -> None:
+	if not UPLOAD_BUCKET:
+		raise ValueError('UPLOAD_BUCKET environment variable is not set')
+
+	if len(file_data) > MAX_FILE_BYTES:
+		raise ValueError('File exceeds maximum allowed size')
+
+	# boto3 is blocking, run it in the default thread pool
+	await asyncio.to_thread(
+		s3_client.put_object,
+		Bucket=UPLOAD_BUCKET,
+		Key=key,
+		Body=file_data,
+		ContentType=content_type,
+	)
+
+
+async def _delete_file_from_s3(key: str) -> None:
+	try:
+		await asyncio.to_thread(s3_client.delete_object, Bucket=UPLOAD_BUCKET, Key=key)
+	except Exception as exc:  # noqa: BLE001
+		print(f"S3 cleanup failed for {key}: {exc}")
+
+
+async def _handle(event):
+	body = _parse_body(event)
+	upload_payload = body.get('file') or {}
+	identifier = (body.get('email') or body.get('username') or '').strip().lower()
+	description = (body.get('description') or '').strip()
+	privacy = (body.get('privacy') or 'public').lower()
+
+	if privacy not in {'public', 'private'}:
+		return _build_response(400, {'error': 'privacy must be public or private'})
+
+	if not identifier:
+		return _build_response(400, {'error': 'email or username is required'})
+
+	encoded_data = upload_payload.get('data')
+	content_type = upload_payload.get('contentType') or 'application/octet-stream'
+	file_size_bytes = upload_payload.get('sizeBytes')
+
+	if not encoded_data:
+		return _build_response(400, {'error': 'file data is required'})
+
+	file_bytes = base64.b64decode(encoded_data)
+	if file_size_bytes is not None and int(file_size_bytes) != len(file_bytes):
+		file_size_bytes = len(file_bytes)
+
+	# The user id is not known yet when the upload starts, so the object is
+	# keyed by the meme id. Readers only use the key stored in memes.s3_key.
+	meme_id = str(uuid.uuid4())
+	file_ext = content_type.split('/')[-1] if '/' in content_type else 'bin'
+	s3_key = f"uploads/{meme_id}.{file_ext}"
+
+	async with await _get_connection() as conn:
+		async with await conn.cursor(dictionary=True) as cursor:
+			# the lookup and the upload don't depend on each other
+			user, upload_error = await asyncio.gather(
+				_fetch_user(cursor, identifier),
+				_store_file_to_s3(s3_key, file_bytes, content_type),
+				return_exceptions=True,
+			)
+			if isinstance(user, BaseException) or not user:
+				if upload_error is None:
+					await _delete_file_from_s3(s3_key)
+				if isinstance(user, BaseException):
+					raise user
+				return _build_response(404, {'error': 'User not found'})
+			if upload_error is not None:
+				raise upload_error
+
+			await cursor.execute(
+				"""
+				INSERT INTO memes (
+					id, user_id, s3_key, description, privacy, file_type, file_size_bytes
+				) VALUES (%s, %s, %s, %s, %s, %s, %s)
+				""",
+				(
+					meme_id,
+					user['id'],
+					s3_key,
+					description,
+					privacy,
+					content_type,
+					file_size_bytes or len(file_bytes),
+				),
+			)
+		await conn.commit()
+
+	await _log_activity('UPLOAD', f"user uploaded file: {user['email']} - {s3_key}")
+
+	file_url = f"https://{UPLOAD_BUCKET}.s3.amazonaws.com/{s3_key}"
+
+	return _build_response(201, {
+		'message': 'Upload successful',
+		'meme': {
+			'id': meme_id,
+			'user': {
+				'id': user['id'],
+				'email': user['email'],
+				'username': user['username'],
+			},
+			'description': description,
+			'privacy': privacy,
+			's3Key': s3_key,
+			'fileUrl': file_url,
+			'fileType': content_type,
+			'fileSizeBytes': file_size_bytes or len(file_bytes),
+		}
+	})
+
+
+def lambda_handler(event, context):
+	try:
+		return _loop.run_until_complete(_handle(event))
+	except ValueError as validation_error:
+		return _build_response(400, {'error': str(validation_error)})
+	except Exception as exc:  # noqa: BLE001
+		print(f"Error: {exc}")
+		return _build_response(500, {'error': 'Internal server error'})
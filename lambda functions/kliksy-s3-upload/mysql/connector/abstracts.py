@@ -109,6 +109,7 @@ if OTEL_ENABLED:
 
 from ._decorating import deprecated
 from .optionfiles import read_option_files
+from .query_cache import QueryResultCache, shared_query_cache
 from .tls_ciphers import UNACCEPTABLE_TLS_CIPHERSUITES, UNACCEPTABLE_TLS_VERSIONS
 from .types import (
     BinaryProtocolType,
@@ -254,15 +255,26 @@ class MySQLConnectionAbstract(ABC):
         self._converter_class: Optional[Type[MySQLConverter]] = None
         self._converter_str_fallback: bool = False
         self._compress: bool = False
+        self._compress_threshold: int = DEFAULT_CONFIGURATION["compress_threshold"]
+        self._compress_level: int = DEFAULT_CONFIGURATION["compress_level"]
 
         self._consume_results: bool = False
         self._init_command: Optional[str] = None
+        self._prepared_statement_cache_size: int = DEFAULT_CONFIGURATION[
+            "prepared_statement_cache_size"
+        ]
+        self._fast_connect: bool = DEFAULT_CONFIGURATION["fast_connect"]
+        self._max_allowed_packet: Optional[int] = None
+        self._query_cache: Optional[QueryResultCache] = None
         self._character_set: CharacterSet = CharacterSet()
 
         self._local_infile_filenames: Optional[Deque[str]] = None
         """Stores the filenames from `LOCAL INFILE` requests
         found in the executed query."""
 
+        self._local_infiles: Dict[str, Any] = {}
+        """Virtual files registered for `LOCAL INFILE` requests."""
+
         self._query: Optional[bytes] = None
         """The query being processed."""
 
@@ -717,6 +729,43 @@ class MySQLConnectionAbstract(ABC):
             self._init_command = config["init_command"]
             del config["init_command"]
 
+        if "prepared_statement_cache_size" in config:
+            cache_size = config.pop("prepared_statement_cache_size")
+            if not isinstance(cache_size, int) or cache_size < 0:
+                raise InterfaceError(
+                    "prepared_statement_cache_size must be a non-negative integer"
+                )
+            self._prepared_statement_cache_size = cache_size
+
+        if "fast_connect" in config:
+            fast_connect = config.pop("fast_connect")
+            if not isinstance(fast_connect, bool):
+                raise InterfaceError("fast_connect must be a boolean")
+            self._fast_connect = fast_connect
+
+        if "query_cache" in config:
+            query_cache = config.pop("query_cache")
+            if isinstance(query_cache, QueryResultCache):
+                self._query_cache = query_cache
+            elif isinstance(query_cache, bool):
+                self._query_cache = shared_query_cache() if query_cache else None
+            else:
+                raise InterfaceError(
+                    "query_cache must be a boolean or a QueryResultCache"
+                )
+
+        if "compress_threshold" in config:
+            threshold = config.pop("compress_threshold")
+            if not isinstance(threshold, int) or threshold < 0:
+                raise InterfaceError("compress_threshold must be a non-negative integer")
+            self._compress_threshold = threshold
+
+        if "compress_level" in config:
+            level = config.pop("compress_level")
+            if not isinstance(level, int) or not -1 <= level <= 9:
+                raise InterfaceError("compress_level must be an integer from -1 to 9")
+            self._compress_level = level
+
         # Other configuration
         set_ssl_flag = False
         for key, value in config.items():
@@ -1166,6 +1215,18 @@ class MySQLConnectionAbstract(ABC):
             row: A tuple (RowType).
         """
 
+    @property
+    def max_allowed_packet(self) -> int:
+        """Returns the largest packet the server accepts, in bytes.
+
+        The value is queried once per connection.
+        """
+        if self._max_allowed_packet is None:
+            self._max_allowed_packet = int(
+                self.info_query("SELECT @@session.max_allowed_packet")[0]
+            )
+        return self._max_allowed_packet
+
     def set_login(
         self, username: Optional[str] = None, password: Optional[str] = None
     ) -> None:
@@ -1546,22 +1607,64 @@ class MySQLConnectionAbstract(ABC):
     def _open_connection(self) -> None:
         """Opens the connection to the MySQL server."""
 
-    def _post_connection(self) -> None:
+    def _post_connection(self, session_charset_id: Optional[int] = None) -> None:
         """Executes commands after connection has been established.
 
         This method executes commands after the connection has been
         established. Some setting like autocommit, character set, and SQL mode
         are set using this method.
-        """
-        self.set_charset_collation(charset=self._charset_id)
-        self.autocommit = self._autocommit
-        if self._time_zone:
-            self.time_zone = self._time_zone
-        if self._sql_mode:
-            self.sql_mode = self._sql_mode
+
+        In fast-connect mode, the character set isn't set again when it is the
+        one already in effect for the session, and the other settings are sent
+        in a single `SET` statement.
+
+        Args:
+            session_charset_id: ID of the character set already in effect for
+                                the session, if known.
+        """
+        self._max_allowed_packet = None
+        if self._fast_connect and session_charset_id == self._charset_id:
+            if self.converter:
+                self.converter.set_charset(
+                    self.charset, character_set=self._character_set
+                )
+        else:
+            self.set_charset_collation(charset=self._charset_id)
+        assignments = self._session_tracking_setup()
+        if self._fast_connect:
+            sql_mode = self._sql_mode
+            if isinstance(sql_mode, (list, tuple)):
+                sql_mode = ",".join(sql_mode)
+            for name, value in (("time_zone", self._time_zone), ("sql_mode", sql_mode)):
+                if value:
+                    target = f"@@session.{name} = "
+                    assignments = [a for a in assignments if not a.startswith(target)]
+                    assignments.append(f"{target}'{value}'")
+        if assignments:
+            switch = "ON" if self._autocommit else "OFF"
+            self._execute_query(
+                f"SET {', '.join(assignments)}, @@session.autocommit = {switch}"
+            )
+        else:
+            self.autocommit = self._autocommit
+        if not self._fast_connect:
+            if self._time_zone:
+                self.time_zone = self._time_zone
+            if self._sql_mode:
+                self.sql_mode = self._sql_mode
         if self._init_command:
             self._execute_query(self._init_command)
 
+    def _session_tracking_setup(self) -> List[str]:
+        """Returns the assignments enabling session state tracking.
+
+        Connections able to parse the session state changes reported by the
+        server override this method. The assignments are sent by
+        `_post_connection()` in the statement setting autocommit, so enabling
+        the tracking costs no extra round trip.
+        """
+        return []
+
     @abstractmethod
     def close(self) -> None:
         """Disconnects from the MySQL server.
@@ -1602,6 +1705,8 @@ class MySQLConnectionAbstract(ABC):
 
         self.disconnect()
         self._open_connection()
+        # the character set sent in the handshake response is now in effect
+        session_charset_id = self._charset_id
 
         charset, collation = (
             kwargs.pop("charset", None),
@@ -1613,7 +1718,7 @@ class MySQLConnectionAbstract(ABC):
             ]
 
         if not self._client_flags & ClientFlag.CAN_HANDLE_EXPIRED_PASSWORDS:
-            self._post_connection()
+            self._post_connection(session_charset_id)
         else:
             # the server does not allow to run any other statement different from
             # ALTER when user's password has been expired - the server either
@@ -1696,6 +1801,19 @@ class MySQLConnectionAbstract(ABC):
         available, `False` otherwise
         """
 
+    def is_alive(self) -> bool:
+        """Reports whether the connection looks usable, without a round trip.
+
+        Subclasses able to inspect the socket locally override this method.
+        By default, it falls back to `is_connected()`.
+        """
+        return self.is_connected()
+
+    @property
+    def idle_time(self) -> Optional[float]:
+        """Seconds elapsed since the last successful I/O, `None` if unknown."""
+        return None
+
     @abstractmethod
     def ping(self, reconnect: bool = False, attempts: int = 1, delay: int = 0) -> None:
         """Checks availability of the MySQL server.
@@ -2665,13 +2783,18 @@ class MySQLCursorAbstract(ABC):
         The following characters are currently not supported by the connector in
         `DELIMITER` statements: `"`, `'`, #`, `/*` and `*/`.
 
+        Scripts too big to be held in memory, like dumps, can be given as a
+        binary file object. They are split into statements as they are read,
+        and sent in multi statements of about 1 MiB; parameters are not
+        supported then.
+
         If warnings were generated, and `connection.get_warnings` is
         `True`, then `self.warnings` will be a list containing these
         warnings.
 
         Args:
             operation: Operation to be executed - it can be a single or a
-                       multi statement.
+                       multi statement, or a binary file object holding a script.
             params: The parameters found in the tuple or dictionary params are bound
                     to the variables in the operation. Specify variables using `%s` or
                     `%(name)s` parameter style (that is, using format or pyformat style).
@@ -35,9 +35,26 @@ import os
 import random
 import re
 import sys
+import time
+import weakref
 
+from collections import deque
 from types import TracebackType
-from typing import TYPE_CHECKING, Any, Dict, NoReturn, Optional, Tuple, Type, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    NoReturn,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 from uuid import UUID, uuid4
 
 from mysql.connector.constants import CNX_POOL_ARGS
@@ -57,7 +74,16 @@ from ..errors import (
     PoolError,
     ProgrammingError,
 )
-from ..pooling import DEFAULT_CONFIGURATION, generate_pool_name, read_option_files
+from ..logger import logger
+from ..pooling import (
+    CNX_POOL_EVENTS,
+    CNX_POOL_LIFETIME_JITTER,
+    CNX_POOL_STATS_SAMPLES,
+    DEFAULT_CONFIGURATION,
+    _percentile,
+    generate_pool_name,
+    read_option_files,
+)
 from .connection import MySQLConnection
 
 if TYPE_CHECKING:
@@ -90,7 +116,8 @@ async def _get_pooled_connection(**kwargs: Any) -> PooledMySQLConnection:
     elif isinstance(_CONNECTION_POOLS[pool_name], MySQLConnectionPool):
         # pool_size must be the same
         check_size = _CONNECTION_POOLS[pool_name].pool_size
-        if "pool_size" in kwargs and kwargs["pool_size"] != check_size:
+        size = kwargs.get("pool_max_size", kwargs.get("pool_size"))
+        if size is not None and size != check_size:
             raise PoolError("Size can not be changed for active pools.")
 
     # Return pooled connection
@@ -371,14 +398,23 @@ class PooledMySQLConnection:
         pool configuration parameters are changed, a returned connection is closed
         and reopened with the new configuration before being returned from the pool
         again in response to a connection request.
+        When resetting the session fails or is cancelled, the connection is
+        discarded instead, as its state is unknown.
         """
-        cnx = self._cnx
+        # pylint: disable=protected-access
+        cnx, pool = self._cnx, self._cnx_pool
+        self._cnx = None
         try:
-            if self._cnx_pool.can_reset_session and await cnx.is_connected():
+            if pool.can_reset_session and await cnx.is_connected():
+                started = time.monotonic()
                 await cnx.reset_session()
-        finally:
-            await self._cnx_pool.add_connection(cnx)
-            self._cnx = None
+                pool._record_reset_time(time.monotonic() - started)
+        except BaseException:
+            # responses to the reset may still be unread
+            pool._notify("checkin", cnx)
+            pool._discard_connection(cnx)
+            raise
+        await pool._release_connection(cnx)
 
     @staticmethod
     def config(**kwargs: Any) -> NoReturn:
@@ -406,6 +442,12 @@ class MySQLConnectionPool:
         pool_size: int = 5,
         pool_name: Optional[str] = None,
         pool_reset_session: bool = True,
+        pool_ping_threshold: float = 0,
+        pool_min_size: Optional[int] = None,
+        pool_max_size: Optional[int] = None,
+        pool_max_idle: Optional[float] = None,
+        pool_max_lifetime: Optional[float] = None,
+        pool_timeout: Optional[float] = None,
         **kwargs: Any,
     ) -> None:
         """Constructor.
@@ -426,6 +468,26 @@ class MySQLConnectionPool:
             pool_size:  The pool size. If this argument is not given, the default is 5.
             pool_reset_session: Whether to reset session variables when the connection
                                 is returned to the pool.
+            pool_ping_threshold: Idle time, in seconds, after which a connection is
+                                 checked with a ping on checkout. Connections used
+                                 more recently are only checked locally, without a
+                                 round trip. The default, 0, always pings.
+            pool_min_size: Number of connections opened by `initialize_pool()` and
+                           kept open while idle. More connections are opened on
+                           demand, up to the maximum size. Defaults to the maximum
+                           size.
+            pool_max_size: Maximum number of connections, takes precedence over
+                           `pool_size`.
+            pool_max_idle: Seconds after which idle connections above the minimum
+                           size are closed. Not set by default.
+            pool_max_lifetime: Seconds after which connections are closed and
+                               replaced. Each connection gets up to 10% less, so
+                               that connections opened together aren't replaced
+                               at once. Not set by default.
+            pool_timeout: Seconds to wait for a connection to be returned when the
+                          pool is exhausted. Waiting tasks are served in arrival
+                          order. If this argument is not given, the default is to
+                          raise `PoolError` without waiting.
 
         Examples:
             ```
@@ -448,16 +510,43 @@ class MySQLConnectionPool:
         _check_support()
 
         self._pool_size: Optional[int] = None
+        self._min_size: int = 0
         self._pool_name: Optional[str] = None
         self._reset_session: bool = pool_reset_session
-        self._set_pool_size(pool_size)
+        self._ping_threshold: float = 0
+        self._set_pool_size(pool_max_size if pool_max_size is not None else pool_size)
+        self._set_min_size(pool_min_size)
+        self._set_ping_threshold(pool_ping_threshold)
+        self._max_idle = self._check_seconds("pool_max_idle", pool_max_idle)
+        self._max_lifetime = self._check_seconds("pool_max_lifetime", pool_max_lifetime)
+        self._timeout: Optional[float] = None
+        self._set_timeout(pool_timeout)
         if pool_name:
             self._set_pool_name(pool_name)
         self._cnx_config: Dict[str, Any] = kwargs
-        self._cnx_queue: asyncio.Queue[MySQLConnectionAbstract] = asyncio.Queue(
-            self._pool_size
-        )
+        # idle connections with the time they were queued, most recent last
+        self._idle: Deque[Tuple[MySQLConnectionAbstract, float]] = deque()
+        # connections open, whether idle, in use or being opened
+        self._cnx_count: int = 0
+        self._expires_at: Dict[int, float] = {}
+        self._reaper: Optional[asyncio.Task] = None
+        # tasks waiting for a connection, in arrival order
+        self._waiters: Deque[asyncio.Future] = deque()
+        # background closing and replenishing of connections
+        self._tasks: Set[asyncio.Task] = set()
         self._config_version: UUID = uuid4()
+        self._listeners: Dict[str, List[Callable[..., Any]]] = {
+            event: [] for event in CNX_POOL_EVENTS
+        }
+        self._wait_samples: Deque[float] = deque(maxlen=CNX_POOL_STATS_SAMPLES)
+        self._counters: Dict[str, Union[int, float]] = {
+            "created": 0,
+            "closed": 0,
+            "checkouts": 0,
+            "reconnects": 0,
+            "reset_session": 0,
+            "reset_session_time": 0.0,
+        }
 
     async def initialize_pool(self) -> None:
         """Opens the connection pool and fill with MySQL database connections.
@@ -476,10 +565,22 @@ class MySQLConnectionPool:
                 self._set_pool_name(generate_pool_name(**self._cnx_config))
         if self._cnx_config:
             await self.set_config(**self._cnx_config)
-            cnt = 0
-            while cnt < self._pool_size:
-                await self.add_connection()
-                cnt += 1
+            # open the connections concurrently; when one fails, close those
+            # which succeeded and raise the first error
+            results = await asyncio.gather(
+                *(self.add_connection() for _ in range(self._min_size)),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    await self._remove_connections()
+                    raise result
+
+        if (self._max_idle or self._max_lifetime) and self._reaper is None:
+            interval = min(filter(None, (self._max_idle, self._max_lifetime))) / 2
+            self._reaper = asyncio.create_task(
+                _reap_pool(weakref.ref(self), interval)
+            )
 
     @property
     def pool_name(self) -> str:
@@ -491,11 +592,92 @@ class MySQLConnectionPool:
         """Returns number of connections managed by the pool."""
         return self._pool_size
 
+    @property
+    def pool_min_size(self) -> int:
+        """Returns the number of connections kept open while idle."""
+        return self._min_size
+
+    @property
+    def pool_timeout(self) -> Optional[float]:
+        """Returns the seconds to wait for a connection when exhausted."""
+        return self._timeout
+
     @property
     def can_reset_session(self) -> bool:
         """Returns whether to reset session."""
         return self._reset_session
 
+    def _record_reset_time(self, reset_time: float) -> None:
+        """Count a session reset done when a connection is returned"""
+        self._counters["reset_session"] += 1
+        self._counters["reset_session_time"] += reset_time
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns a snapshot of the pool usage.
+        The snapshot holds the current number of connections `in_use` and
+        `idle`, and of tasks `waiting` for one; the totals of connections
+        `created` and `closed`, of `checkouts`, `reconnects` and
+        `reset_session` calls, with the seconds spent in the latter as
+        `reset_session_time`; and the median and 99th percentile checkout
+        wait times, `wait_p50` and `wait_p99`, in seconds, over the last
+        `CNX_POOL_STATS_SAMPLES` checkouts.
+        Returns:
+            A dictionary.
+        """
+        stats: Dict[str, Any] = {
+            "pool_name": self._pool_name,
+            "pool_size": self._pool_size,
+            "pool_min_size": self._min_size,
+            "in_use": self._cnx_count - len(self._idle),
+            "idle": len(self._idle),
+            "waiting": len(self._waiters),
+        }
+        stats.update(self._counters)
+        samples = sorted(self._wait_samples)
+        stats["wait_p50"] = _percentile(samples, 0.5)
+        stats["wait_p99"] = _percentile(samples, 0.99)
+        return stats
+
+    def add_event_listener(self, event: str, listener: Callable[..., Any]) -> None:
+        """Register a callable to be notified of pool events.
+        The listener is called with the pool and the connection as arguments.
+        It must not block, coroutine functions are not awaited. Errors raised
+        by listeners are logged and ignored.
+        Args:
+            event: One of `CNX_POOL_EVENTS`: "create" when the pool opens a
+                   connection, "checkout" when it is handed out, "checkin"
+                   when it is returned and "close" when the pool closes it.
+            listener: The callable to register.
+        Raises:
+            ProgrammingError: When the event is not known.
+        """
+        if event not in CNX_POOL_EVENTS:
+            raise ProgrammingError(f"Unknown pool event '{event}'")
+        self._listeners[event].append(listener)
+
+    def remove_event_listener(self, event: str, listener: Callable[..., Any]) -> None:
+        """Unregister a callable registered with add_event_listener().
+        Raises:
+            ProgrammingError: When the event is not known.
+        """
+        if event not in CNX_POOL_EVENTS:
+            raise ProgrammingError(f"Unknown pool event '{event}'")
+        if listener in self._listeners[event]:
+            self._listeners[event].remove(listener)
+
+    def _notify(self, event: str, cnx: MySQLConnectionAbstract) -> None:
+        """Call the listeners registered for an event"""
+        for listener in tuple(self._listeners[event]):
+            try:
+                listener(self, cnx)
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                logger.warning(
+                    "Pool '%s' %s event listener failed: %s",
+                    self._pool_name,
+                    event,
+                    err,
+                )
+
     async def set_config(self, **kwargs: Any) -> None:
         """Set the connection configuration for `MySQLConnectionAbstract` subclass instances.
         This method sets the configuration used for creating `MySQLConnectionAbstract`
@@ -536,6 +718,68 @@ class MySQLConnectionPool:
             )
         self._pool_size = pool_size
 
+    def _set_min_size(self, min_size: Optional[int]) -> None:
+        """Set the number of connections kept open while idle
+        Raises an AttributeError when min_size is negative or higher than
+        the pool size.
+        """
+        if min_size is None:
+            min_size = self._pool_size
+        if min_size < 0 or min_size > self._pool_size:
+            raise AttributeError(
+                "Pool minimum size should be positive and lower or equal to "
+                f"the pool size ({self._pool_size})"
+            )
+        self._min_size = min_size
+
+    @staticmethod
+    def _check_seconds(option: str, value: Optional[float]) -> Optional[float]:
+        """Check a duration option, which is either None or a positive number
+        Raises an AttributeError when the value is not valid.
+        """
+        if value is not None and (
+            isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0
+        ):
+            raise AttributeError(f"Option {option} should be a positive number")
+        return value
+
+    def _set_ping_threshold(self, ping_threshold: float) -> None:
+        """Set the idle time after which checkouts ping the server
+        Raises an AttributeError when ping_threshold is not a non-negative
+        number.
+        """
+        if (
+            isinstance(ping_threshold, bool)
+            or not isinstance(ping_threshold, (int, float))
+            or ping_threshold < 0
+        ):
+            raise AttributeError("Pool ping threshold should be a non-negative number")
+        self._ping_threshold = ping_threshold
+
+    async def _is_usable(
+        self, cnx: MySQLConnectionAbstract, idle_time: Optional[float]
+    ) -> bool:
+        """Check whether a connection taken from the pool can be handed out
+        Connections idle for less than the ping threshold are checked locally,
+        others are pinged.
+        """
+        if idle_time is not None and idle_time < self._ping_threshold:
+            return cnx.is_socket_connected()
+        return await cnx.is_connected()
+
+    def _set_timeout(self, timeout: Optional[float]) -> None:
+        """Set the seconds to wait for a connection when the pool is exhausted
+        Raises an AttributeError when timeout is neither None nor a
+        non-negative number.
+        """
+        if timeout is not None and (
+            isinstance(timeout, bool)
+            or not isinstance(timeout, (int, float))
+            or timeout < 0
+        ):
+            raise AttributeError("Pool timeout should be a non-negative number")
+        self._timeout = timeout
+
     def _set_pool_name(self, pool_name: str) -> None:
         r"""Set the name of the pool.
         This method checks the validity and sets the name of the pool.
@@ -548,11 +792,82 @@ class MySQLConnectionPool:
             raise AttributeError(f"Pool name '{pool_name}' is too long")
         self._pool_name = pool_name
 
+    def _track_connection(self, cnx: MySQLConnectionAbstract) -> None:
+        """Start the lifetime of a newly opened connection
+        The lifetime is shortened by a random part of up to
+        CNX_POOL_LIFETIME_JITTER.
+        """
+        if self._max_lifetime:
+            jitter = 1 - random.uniform(0, CNX_POOL_LIFETIME_JITTER)
+            self._expires_at[id(cnx)] = (
+                time.monotonic() + self._max_lifetime * jitter
+            )
+
+    def _untrack_connection(self, cnx: MySQLConnectionAbstract) -> None:
+        """Forget a connection leaving the pool"""
+        self._expires_at.pop(id(cnx), None)
+        self._cnx_count -= 1
+
+    def _is_expired(self, cnx: MySQLConnectionAbstract, now: float) -> bool:
+        """Check whether a connection outlived pool_max_lifetime"""
+        return now >= self._expires_at.get(id(cnx), float("inf"))
+
+    async def _close_connections(self, cnxs: List[MySQLConnectionAbstract]) -> None:
+        """Close connections removed from the pool"""
+        for cnx in cnxs:
+            try:
+                await cnx.disconnect()
+            except Error:
+                # Any error when closing means connection is closed
+                pass
+            self._counters["closed"] += 1
+            self._notify("close", cnx)
+
+    async def _new_connection(self) -> MySQLConnectionAbstract:
+        """Open a connection for the pool"""
+        cnx = await connect(**self._cnx_config)
+        try:
+            if (
+                self._reset_session
+                and self._cnx_config["compress"]
+                and cnx.get_server_version() < (5, 7, 3)
+            ):
+                raise NotSupportedError(
+                    "Pool reset session is not supported with "
+                    "compression for MySQL server version 5.7.2 "
+                    "or earlier"
+                )
+        except KeyError:
+            pass
+
+        cnx.pool_config_version = self._config_version
+        self._counters["created"] += 1
+        self._notify("create", cnx)
+        return cnx
+
+    def _spawn(self, coro: Awaitable[Any]) -> None:
+        """Run pool maintenance in the background"""
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _discard_connection(self, cnx: MySQLConnectionAbstract) -> None:
+        """Drop a connection left in an unknown state
+        The connection is closed, and replaced if needed, in the background.
+        """
+        self._untrack_connection(cnx)
+
+        async def close_and_replenish() -> None:
+            await self._close_connections([cnx])
+            await self._replenish()
+
+        self._spawn(close_and_replenish())
+
     def _queue_connection(self, cnx: MySQLConnectionAbstract) -> None:
         """Put connection back in the queue
-        This method is putting a connection back in the queue. It will not
-        acquire a lock as the methods using _queue_connection() will have it
-        set.
+        This method is putting a connection back in the queue. When tasks
+        are waiting for a connection, it is handed over to the one waiting
+        the longest instead.
         Raises `PoolError` on errors.
         """
         if not isinstance(cnx, MYSQL_CNX_CLASS):
@@ -560,10 +875,15 @@ class MySQLConnectionPool:
                 "Connection instance not subclass of MySQLConnectionAbstract"
             )
 
-        try:
-            self._cnx_queue.put_nowait(cnx)
-        except asyncio.QueueFull as err:
-            raise PoolError("Failed adding connection; queue is full") from err
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(cnx)
+                return
+
+        if len(self._idle) >= self._pool_size:
+            raise PoolError("Failed adding connection; queue is full")
+        self._idle.append((cnx, time.monotonic()))
 
     async def add_connection(
         self, cnx: Optional[MySQLConnectionAbstract] = None
@@ -586,63 +906,177 @@ class MySQLConnectionPool:
         if not self._cnx_config:
             raise PoolError("Connection configuration not available")
 
-        if self._cnx_queue.full():
+        if self._cnx_count >= self._pool_size:
             raise PoolError("Failed adding connection; queue is full")
 
-        if not cnx:
-            cnx = await connect(**self._cnx_config)
-            try:
-                if (
-                    self._reset_session
-                    and self._cnx_config["compress"]
-                    and cnx.get_server_version() < (5, 7, 3)
-                ):
-                    raise NotSupportedError(
-                        "Pool reset session is not supported with "
-                        "compression for MySQL server version 5.7.2 "
-                        "or earlier"
-                    )
-            except KeyError:
-                pass
-
-            cnx.pool_config_version = self._config_version
-        else:
-            if not isinstance(cnx, MYSQL_CNX_CLASS):
+        # reserve the slot while connecting
+        self._cnx_count += 1
+        try:
+            if not cnx:
+                cnx = await self._new_connection()
+            elif not isinstance(cnx, MYSQL_CNX_CLASS):
                 raise PoolError(
                     "Connection instance not subclass of MySQLConnectionAbstract"
                 )
+        except BaseException:
+            self._cnx_count -= 1
+            raise
 
+        self._track_connection(cnx)
         self._queue_connection(cnx)
 
+    async def _release_connection(self, cnx: MySQLConnectionAbstract) -> None:
+        """Give back a connection handed out by get_connection()
+        Connections which outlived pool_max_lifetime are closed instead, and
+        replaced if needed.
+        """
+        self._notify("checkin", cnx)
+        if not self._is_expired(cnx, time.monotonic()):
+            self._queue_connection(cnx)
+            return
+        self._untrack_connection(cnx)
+        await self._close_connections([cnx])
+        await self._replenish()
+
+    async def _replenish(self) -> None:
+        """Open connections for waiting tasks and up to the minimum size
+        Errors are not raised, the connections are opened again on demand.
+        """
+        while (
+            self._cnx_config
+            and self._cnx_count < self._pool_size
+            and (self._cnx_count < self._min_size or self._waiters)
+        ):
+            self._cnx_count += 1
+            try:
+                cnx = await self._new_connection()
+            except Error:
+                self._cnx_count -= 1
+                return
+            self._track_connection(cnx)
+            self._queue_connection(cnx)
+
+    async def _reap(self) -> None:
+        """Close the expired connections and those idle for too long
+        Idle connections are kept down to the minimum size, the longest
+        idle ones being closed first.
+        """
+        now = time.monotonic()
+        stale = []
+        idle: Deque[Tuple[MySQLConnectionAbstract, float]] = deque()
+        for cnx, idle_since in self._idle:
+            if self._is_expired(cnx, now) or (
+                self._max_idle
+                and now - idle_since > self._max_idle
+                and self._cnx_count > self._min_size
+            ):
+                self._untrack_connection(cnx)
+                stale.append(cnx)
+            else:
+                idle.append((cnx, idle_since))
+        self._idle = idle
+        await self._close_connections(stale)
+        await self._replenish()
+
+    async def _wait_for_connection(self) -> MySQLConnectionAbstract:
+        """Wait for a connection to be handed over by _queue_connection()
+        A connection handed over to a task which timed out or was cancelled
+        meanwhile is passed on to the next waiting task, or put back in the
+        pool, so that it never leaks.
+        Raises `PoolError` when timing out.
+        """
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # unlike wait_for(), wait() never swallows a cancellation
+            await asyncio.wait((waiter,), timeout=self._timeout)
+        except BaseException:
+            self._abandon_waiter(waiter)
+            raise
+        if not waiter.done():
+            self._abandon_waiter(waiter)
+            raise PoolError(
+                "Failed getting connection; pool exhausted, timed out "
+                f"after {self._timeout} seconds"
+            )
+        return waiter.result()
+
+    def _abandon_waiter(self, waiter: asyncio.Future) -> None:
+        """Stop waiting, passing on a connection handed over meanwhile"""
+        if waiter.done():
+            self._queue_connection(waiter.result())
+        else:
+            waiter.cancel()
+            self._waiters.remove(waiter)
+
     async def get_connection(self) -> PooledMySQLConnection:
         """Gets a connection from the pool.
         This method returns an PooledMySQLConnection instance which
         has a reference to the pool that created it, and the next available
         MySQL connection.
         When the MySQL connection is not connect, a reconnect is attempted.
+        When no connection is idle, a new one is opened if the pool has not
+        reached its maximum size. Otherwise, if `pool_timeout` is set, this
+        coroutine waits for a connection to be returned, serving waiting
+        tasks in arrival order. Health checks are done by each task on its
+        own connection, without holding up the others.
         Returns:
             A `PooledMySQLConnection` instance.
         Raises:
             PoolError: On errors.
         """
+        started = now = time.monotonic()
+        cnx = None
+        idle_time = None
+        expired = []
+        while self._idle:
+            cnx, idle_since = self._idle.pop()
+            idle_time = now - idle_since
+            if not self._is_expired(cnx, now):
+                break
+            self._untrack_connection(cnx)
+            expired.append(cnx)
+            cnx = None
+            idle_time = None
+        if expired:
+            self._spawn(self._close_connections(expired))
+
+        if cnx is None:
+            if self._cnx_count < self._pool_size and self._cnx_config:
+                # grow the pool
+                self._cnx_count += 1
+                try:
+                    cnx = await self._new_connection()
+                except BaseException:
+                    self._cnx_count -= 1
+                    raise
+                self._track_connection(cnx)
+            elif not self._timeout:
+                raise PoolError("Failed getting connection; pool exhausted")
+            else:
+                cnx = await self._wait_for_connection()
+        self._counters["checkouts"] += 1
+        self._wait_samples.append(time.monotonic() - started)
 
         try:
-            cnx = self._cnx_queue.get_nowait()
-        except asyncio.QueueEmpty as err:
-            raise PoolError("Failed getting connection; pool exhausted") from err
-
-        if (
-            not await cnx.is_connected()
-            or self._config_version != cnx.pool_config_version
-        ):
-            try:
+            if (
+                not await self._is_usable(cnx, idle_time)
+                or self._config_version != cnx.pool_config_version
+            ):
                 cnx._set_connection_options(**self._cnx_config)
                 await cnx.reconnect()
-            except InterfaceError:
-                self._queue_connection(cnx)
-                raise
-            cnx.pool_config_version = self._config_version
-
+                cnx.pool_config_version = self._config_version
+                self._counters["reconnects"] += 1
+        except InterfaceError:
+            self._queue_connection(cnx)
+            raise
+        except BaseException:
+            # cancelled or failed during a round trip, the connection state
+            # is unknown
+            self._discard_connection(cnx)
+            raise
+
+        self._notify("checkout", cnx)
         return PooledMySQLConnection(self, cnx)
 
     async def _remove_connections(self) -> int:
@@ -657,22 +1091,14 @@ class MySQLConnectionPool:
             PoolError: On errors while fetching connections from the pool or while disconnecting
             an open connection.
         """
-        cnt = 0
-        cnxq = self._cnx_queue
-        while cnxq.qsize():
-            try:
-                cnx = cnxq.get_nowait()
-                await cnx.disconnect()
-                cnt += 1
-            except asyncio.QueueEmpty:
-                return cnt
-            except PoolError:
-                raise
-            except Error:
-                # Any other error when closing means connection is closed
-                pass
+        cnxs = []
+        while self._idle:
+            cnx = self._idle.popleft()[0]
+            self._untrack_connection(cnx)
+            cnxs.append(cnx)
 
-        return cnt
+        await self._close_connections(cnxs)
+        return len(cnxs)
 
     async def close_pool(self) -> int:
         """Cleans up the connection pool
@@ -685,4 +1111,23 @@ class MySQLConnectionPool:
             PoolError: On errors while fetching connections from the pool or while disconnecting
             an open connection.
         """
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
         return await self._remove_connections()
+
+
+async def _reap_pool(pool_ref: weakref.ref, interval: float) -> None:
+    """Periodically close the expired and idle connections of a pool
+    The pool is only weakly referenced, so that the task ends once the
+    pool is garbage collected.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        pool = pool_ref()
+        if pool is None:
+            return
+        await pool._reap()  # pylint: disable=protected-access
+        del pool
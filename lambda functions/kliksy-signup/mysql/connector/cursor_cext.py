@@ -315,11 +315,15 @@ class CMySQLCursor(MySQLCursorAbstract):
         self._connection.handle_unread_result()
         self.reset()
 
+        if params and hasattr(operation, "read"):
+            raise ProgrammingError("Parameters are not supported with file objects")
+
         stmt = b""
         try:
             if isinstance(operation, str):
                 stmt = operation.encode(self._connection.python_charset)
             else:
+                # bytes, or a binary file object split as it is read
                 stmt = cast(bytes, operation)
         except (UnicodeDecodeError, UnicodeEncodeError) as err:
             raise ProgrammingError(str(err)) from err
@@ -30,14 +30,17 @@
 
 # pylint: disable=overlapping-except
 
+import select
 import socket
 import struct
+import threading
+import time
 import warnings
 import zlib
 
 from abc import ABC, abstractmethod
-from collections import deque
-from typing import Any, Deque, List, Optional, Tuple, Union
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
 
 try:
     import ssl
@@ -154,6 +157,12 @@ class NetworkBrokerPlain(NetworkBroker):
 
     def __init__(self) -> None:
         self._pktnr: int = -1  # packet number
+        # MySQL packets sent and received, split packets counting as several
+        self.packets_sent: int = 0
+        self.packets_received: int = 0
+        # bytes written to and read from the socket, headers included
+        self.bytes_sent: int = 0
+        self.bytes_received: int = 0
 
     def _set_next_pktnr(self) -> None:
         """Increment packet id."""
@@ -163,6 +172,7 @@ class NetworkBrokerPlain(NetworkBroker):
         """Write packet to the comm channel."""
         try:
             sock.sendall(pkt)
+            self.bytes_sent += len(pkt)
         except (socket.timeout, TimeoutError) as err:
             raise WriteTimeoutError(errno=3024) from err
         except IOError as err:
@@ -174,6 +184,7 @@ class NetworkBrokerPlain(NetworkBroker):
 
     def _recv_chunk(self, sock: socket.socket, size: int = 0) -> bytearray:
         """Read `size` bytes from the comm channel."""
+        self.bytes_received += size
         pkt = bytearray(size)
         pkt_view = memoryview(pkt)
         while size:
@@ -201,6 +212,7 @@ class NetworkBrokerPlain(NetworkBroker):
             self._set_next_pktnr()
         else:
             self._pktnr = packet_number
+        self.packets_sent += len(payload) // MAX_PAYLOAD_LENGTH + 1
 
         # If the payload is larger than or equal to MAX_PAYLOAD_LENGTH
         # the length is set to 2^24 - 1 (ff ff ff) and additional
@@ -241,7 +253,9 @@ class NetworkBrokerPlain(NetworkBroker):
             )
 
             # Read the payload, and return packet
-            return header + self._recv_chunk(sock, size=payload_len)
+            pkt = header + self._recv_chunk(sock, size=payload_len)
+            self.packets_received += 1
+            return pkt
         except (socket.timeout, TimeoutError) as err:
             raise ReadTimeoutError(errno=3024, msg=err.strerror) from err
         except IOError as err:
@@ -251,12 +265,20 @@ class NetworkBrokerPlain(NetworkBroker):
 
 
 class NetworkBrokerCompressed(NetworkBrokerPlain):
-    """Broker class for MySQL socket communication."""
+    """Broker class for MySQL socket communication.
 
-    def __init__(self) -> None:
+    Payloads up to `threshold` bytes are sent uncompressed, and so are those
+    zlib can't shrink. `level` is the zlib compression level.
+    """
+
+    def __init__(
+        self, threshold: int = MIN_COMPRESS_LENGTH, level: int = zlib.Z_DEFAULT_COMPRESSION
+    ) -> None:
         super().__init__()
         self._compressed_pktnr = -1
         self._queue_read: Deque[bytearray] = deque()
+        self._threshold = threshold
+        self._level = level
 
     @staticmethod
     def _prepare_packets(payload: bytes, pktnr: int) -> List[bytes]:
@@ -290,7 +312,10 @@ class NetworkBrokerCompressed(NetworkBrokerPlain):
 
     def _send_pkt(self, sock: socket.socket, address: str, pkt: bytes) -> None:
         """Compress packet and write it to the comm channel."""
-        compressed_pkt = zlib.compress(pkt)
+        compressed_pkt = zlib.compress(pkt, self._level)
+        if len(compressed_pkt) >= len(pkt):
+            # incompressible, send it as is
+            return self._send_uncompressed_pkt(sock, address, pkt)
         pkt = (
             struct.pack("<I", len(compressed_pkt))[0:3]
             + struct.pack("<B", self._compressed_pktnr)
@@ -299,6 +324,23 @@ class NetworkBrokerCompressed(NetworkBrokerPlain):
         )
         return super()._send_pkt(sock, address, pkt)
 
+    def _send_uncompressed_pkt(
+        self, sock: socket.socket, address: str, pkt: bytes
+    ) -> None:
+        """Write packet to the comm channel without compressing it.
+
+        An uncompressed payload length of 0 tells the server the payload
+        isn't compressed.
+        """
+        return super()._send_pkt(
+            sock,
+            address,
+            struct.pack("<I", len(pkt))[0:3]
+            + struct.pack("<B", self._compressed_pktnr)
+            + b"\x00\x00\x00"
+            + pkt,
+        )
+
     def send(
         self,
         sock: socket.socket,
@@ -321,6 +363,7 @@ class NetworkBrokerCompressed(NetworkBrokerPlain):
             self._set_next_compressed_pktnr()
         else:
             self._compressed_pktnr = compressed_packet_number
+        self.packets_sent += len(payload) // MAX_PAYLOAD_LENGTH + 1
 
         payload_prep = bytearray(b"").join(self._prepare_packets(payload, self._pktnr))
         if len(payload) >= MAX_PAYLOAD_LENGTH - PACKET_HEADER_LENGTH:
@@ -346,67 +389,81 @@ class NetworkBrokerCompressed(NetworkBrokerPlain):
             # For small packets it may be too costly to compress the packet.
             # Usually payloads less than 50 bytes (MIN_COMPRESS_LENGTH)
             # aren't compressed (see MySQL source code Documentation).
-            if len(payload) > MIN_COMPRESS_LENGTH:
+            if len(payload) > self._threshold:
                 # perform compression
                 self._send_pkt(sock, address, payload_prep)
             else:
                 # skip compression
-                super()._send_pkt(
-                    sock,
-                    address,
-                    struct.pack("<I", len(payload_prep))[0:3]
-                    + struct.pack("<B", self._compressed_pktnr)
-                    + struct.pack("<I", 0)[0:3]
-                    + payload_prep,
-                )
+                self._send_uncompressed_pkt(sock, address, payload_prep)
 
     def _recv_compressed_pkt(
         self, sock: socket.socket, compressed_pll: int, uncompressed_pll: int
     ) -> None:
         """Handle reading of a compressed packet."""
         # compressed_pll stands for compressed payload length.
-        # Recalling that if uncompressed payload length == 0, the packet
-        # comes in uncompressed, so no decompression is needed.
-        compressed_pkt = super()._recv_chunk(sock, size=compressed_pll)
-        pkt = (
-            compressed_pkt
-            if uncompressed_pll == 0
-            else bytearray(zlib.decompress(compressed_pkt))
-        )
+        pkt = bytearray()
+        self._recv_compressed_payload(sock, pkt, compressed_pll, uncompressed_pll)
 
         offset = 0
         while offset < len(pkt):
-            # pll stands for payload length
-            pll = struct.unpack(
-                "<I", pkt[offset : offset + PACKET_HEADER_LENGTH - 1] + b"\x00"
-            )[0]
-            if PACKET_HEADER_LENGTH + pll > len(pkt) - offset:
-                # More bytes need to be consumed
-                # Read the header of the next MySQL packet
-                header = super()._recv_chunk(sock, size=COMPRESSED_PACKET_HEADER_LENGTH)
+            if len(pkt) - offset >= PACKET_HEADER_LENGTH:
+                # pll stands for payload length
+                pll = struct.unpack_from("<I", pkt, offset)[0] & 0xFFFFFF
+                end = offset + PACKET_HEADER_LENGTH + pll
+                if end <= len(pkt):
+                    self._queue_read.append(pkt[offset:end])
+                    offset = end
+                    continue
+
+            # More bytes need to be consumed, the MySQL packet (or even its
+            # header) continues in the next compressed packet. Drop what was
+            # queued already, deleting from the front of a bytearray is cheap.
+            del pkt[:offset]
+            offset = 0
 
-                # compressed payload length, sequence id, uncompressed payload length
-                (
-                    compressed_pll,
-                    self._compressed_pktnr,
-                    uncompressed_pll,
-                ) = (
-                    struct.unpack("<I", header[0:3] + b"\x00")[0],
-                    header[3],
-                    struct.unpack("<I", header[4:7] + b"\x00")[0],
-                )
-                compressed_pkt = super()._recv_chunk(sock, size=compressed_pll)
-
-                # recalling that if uncompressed payload length == 0, the packet
-                # comes in uncompressed, so no decompression is needed.
-                pkt += (
-                    compressed_pkt
-                    if uncompressed_pll == 0
-                    else zlib.decompress(compressed_pkt)
-                )
+            # Read the header of the next compressed packet
+            header = super()._recv_chunk(sock, size=COMPRESSED_PACKET_HEADER_LENGTH)
+
+            # compressed payload length, sequence id, uncompressed payload length
+            (
+                compressed_pll,
+                self._compressed_pktnr,
+                uncompressed_pll,
+            ) = (
+                struct.unpack("<I", header[0:3] + b"\x00")[0],
+                header[3],
+                struct.unpack("<I", header[4:7] + b"\x00")[0],
+            )
+            self._recv_compressed_payload(sock, pkt, compressed_pll, uncompressed_pll)
 
-            self._queue_read.append(pkt[offset : offset + PACKET_HEADER_LENGTH + pll])
-            offset += PACKET_HEADER_LENGTH + pll
+    def _recv_compressed_payload(
+        self,
+        sock: socket.socket,
+        buffer: bytearray,
+        compressed_pll: int,
+        uncompressed_pll: int,
+    ) -> None:
+        """Read a compressed payload and append it, decompressed, to `buffer`."""
+        if uncompressed_pll == 0:
+            # the payload comes in uncompressed, read it straight into the buffer
+            self.bytes_received += compressed_pll
+            start = len(buffer)
+            buffer.extend(bytes(compressed_pll))
+            view = memoryview(buffer)[start:]
+            try:
+                while compressed_pll:
+                    read = sock.recv_into(view, compressed_pll)
+                    if read == 0:
+                        raise InterfaceError(errno=2013)
+                    view = view[read:]
+                    compressed_pll -= read
+            finally:
+                view.release()
+            return
+        # the output size is known, let zlib allocate it at once
+        buffer += zlib.decompress(
+            super()._recv_chunk(sock, size=compressed_pll), bufsize=uncompressed_pll
+        )
 
     def recv(self, sock: socket.socket, address: str) -> bytearray:
         """Receive `one` or `several` packets from the MySQL server, enqueue them, and
@@ -440,10 +497,90 @@ class NetworkBrokerCompressed(NetworkBrokerPlain):
 
         pkt = self._queue_read.popleft()
         self._pktnr = pkt[3]
+        self.packets_received += 1
 
         return pkt
 
 
+class TLSSessionCache:
+    """Cache of SSL contexts and TLS sessions.
+
+    SSL contexts are kept per TLS configuration, so that certificates are
+    loaded once per process. The TLS session of the last connection to each
+    server is kept per SSL context and offered on the next handshake, which
+    the server can then abbreviate. At most `max_sessions` sessions are kept,
+    the least recently used one being dropped first, and a session the server
+    refuses to resume is dropped. Call `clear()` after changing certificate
+    files on disk.
+    """
+
+    def __init__(self, max_sessions: int = 32) -> None:
+        self._lock = threading.Lock()
+        self._contexts: Dict[Tuple[Any, ...], Any] = {}
+        self._sessions: OrderedDict[Tuple[Any, str], Any] = OrderedDict()
+        self.max_sessions: int = max_sessions
+        self.resumed_handshakes: int = 0
+        self.full_handshakes: int = 0
+
+    def get_context(self, key: Tuple[Any, ...]) -> Any:
+        """Get the SSL context cached for a TLS configuration, if any."""
+        with self._lock:
+            return self._contexts.get(key)
+
+    def put_context(self, key: Tuple[Any, ...], context: Any) -> Any:
+        """Cache an SSL context, returning the one cached first for `key`."""
+        with self._lock:
+            return self._contexts.setdefault(key, context)
+
+    def get_session(self, context: Any, address: str) -> Any:
+        """Get the TLS session kept for a server, if any."""
+        with self._lock:
+            session = self._sessions.get((context, address))
+            if session is not None:
+                self._sessions.move_to_end((context, address))
+            return session
+
+    def put_session(self, context: Any, address: str, session: Any) -> None:
+        """Keep the TLS session of a connection to a server."""
+        with self._lock:
+            self._sessions[(context, address)] = session
+            self._sessions.move_to_end((context, address))
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def discard_session(self, context: Any, address: str) -> None:
+        """Drop the TLS session kept for a server, if any."""
+        with self._lock:
+            self._sessions.pop((context, address), None)
+
+    def record_handshake(self, resumed: bool) -> None:
+        """Count a completed TLS handshake."""
+        with self._lock:
+            if resumed:
+                self.resumed_handshakes += 1
+            else:
+                self.full_handshakes += 1
+
+    def clear(self) -> None:
+        """Forget all SSL contexts and TLS sessions."""
+        with self._lock:
+            self._contexts.clear()
+            self._sessions.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the handshake counters and the cache sizes."""
+        with self._lock:
+            return {
+                "resumed_handshakes": self.resumed_handshakes,
+                "full_handshakes": self.full_handshakes,
+                "contexts": len(self._contexts),
+                "sessions": len(self._sessions),
+            }
+
+
+TLS_SESSION_CACHE = TLSSessionCache()
+
+
 class MySQLSocket(ABC):
     """MySQL socket communication interface.
 
@@ -460,14 +597,115 @@ class MySQLSocket(ABC):
         self._connection_timeout: Optional[int] = None
         self.server_host: Optional[str] = None
         self._netbroker: NetworkBroker = NetworkBrokerPlain()
+        # monotonic time of the last successful send or receive
+        self._last_io: Optional[float] = None
+        # seconds spent waiting for and reading packets
+        self.recv_time: float = 0.0
+        self._ssl_context: Any = None
 
-    def switch_to_compressed_mode(self) -> None:
-        """Enable network layer where transactions are made with compressed packets."""
-        self._netbroker = NetworkBrokerCompressed()
+    @property
+    def packets_sent(self) -> int:
+        """MySQL packets sent, payloads split in several packets included."""
+        return self._netbroker.packets_sent
+
+    @property
+    def packets_received(self) -> int:
+        """MySQL packets received."""
+        return self._netbroker.packets_received
+
+    @property
+    def bytes_sent(self) -> int:
+        """Bytes written to the socket, packet headers included."""
+        return self._netbroker.bytes_sent
+
+    @property
+    def bytes_received(self) -> int:
+        """Bytes read from the socket, packet headers included."""
+        return self._netbroker.bytes_received
+
+    @property
+    def idle_time(self) -> Optional[float]:
+        """Seconds elapsed since the last successful send or receive.
+
+        Returns `None` when no I/O has been done on the socket yet.
+        """
+        if self._last_io is None:
+            return None
+        return time.monotonic() - self._last_io
+
+    def is_alive(self, expect_data: bool = False) -> bool:
+        """Check whether the socket is still usable without a round trip.
+
+        The socket is polled without blocking. When it is readable, the
+        pending bytes are peeked at (never consumed): an empty read means
+        the server sent FIN, an error means it sent RST. Data arriving on
+        an idle connection is most likely an error packet sent just before
+        the server closes it, so it is only accepted when `expect_data` is
+        `True`, for example while a result set is still being read.
+
+        Args:
+            expect_data: Whether pending data is expected on the socket.
+
+        Returns:
+            `True` if the socket looks usable, `False` otherwise.
+        """
+        sock = self.sock
+        if sock is None:
+            return False
+        try:
+            if sock.fileno() < 0:
+                return False
+            if ssl is not None and isinstance(sock, ssl.SSLSocket) and sock.pending():
+                # decrypted data is already buffered in the TLS layer
+                return expect_data
+            if hasattr(select, "poll"):
+                poller = select.poll()
+                poller.register(sock, select.POLLIN)
+                events = poller.poll(0)
+                if events and events[0][1] & (select.POLLERR | select.POLLNVAL):
+                    return False
+                readable = bool(events)
+            else:
+                readable = bool(select.select([sock], [], [], 0)[0])
+            if not readable:
+                return True
+            # peek at the raw stream, bypassing the TLS layer if any
+            data = socket.socket.recv(sock, 1, socket.MSG_PEEK)
+        except (BlockingIOError, InterruptedError, socket.timeout):
+            return True
+        except (OSError, ValueError):
+            return False
+        return bool(data) and expect_data
+
+    def switch_to_compressed_mode(
+        self,
+        threshold: int = MIN_COMPRESS_LENGTH,
+        level: int = zlib.Z_DEFAULT_COMPRESSION,
+    ) -> None:
+        """Enable network layer where transactions are made with compressed packets.
+
+        Payloads up to `threshold` bytes are sent uncompressed, others are
+        compressed using zlib with the given `level`.
+        """
+        netbroker = NetworkBrokerCompressed(threshold, level)
+        netbroker.packets_sent = self._netbroker.packets_sent
+        netbroker.packets_received = self._netbroker.packets_received
+        netbroker.bytes_sent = self._netbroker.bytes_sent
+        netbroker.bytes_received = self._netbroker.bytes_received
+        self._netbroker = netbroker
+
+    def _save_tls_session(self) -> None:
+        """Keep the TLS session of the connection for later handshakes."""
+        if self._ssl_context is None:
+            return
+        session = getattr(self.sock, "session", None)
+        if session is not None:
+            TLS_SESSION_CACHE.put_session(self._ssl_context, self.address, session)
 
     def shutdown(self) -> None:
         """Shut down the socket before closing it."""
         try:
+            self._save_tls_session()
             self.sock.shutdown(socket.SHUT_RDWR)
             self.sock.close()
         except (AttributeError, OSError):
@@ -476,6 +714,7 @@ class MySQLSocket(ABC):
     def close_connection(self) -> None:
         """Close the socket."""
         try:
+            self._save_tls_session()
             self.sock.close()
         except (AttributeError, OSError):
             pass
@@ -492,6 +731,9 @@ class MySQLSocket(ABC):
     def switch_to_ssl(self, ssl_context: Any, host: str) -> None:
         """Upgrade an existing connection to TLS.
 
+        The TLS session kept from the last connection to the same server with
+        the same SSL context is offered to the server to resume it.
+
         Args:
             ssl_context (ssl.SSLContext): The SSL Context to be used.
             host (str): Server host name.
@@ -512,11 +754,21 @@ class MySQLSocket(ABC):
         if ssl is None:
             raise NotSupportedError("Python installation has no SSL support")
 
+        session = TLS_SESSION_CACHE.get_session(ssl_context, self.address)
         try:
-            self.sock = ssl_context.wrap_socket(self.sock, server_hostname=host)
+            self.sock = ssl_context.wrap_socket(
+                self.sock, server_hostname=host, session=session
+            )
+            self._ssl_context = ssl_context
+            TLS_SESSION_CACHE.record_handshake(self.sock.session_reused)
+            if session is not None and not self.sock.session_reused:
+                TLS_SESSION_CACHE.discard_session(ssl_context, self.address)
+            self._save_tls_session()
         except NameError as err:
             raise NotSupportedError("Python installation has no SSL support") from err
         except (ssl.SSLError, IOError) as err:
+            if session is not None:
+                TLS_SESSION_CACHE.discard_session(ssl_context, self.address)
             raise InterfaceError(
                 errno=2055, values=(self.address, _strioerror(err))
             ) from err
@@ -547,7 +799,8 @@ class MySQLSocket(ABC):
             tls_cipher_suites: Set of steps that helps to establish a secure connection.
 
         Returns:
-            ssl_context (ssl.SSLContext): An SSL Context ready be used.
+            ssl_context (ssl.SSLContext): An SSL Context ready be used. Contexts
+                                          are cached per set of arguments.
 
         Raises:
             NotSupportedError: Python installation has no SSL support.
@@ -561,6 +814,19 @@ class MySQLSocket(ABC):
         if ssl is None:
             raise NotSupportedError("Python installation has no SSL support")
 
+        cache_key = (
+            ssl_ca,
+            ssl_cert,
+            ssl_key,
+            bool(ssl_verify_cert),
+            bool(ssl_verify_identity),
+            tuple(sorted(tls_versions or [])),
+            tuple(tls_cipher_suites or []),
+        )
+        context = TLS_SESSION_CACHE.get_context(cache_key)
+        if context is not None:
+            return context
+
         if tls_versions is None:
             tls_versions = []
 
@@ -612,7 +878,7 @@ class MySQLSocket(ABC):
             if tls_cipher_suites and tls_version == "TLSv1.2":
                 context.set_ciphers(":".join(tls_cipher_suites))
 
-            return context
+            return TLS_SESSION_CACHE.put_context(cache_key, context)
         except NameError as err:
             raise NotSupportedError("Python installation has no SSL support") from err
         except (
@@ -654,6 +920,7 @@ class MySQLSocket(ABC):
             packet_number=packet_number,
             compressed_packet_number=compressed_packet_number,
         )
+        self._last_io = time.monotonic()
 
     def recv(self, read_timeout: Optional[int] = None) -> bytearray:
         """Get packet from the MySQL server comm channel."""
@@ -665,7 +932,11 @@ class MySQLSocket(ABC):
         except OSError as _:
             # Ignore the OSError as the socket might not be setup properly
             pass
-        return self._netbroker.recv(self.sock, self.address)
+        started = time.monotonic()
+        packet = self._netbroker.recv(self.sock, self.address)
+        self._last_io = time.monotonic()
+        self.recv_time += self._last_io - started
+        return packet
 
     @abstractmethod
     def open_connection(self) -> None:
@@ -0,0 +1,128 @@
+# Copyright (c) 2025, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0, as
+# published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms,
+# as designated in a particular file or component or in included license
+# documentation. The authors of MySQL hereby grant you an
+# additional permission to link the program and your derivative works
+# with the separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# Without limiting anything contained in the foregoing, this file,
+# which is part of MySQL Connector/Python, is also subject to the
+# Universal FOSS Exception, version 1.0, a copy of which can be found at
+# http://oss.oracle.com/licenses/universal-foss-exception.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301  USA
+
+
+"""Wire-level counters of the connections."""
+from __future__ import annotations
+
+from collections import Counter
+from types import TracebackType
+from typing import Any, Callable, Dict, Optional, Type
+
+from .constants import ServerCmd
+
+CommandHookType = Callable[[int, bytes, float], Any]
+"""Callback taking the command, its argument and the seconds elapsed until
+the server responded."""
+
+SOCKET_COUNTERS = (
+    "packets_sent",
+    "packets_received",
+    "bytes_sent",
+    "bytes_received",
+    "recv_time",
+)
+
+
+class WireCounters:
+    """Counters updated by a connection while talking to the server.
+
+    Commands, row decoding and parameter encoding are counted here, packets,
+    bytes and the time blocked receiving are counted by the socket. Counters
+    of sockets closed when reconnecting are kept in `retired`.
+    """
+
+    __slots__ = ("commands", "decode_time", "encode_time", "retired")
+
+    def __init__(self) -> None:
+        self.commands: Counter = Counter()
+        self.decode_time: float = 0.0
+        self.encode_time: float = 0.0
+        self.retired: Dict[str, float] = dict.fromkeys(SOCKET_COUNTERS, 0)
+
+    def retire_socket(self, sock: Any) -> None:
+        """Keep the counters of a socket which is about to be replaced."""
+        if sock is not None:
+            for name in SOCKET_COUNTERS:
+                self.retired[name] += getattr(sock, name)
+
+    def snapshot(self, sock: Any) -> Dict[str, Any]:
+        """Returns the current values of the counters."""
+        values: Dict[str, Any] = {
+            "commands": {
+                ServerCmd.get_info(command) or str(command): count
+                for command, count in self.commands.items()
+            },
+            "decode_time": self.decode_time,
+            "encode_time": self.encode_time,
+        }
+        for name in SOCKET_COUNTERS:
+            values[name] = self.retired[name] + (
+                getattr(sock, name) if sock is not None else 0
+            )
+        return values
+
+
+class ConnectionStats(Dict[str, Any]):
+    """Snapshot of the wire-level counters of a connection.
+
+    Used as a context manager, the snapshot holds on exit what was spent
+    within the block instead.
+
+    Examples:
+        ```
+        >>> with cnx.stats() as stats:
+        ...     cur.execute("SELECT * FROM employees")
+        ...     rows = cur.fetchall()
+        >>> stats["commands"]
+        {'QUERY': 1}
+        >>> stats["packets_received"], stats["decode_time"]
+        (1002, 0.0139...)
+        ```
+    """
+
+    def __init__(self, snapshot: Callable[[], Dict[str, Any]]) -> None:
+        super().__init__(snapshot())
+        self._snapshot = snapshot
+
+    def __enter__(self) -> ConnectionStats:
+        self.update(self._snapshot())
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]] = None,
+        exc_value: Optional[BaseException] = None,
+        traceback: Optional[TracebackType] = None,
+    ) -> None:
+        current = self._snapshot()
+        commands = Counter(current.pop("commands"))
+        commands.subtract(self["commands"])
+        self["commands"] = {name: count for name, count in commands.items() if count}
+        for name, value in current.items():
+            self[name] = value - self[name]
@@ -31,6 +31,7 @@
 import importlib
 import os
 import platform
+import socket
 import struct
 import subprocess
 import sys
@@ -632,7 +633,10 @@ def init_bytearray(
 
 @lru_cache()
 def get_platform() -> Dict[str, Union[str, Tuple[str, str]]]:
-    """Return a dict with the platform arch and OS version."""
+    """Return a dict with the platform arch and OS version.
+
+    The result is computed once per process and must not be modified.
+    """
     plat: Dict[str, Union[str, Tuple[str, str]]] = {"arch": "", "version": ""}
     if os.name == "nt":
         if "64" in platform.architecture()[0]:
@@ -652,6 +656,12 @@ def get_platform() -> Dict[str, Union[str, Tuple[str, str]]]:
     return plat
 
 
+@lru_cache(maxsize=None)
+def get_source_host() -> str:
+    """Return the host name of the machine, looked up once per process."""
+    return socket.gethostname()
+
+
 def import_object(fullpath: str) -> Any:
     """Import an object from a fully qualified module path.
 